@@ -0,0 +1,330 @@
+"""Benchmark the hot paths on synthetic data of several sizes.
+
+The data are generated offline with
+`climetlab_maelstrom_power_production.testing.synthetic` and served by a local
+object store (see `climetlab_maelstrom_power_production.testing.server`)
+with the given latency and bandwidth to benchmark downloads. Each benchmark is
+timed `--repeat` times per scale and the results are written to a JSON file.
+If a baseline file of a previous run is given, the command fails if any
+benchmark got slower than the baseline by more than `--tolerance`.
+
+Run from the root of the repository:
+
+    python -m benchmarks.run --output benchmarks.json
+    python -m benchmarks.run --scales small --baseline benchmarks.json
+    python -m benchmarks.run --latency 0.05 --bandwidth 50e6
+
+"""
+import argparse
+import dataclasses
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Sequence
+from typing import Any, Optional
+
+import numpy as np
+import xarray as xr
+
+import climetlab_maelstrom_power_production
+from climetlab_maelstrom_power_production import download
+from climetlab_maelstrom_power_production.production import merger as production_merger
+from climetlab_maelstrom_power_production.testing import server, synthetic
+from climetlab_maelstrom_power_production.weather import merger as weather_merger
+from notebooks.utils import data, density, features, model, pressure
+from notebooks.utils import time as times
+from notebooks.utils import wind
+
+HEIGHTS = (100.0,)
+
+
+@dataclasses.dataclass(frozen=True)
+class Scale:
+    """Size of the synthetic data of a benchmark run."""
+
+    name: str
+    longitudes: int
+    latitudes: int
+    days: int
+    wind_turbines: int
+
+
+SCALES = {
+    scale.name: scale
+    for scale in [
+        Scale(name="small", longitudes=10, latitudes=10, days=2, wind_turbines=2),
+        Scale(name="medium", longitudes=40, latitudes=30, days=7, wind_turbines=8),
+        Scale(name="large", longitudes=80, latitudes=60, days=14, wind_turbines=16),
+    ]
+}
+
+
+def run(
+    scales: Sequence[Scale],
+    repeat: int = 3,
+    backend: str = "hist_gradient_boosting",
+    latency: float = 0.0,
+    bandwidth: Optional[float] = None,
+) -> list[dict[str, Any]]:
+    """Run all benchmarks at the given scales.
+
+    The latency (seconds per request) and bandwidth (bytes per second) apply
+    to the downloads from the local object store.
+
+    Returns
+    -------
+    list[dict]
+        One entry per scale and benchmark with the duration of each repetition
+        (`seconds`) and their minimum and median.
+
+    """
+    results = []
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            paths = synthetic.create_dataset(
+                directory,
+                days=scale.days,
+                longitudes=scale.longitudes,
+                latitudes=scale.latitudes,
+                types=("ml", "sfc"),
+                wind_turbines=scale.wind_turbines,
+            )
+            print(
+                f"{scale.name}: generated data in {time.perf_counter() - start:.1f} s",
+                file=sys.stderr,
+            )
+            store = server.ObjectStore(directory, latency=latency, bandwidth=bandwidth)
+            with store:
+                benchmarks = _get_benchmarks(
+                    paths, directory=directory, url=store.url, backend=backend
+                )
+                for name, benchmark in benchmarks:
+                    seconds = _time(benchmark, repeat=repeat)
+                    print(
+                        f"{scale.name}: {name} took {min(seconds):.3f} s",
+                        file=sys.stderr,
+                    )
+                    results.append(
+                        {
+                            "scale": scale.name,
+                            "benchmark": name,
+                            "parameters": dataclasses.asdict(scale),
+                            "seconds": seconds,
+                            "min": min(seconds),
+                            "median": statistics.median(seconds),
+                        }
+                    )
+    return results
+
+
+def compare(
+    results: Sequence[dict[str, Any]],
+    baseline: Sequence[dict[str, Any]],
+    tolerance: float = 0.2,
+) -> list[str]:
+    """Get the benchmarks that are slower than in the baseline.
+
+    The fastest repetitions are compared, since they are least affected by
+    other load on the machine.
+
+    """
+    expected = {(entry["scale"], entry["benchmark"]): entry for entry in baseline}
+    regressions = []
+    for entry in results:
+        reference = expected.get((entry["scale"], entry["benchmark"]))
+        if reference is None:
+            continue
+        if entry["min"] > reference["min"] * (1 + tolerance):
+            regressions.append(
+                f"{entry['scale']}/{entry['benchmark']}: "
+                f"{entry['min']:.3f} s (baseline {reference['min']:.3f} s)"
+            )
+    return regressions
+
+
+def _get_benchmarks(
+    paths: dict[str, list[str]], directory: str, url: str, backend: str
+) -> list[tuple[str, Callable[[], Any]]]:
+    """Get the benchmarks in order, each preparing the input of the next."""
+    merger = weather_merger.WeatherMerger()
+    state: dict[str, Any] = {}
+    urls = [
+        f"{url}/{os.path.relpath(path, directory).replace(os.sep, '/')}"
+        for type_paths in paths.values()
+        for path in type_paths
+    ]
+
+    def download_files() -> None:
+        # Download into a new directory, so that no file is cached.
+        target = tempfile.mkdtemp(dir=directory)
+        download.Downloader(target).download(urls)
+        state["downloaded"] = target
+
+    def load_cached_files() -> None:
+        download.Downloader(state["downloaded"]).download(urls)
+
+    def merge() -> None:
+        state["ml"] = merger.to_xarray(paths["ml"]).load()
+        state["sfc"] = merger.to_xarray(paths["sfc"]).load()
+
+    def to_dataframe() -> None:
+        state["ml"].to_dataframe()
+
+    def calculate_density() -> None:
+        ml = state["ml"]
+        pressure_on_levels = pressure.calculate_pressure_on_levels(
+            state["sfc"]["sp"], levels=ml["level"].values
+        )
+        state["density"] = density.calculate_density(
+            temperature=ml["t"] - 273.15,
+            pressure=pressure_on_levels / 100,
+            specific_humidity=ml["q"],
+        ).compute()
+
+    def calculate_wind() -> None:
+        state["wind_speed"], _ = wind.calculate_wind_at_heights(
+            HEIGHTS, model_level_data=state["ml"], surface_data=state["sfc"]
+        )
+        state["wind_speed"] = state["wind_speed"].compute()
+
+    def prepare_production() -> None:
+        production = production_merger.ProductionMerger(
+            wind_turbine_ids=list(range(1, len(paths["production"]) + 1))
+        ).to_xarray(paths["production"])
+        hourly = data.resample_and_clear_production_data_to_hourly_timeseries(
+            production, dates=state["ml"]["time"].values
+        )
+        state["production"] = hourly
+        state["indexes"] = data.get_closest_grid_point_indexes_to_wind_turbines(
+            production, state["ml"]
+        )
+
+    def build_features() -> None:
+        turbines = {"turbine": state["production"]["turbine"].values}
+        wind_speed = (
+            state["wind_speed"]
+            .isel(state["indexes"])
+            .sel(height=HEIGHTS[0])
+            .assign_coords(turbines)
+        )
+        level = state["ml"]["level"].values.max()
+        air_density = (
+            state["density"]
+            .isel(state["indexes"])
+            .sel(level=level)
+            .assign_coords(turbines)
+        )
+        time_features = times.get_time_features(state["ml"]["time"])
+        state["matrix"] = features.build_feature_matrix(
+            [
+                air_density.drop_vars("level"),
+                wind_speed.drop_vars("height"),
+                time_features["time_of_day"],
+                time_features["time_of_year"],
+            ],
+            target=state["production"],
+            site_dim="turbine",
+        )
+
+    def train() -> None:
+        matrix = state["matrix"]
+        model.fit_model(matrix.x, matrix.y, backend=backend)
+
+    return [
+        ("download", download_files),
+        ("cache", load_cached_files),
+        ("merge", merge),
+        ("to_dataframe", to_dataframe),
+        ("density", calculate_density),
+        ("wind", calculate_wind),
+        ("production", prepare_production),
+        ("features", build_features),
+        ("train", train),
+    ]
+
+
+def _time(benchmark: Callable[[], Any], repeat: int) -> list[float]:
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        benchmark()
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def _get_metadata(**options) -> dict[str, Any]:
+    return {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "plugin": climetlab_maelstrom_power_production.__version__,
+        "numpy": np.__version__,
+        "xarray": xr.__version__,
+        **options,
+    }
+
+
+def main(arguments: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scales",
+        nargs="+",
+        choices=list(SCALES),
+        default=["small", "medium"],
+        help="Sizes of the synthetic data.",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--backend", default="hist_gradient_boosting")
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Seconds to wait for each request to the local object store.",
+    )
+    parser.add_argument(
+        "--bandwidth",
+        type=float,
+        help="Bytes per second sent by the local object store.",
+    )
+    parser.add_argument("--output", default="benchmarks.json")
+    parser.add_argument("--baseline", help="Results of a previous run to compare to.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed relative slowdown compared to the baseline.",
+    )
+    args = parser.parse_args(arguments)
+
+    options = {
+        "repeat": args.repeat,
+        "backend": args.backend,
+        "latency": args.latency,
+        "bandwidth": args.bandwidth,
+    }
+    results = run([SCALES[name] for name in args.scales], **options)
+    with open(args.output, "w") as file:
+        json.dump(
+            {"metadata": _get_metadata(**options), "results": results},
+            file,
+            indent=2,
+        )
+
+    if args.baseline is None:
+        return 0
+    with open(args.baseline) as file:
+        baseline = json.load(file)["results"]
+    regressions = compare(results, baseline, tolerance=args.tolerance)
+    for regression in regressions:
+        print(f"Regression in {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""Convert datasets to Arrow tables and partitioned Parquet files."""
+import os
+from collections.abc import Sequence
+from typing import Optional, Union
+
+import numpy as np
+import pyarrow as pa  # type: ignore
+import pyarrow.parquet as pq  # type: ignore
+import xarray as xr
+
+from . import batches
+
+# Columns derived from the time coordinate for partitioning.
+TIME_PARTITION_COLUMNS = ("year", "month", "date")
+
+
+def to_table(
+    dataset: xr.Dataset,
+    constant_columns: Optional[dict[str, object]] = None,
+    time_coordinate: str = "time",
+    time_columns: Sequence[str] = (),
+) -> pa.Table:
+    """Convert a dataset to a flat Arrow table.
+
+    The table has one row per combination of the dataset's dimensions, like
+    `xarray.Dataset.to_dataframe`, but is built directly from the arrays:
+    dimension coordinates are dictionary-encoded using the row's index of
+    each dimension, and floating point variables are stored as float32.
+
+    Parameters
+    ----------
+    dataset : xarray.Dataset
+        The dataset to convert.
+    constant_columns : dict, optional
+        Columns with the same (dictionary-encoded) value in each row,
+        e.g. the ID of a wind turbine.
+    time_coordinate : str, default "time"
+        Name of the time coordinate used to derive `time_columns`.
+    time_columns : list[str], optional
+        Columns to derive from the time coordinate, any of `year`, `month`
+        and `date`.
+
+    """
+    dims = [str(dim) for dim in dataset.dims]
+    shape = tuple(dataset.sizes[dim] for dim in dims)
+    size = int(np.prod(shape))
+    indexes = np.unravel_index(np.arange(size), shape)
+    columns: dict[str, pa.Array] = {}
+
+    for dim, index in zip(dims, indexes):
+        if dim in dataset.coords:
+            columns[dim] = pa.DictionaryArray.from_arrays(
+                pa.array(index, type=pa.int32()), pa.array(dataset[dim].values)
+            )
+
+    for name in TIME_PARTITION_COLUMNS:
+        if name in time_columns:
+            position = dims.index(time_coordinate)
+            values = _get_time_column(dataset[time_coordinate].values, name=name)
+            columns[name] = pa.array(values[indexes[position]])
+
+    for name, value in (constant_columns or {}).items():
+        columns[name] = pa.DictionaryArray.from_arrays(
+            pa.array(np.zeros(size, dtype=np.int32)), pa.array([value])
+        )
+
+    variables = {
+        **{name: data for name, data in dataset.coords.items() if name not in dims},
+        **dataset.data_vars,
+    }
+    for name, data in variables.items():
+        values = data.broadcast_like(dataset).transpose(*dims).values.reshape(-1)
+        if np.issubdtype(values.dtype, np.floating):
+            values = values.astype(np.float32, copy=False)
+        columns[str(name)] = pa.array(values)
+
+    return pa.table(columns)
+
+
+def write_parquet(
+    dataset: xr.Dataset,
+    path: str,
+    partition_by: Optional[Sequence[str]] = None,
+    constant_columns: Optional[dict[str, object]] = None,
+    dim: str = "time",
+    by: Union[str, int] = "day",
+) -> None:
+    """Write a dataset to a (partitioned) Parquet dataset.
+
+    The dataset is converted and written part by part along `dim` (see
+    `batches.iterate_dataframes`), hence it never has to fit into memory.
+
+    Parameters
+    ----------
+    dataset : xarray.Dataset
+        The dataset to write.
+    path : str
+        Root directory of the Parquet dataset.
+    partition_by : list[str], optional
+        Columns to partition the files by (hive partitioning), e.g.
+        `["year", "month"]`. Columns derived from the time coordinate
+        (`year`, `month`, `date`) are added as required.
+    constant_columns : dict, optional
+        Columns with the same value in each row (see `to_table`).
+    dim : str, default "time"
+        Dimension along which to split the dataset into parts.
+    by : str or int, default "day"
+        How to split the dataset into parts.
+
+    """
+    partition_by = list(partition_by or [])
+    os.makedirs(path, exist_ok=True)
+    for index, part in enumerate(batches.iterate_parts(dataset, dim=dim, by=by)):
+        table = to_table(
+            dataset.isel({dim: part}),
+            constant_columns=constant_columns,
+            time_coordinate=dim,
+            time_columns=[
+                name for name in partition_by if name in TIME_PARTITION_COLUMNS
+            ],
+        )
+        pq.write_to_dataset(
+            table,
+            root_path=path,
+            partition_cols=partition_by or None,
+            basename_template=f"part-{index}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+
+
+def _get_time_column(time: np.ndarray, name: str) -> np.ndarray:
+    if name == "year":
+        return time.astype("datetime64[Y]").astype(np.int64) + 1970
+    if name == "month":
+        return time.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    return time.astype("datetime64[D]")
@@ -0,0 +1,232 @@
+"""Stream a dataset in batches without loading it into memory at once."""
+import queue
+import threading
+from collections.abc import Iterator, Sequence
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd  # type: ignore
+import xarray as xr
+
+Batch = dict[str, np.ndarray]
+
+DEFAULT_BATCH_SIZE = 32
+
+# Seconds to wait for a free slot in the prefetch queue before checking
+# whether the consumer stopped iterating.
+_PUT_TIMEOUT = 0.1
+
+
+def iterate_batches(
+    dataset: xr.Dataset,
+    dim: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    variables: Optional[Sequence[str]] = None,
+    drop_remainder: bool = False,
+    prefetch: int = 2,
+) -> Iterator[Batch]:
+    """Iterate over a dataset in batches along a dimension.
+
+    Parameters
+    ----------
+    dataset : xarray.Dataset
+        The (lazy) dataset to stream.
+    dim : str
+        Dimension along which to split the batches.
+    batch_size : int, default 32
+        Number of samples (indexes of `dim`) per batch.
+    variables : list[str], optional
+        Variables to include. Defaults to all data variables along `dim`.
+    drop_remainder : bool, default False
+        Whether to drop the last batch if it has less than `batch_size` samples.
+    prefetch : int, default 2
+        Number of batches loaded ahead in a background thread.
+        If 0, batches are loaded when requested.
+
+    Yields
+    ------
+    dict[str, np.ndarray]
+        Values of each variable as C-contiguous float32 array with `dim`
+        as the first axis.
+
+    """
+    if batch_size < 1:
+        raise ValueError(f"Batch size must be positive, got {batch_size}")
+    if variables is None:
+        variables = [
+            name for name, data in dataset.data_vars.items() if dim in data.dims
+        ]
+    batches = _load_batches(
+        dataset[list(variables)],
+        dim=dim,
+        batch_size=batch_size,
+        drop_remainder=drop_remainder,
+    )
+    if prefetch > 0:
+        return _prefetch(batches, size=prefetch)
+    return batches
+
+
+def get_batch_shapes(
+    dataset: xr.Dataset, dim: str, variables: Optional[Sequence[str]] = None
+) -> dict[str, tuple[int, ...]]:
+    """Get the shape of a single sample of each variable."""
+    if variables is None:
+        variables = [
+            name for name, data in dataset.data_vars.items() if dim in data.dims
+        ]
+    return {
+        name: tuple(
+            dataset.sizes[other] for other in dataset[name].dims if other != dim
+        )
+        for name in variables
+    }
+
+
+def to_tfdataset(
+    dataset: xr.Dataset,
+    dim: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    variables: Optional[Sequence[str]] = None,
+    **kwargs,
+):
+    """Convert a dataset to a batched `tf.data.Dataset`.
+
+    The batches are streamed from the dataset (see `iterate_batches`).
+    Requires TensorFlow to be installed.
+
+    """
+    import tensorflow as tf  # type: ignore
+
+    shapes = get_batch_shapes(dataset, dim=dim, variables=variables)
+    signature = {
+        name: tf.TensorSpec(shape=(None, *shape), dtype=tf.float32)
+        for name, shape in shapes.items()
+    }
+    return tf.data.Dataset.from_generator(
+        lambda: iterate_batches(
+            dataset,
+            dim=dim,
+            batch_size=batch_size,
+            variables=list(shapes),
+            **kwargs,
+        ),
+        output_signature=signature,
+    )
+
+
+def iterate_dataframes(
+    dataset: xr.Dataset, dim: str, by: Union[str, int] = "day"
+) -> Iterator[pd.DataFrame]:
+    """Iterate over a dataset as DataFrames of consecutive parts along a dimension.
+
+    Parameters
+    ----------
+    dataset : xarray.Dataset
+        The (lazy) dataset to convert.
+    dim : str
+        Dimension along which to split the dataset.
+        Its coordinate must be sorted.
+    by : str or int, default "day"
+        How to split the dataset:
+
+        - `"day"`: one DataFrame per calendar day of the coordinate `dim`.
+        - `"file"`: one DataFrame per source file, i.e. per model run for the
+          weather data. The model run of each value is given by the
+          coordinate `init_time`, or derived from the lead time `step`.
+          Data without either are considered a single file.
+        - int: one DataFrame per given number of indexes of `dim`.
+
+    """
+    for part in iterate_parts(dataset, dim=dim, by=by):
+        yield dataset.isel({dim: part}).to_dataframe()
+
+
+def iterate_parts(
+    dataset: xr.Dataset, dim: str, by: Union[str, int]
+) -> Iterator[slice]:
+    """Iterate over the slices of consecutive parts along a dimension.
+
+    See `iterate_dataframes` for the ways to split the dataset.
+
+    """
+    size = dataset.sizes[dim]
+    if isinstance(by, int):
+        if by < 1:
+            raise ValueError(f"Number of indexes per part must be positive, got {by}")
+        yield from (slice(start, start + by) for start in range(0, size, by))
+        return
+    if by == "day":
+        keys = dataset[dim].values.astype("datetime64[D]")
+    elif by == "file":
+        keys = _get_file_keys(dataset, dim=dim)
+    else:
+        raise ValueError(f"Cannot split by {by!r}, must be 'day', 'file' or an int")
+    boundaries = [0, *(np.flatnonzero(keys[1:] != keys[:-1]) + 1), size]
+    yield from (slice(start, stop) for start, stop in zip(boundaries, boundaries[1:]))
+
+
+def _get_file_keys(dataset: xr.Dataset, dim: str) -> np.ndarray:
+    if "init_time" in dataset.coords and dim in dataset["init_time"].dims:
+        return dataset["init_time"].values
+    if "step" in dataset.coords and dataset["step"].dims == (dim,):
+        return (dataset[dim] - dataset["step"]).values
+    return np.zeros(dataset.sizes[dim])
+
+
+def _load_batches(
+    dataset: xr.Dataset, dim: str, batch_size: int, drop_remainder: bool
+) -> Iterator[Batch]:
+    size = dataset.sizes[dim]
+    stop = size - size % batch_size if drop_remainder else size
+    for start in range(0, stop, batch_size):
+        # Loading all variables at once allows dask to share reads of
+        # the same files between the variables.
+        batch = dataset.isel({dim: slice(start, start + batch_size)}).load()
+        yield {
+            name: np.ascontiguousarray(
+                data.transpose(dim, ...).values, dtype=np.float32
+            )
+            for name, data in batch.data_vars.items()
+        }
+
+
+def _prefetch(batches: Iterator[Batch], size: int) -> Iterator[Batch]:
+    """Load batches in a background thread while the previous ones are consumed."""
+    buffer: queue.Queue = queue.Queue(maxsize=size)
+    stopped = threading.Event()
+    end = object()
+
+    def produce() -> None:
+        try:
+            for batch in batches:
+                if not _put(buffer, batch, stopped=stopped):
+                    return
+        except Exception as e:  # noqa: B902
+            _put(buffer, e, stopped=stopped)
+            return
+        _put(buffer, end, stopped=stopped)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is end:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def _put(buffer: queue.Queue, item, stopped: threading.Event) -> bool:
+    while not stopped.is_set():
+        try:
+            buffer.put(item, timeout=_PUT_TIMEOUT)
+            return True
+        except queue.Full:
+            continue
+    return False
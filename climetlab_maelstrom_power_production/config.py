@@ -1,2 +1,17 @@
+import os
+
 ECMWF_CLOUD_URL = "https://object-store.os-api.cci1.ecmwf.int"
 GITHUB_REPO_URL = "https://github.com/4castRenewables/climetlab-plugin-a6"
+# Environment variable overriding the base URL of the object store, e.g. to
+# load the data from a mirror or a local server.
+URL_ENVIRONMENT_VARIABLE = "MAELSTROM_POWER_PRODUCTION_URL"
+
+
+def get_base_url() -> str:
+    """Get the base URL of the object store holding the data.
+
+    Defaults to `ECMWF_CLOUD_URL` and can be overridden by setting the
+    environment variable `MAELSTROM_POWER_PRODUCTION_URL`.
+
+    """
+    return os.environ.get(URL_ENVIRONMENT_VARIABLE, ECMWF_CLOUD_URL).rstrip("/")
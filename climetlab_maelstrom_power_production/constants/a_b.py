@@ -7,14 +7,30 @@
 # nor does it submit to any jurisdiction.
 #
 import climetlab as cml  # type: ignore
+import numpy as np
+import pandas as pd  # type: ignore
+import xarray as xr
 
 from climetlab_maelstrom_power_production import dataset
 
+from . import l137
+
 PATTERN = "ECMWF_AB137.nc"
 
 
 class ABConstants(dataset.AbstractDataset):
-    """Access the constants A and B for the model levels."""
+    """Access the constants A and B for the model levels.
+
+    The constants are bundled with the plugin and hence available without
+    a download. The remote file is only loaded to verify the bundled values.
+
+    Parameters
+    ----------
+    verify : bool, default False
+        Whether to download the remote file and check that its values
+        match the bundled ones.
+
+    """
 
     name = "Constants A and B for the model levels"
     documentation = "Contains the values for the constants A and B."
@@ -26,9 +42,67 @@ class ABConstants(dataset.AbstractDataset):
     )
     url_pattern = PATTERN
 
-    def __init__(self):
-        """Initialize and load the dataset."""
-        self.source = self._get_data()
+    def __init__(self, verify: bool = False):
+        """Initialize the dataset and optionally verify it."""
+        self.source = _BundledSource(to_xarray())
+        if verify:
+            self._verify(self._get_data().to_xarray())
+
+    def to_xarray(self, **kwargs) -> xr.Dataset:
+        """Get the constants as a dataset.
+
+        The dataset has the layout of the file `ECMWF_AB137.nc`: the
+        variables `hyam` and `hybm` hold the coefficients of the half levels
+        0 to 137 along the dimension `dim0_0`.
+
+        """
+        return self.source.to_xarray(**kwargs)
 
     def _get_data(self) -> cml.Source:
         return self._load_source()
+
+    @staticmethod
+    def _verify(remote: xr.Dataset) -> None:
+        expected = l137.get_table()
+        for name, values in zip(("hyam", "hybm"), expected):
+            actual = remote[name].loc[{"dim0": 0}].values
+            if actual.shape != values.shape or not np.allclose(actual, values):
+                raise ValueError(
+                    f"Bundled values of {name!r} do not match the remote file {PATTERN}"
+                )
+
+
+class _BundledSource(cml.Source):
+    """An in-memory source of the bundled constants.
+
+    Its length is the number of half levels, i.e. of pairs of A and B.
+
+    """
+
+    def __init__(self, data: xr.Dataset):
+        self.data = data
+
+    def __len__(self) -> int:
+        return self.data.sizes["dim0_0"]
+
+    def to_xarray(self, **kwargs) -> xr.Dataset:
+        return self.data
+
+    def to_pandas(self, **kwargs) -> pd.DataFrame:
+        return self.data.to_dataframe()
+
+
+def to_xarray() -> xr.Dataset:
+    """Get the bundled constants A and B as a dataset (see `ABConstants`)."""
+    A, B = l137.get_table()
+    dims = ["dim0", "dim0_0"]
+    return xr.Dataset(
+        data_vars={
+            "hyam": (dims, A[np.newaxis]),
+            "hybm": (dims, B[np.newaxis]),
+        },
+        coords={
+            "dim0": ("dim0", [0]),
+            "dim0_0": ("dim0_0", np.arange(l137.NUMBER_OF_LEVELS + 1)),
+        },
+    )
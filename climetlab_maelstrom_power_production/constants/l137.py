@@ -0,0 +1,316 @@
+"""Coefficients A and B of the half levels of the IFS L137 model level definition.
+
+The coefficients define the pressure of the half level k + 1/2 as
+p = A + B * p_s, where p_s is the surface pressure (see `ABConstants`).
+The values are those of the file `ECMWF_AB137.nc` of the
+`maelstrom-constants-a-b` dataset and are bundled to be available without
+any download.
+
+"""
+import functools
+
+import numpy as np
+
+NUMBER_OF_LEVELS = 137
+
+# Coefficient A [Pa] of the half levels 0 (top of the atmosphere) to 137 (surface).
+A = (
+    0.0,
+    2.000365,
+    3.102241,
+    4.666084,
+    6.827977,
+    9.746966,
+    13.605424,
+    18.608931,
+    24.985718,
+    32.98571,
+    42.879242,
+    54.955463,
+    69.520576,
+    86.895882,
+    107.415741,
+    131.425507,
+    159.279404,
+    191.338562,
+    227.968948,
+    269.539581,
+    316.420746,
+    368.982361,
+    427.592499,
+    492.616028,
+    564.413452,
+    643.339905,
+    729.744141,
+    823.967834,
+    926.34491,
+    1037.201172,
+    1156.853638,
+    1285.610352,
+    1423.770142,
+    1571.622925,
+    1729.448975,
+    1897.519287,
+    2076.095947,
+    2265.431641,
+    2465.770508,
+    2677.348145,
+    2900.391357,
+    3135.119385,
+    3381.743652,
+    3640.468262,
+    3911.490479,
+    4194.930664,
+    4490.817383,
+    4799.149414,
+    5119.89502,
+    5452.990723,
+    5798.344727,
+    6156.074219,
+    6526.946777,
+    6911.870605,
+    7311.869141,
+    7727.412109,
+    8159.354004,
+    8608.525391,
+    9076.400391,
+    9562.682617,
+    10065.978516,
+    10584.631836,
+    11116.662109,
+    11660.067383,
+    12211.547852,
+    12766.873047,
+    13324.668945,
+    13881.331055,
+    14432.139648,
+    14975.615234,
+    15508.256836,
+    16026.115234,
+    16527.322266,
+    17008.789063,
+    17467.613281,
+    17901.621094,
+    18308.433594,
+    18685.71875,
+    19031.289063,
+    19343.511719,
+    19620.042969,
+    19859.390625,
+    20059.931641,
+    20219.664063,
+    20337.863281,
+    20412.308594,
+    20442.078125,
+    20425.71875,
+    20361.816406,
+    20249.511719,
+    20087.085938,
+    19874.025391,
+    19608.572266,
+    19290.226563,
+    18917.460938,
+    18489.707031,
+    18006.925781,
+    17471.839844,
+    16888.6875,
+    16262.046875,
+    15596.695313,
+    14898.453125,
+    14173.324219,
+    13427.769531,
+    12668.257813,
+    11901.339844,
+    11133.304688,
+    10370.175781,
+    9617.515625,
+    8880.453125,
+    8163.375,
+    7470.34375,
+    6804.421875,
+    6168.53125,
+    5564.382813,
+    4993.796875,
+    4457.375,
+    3955.960938,
+    3489.234375,
+    3057.265625,
+    2659.140625,
+    2294.242188,
+    1961.5,
+    1659.476563,
+    1387.546875,
+    1143.25,
+    926.507813,
+    734.992188,
+    568.0625,
+    424.414063,
+    302.476563,
+    202.484375,
+    122.101563,
+    62.78125,
+    22.835938,
+    3.757813,
+    0.0,
+    0.0,
+)
+
+# Coefficient B [1] of the half levels 0 (top of the atmosphere) to 137 (surface).
+B = (
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    0.0,
+    3.82e-08,
+    6.7607e-06,
+    2.4348e-05,
+    5.8922e-05,
+    0.0001119143,
+    0.0001985774,
+    0.0003403797,
+    0.0005615553,
+    0.0008896979,
+    0.0013528055,
+    0.001991838,
+    0.0028571242,
+    0.0039709536,
+    0.0053778146,
+    0.0071333768,
+    0.00926146,
+    0.0118060224,
+    0.0148156285,
+    0.0183184519,
+    0.022354845,
+    0.0269635208,
+    0.032176096,
+    0.0380263999,
+    0.0445479602,
+    0.0517730154,
+    0.0597284138,
+    0.068448253,
+    0.0779583082,
+    0.0882857367,
+    0.0994616672,
+    0.1115046516,
+    0.124448128,
+    0.1383128911,
+    0.1531250328,
+    0.168910414,
+    0.1856894493,
+    0.2034912109,
+    0.222332865,
+    0.2422440052,
+    0.2632418871,
+    0.2853540182,
+    0.3085984588,
+    0.3329390883,
+    0.3582541943,
+    0.3843633235,
+    0.4111247659,
+    0.4383912086,
+    0.4660032988,
+    0.4938003123,
+    0.5216192007,
+    0.5493011475,
+    0.5766921639,
+    0.6036480665,
+    0.6300358176,
+    0.6557359695,
+    0.6806430221,
+    0.7046689987,
+    0.7277387381,
+    0.7497965693,
+    0.7707975507,
+    0.7907167673,
+    0.8095360398,
+    0.8272560835,
+    0.8438811302,
+    0.8594318032,
+    0.8739292622,
+    0.8874075413,
+    0.899900496,
+    0.9114481807,
+    0.9220956564,
+    0.9318807721,
+    0.9408595562,
+    0.9490644336,
+    0.9565495253,
+    0.9633517265,
+    0.9695134163,
+    0.9750784039,
+    0.9800716043,
+    0.984541893,
+    0.9884995222,
+    0.9919840097,
+    0.9950025082,
+    0.9976301193,
+    1.0,
+)
+
+
+@functools.lru_cache(maxsize=None)
+def get_table() -> np.ndarray:
+    """Get the coefficients as a read-only table.
+
+    The table is built on first use and shared by the whole process.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (2, 138) with the coefficients A (first row) and
+        B (second row) of the half levels 0 to 137.
+
+    """
+    table = np.array([A, B], dtype=np.float64)
+    table.flags.writeable = False
+    return table
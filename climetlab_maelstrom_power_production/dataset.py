@@ -1,15 +1,42 @@
 import abc
-from typing import Optional
+import os
+from collections.abc import Iterator
+from typing import Optional, Union
 
 import climetlab as cml  # type: ignore
 import pandas as pd  # type: ignore
 from climetlab.sources import url  # type: ignore
+from climetlab.utils import tqdm  # type: ignore
+from climetlab.utils.patterns import Pattern  # type: ignore
 
-from climetlab_maelstrom_power_production import config
+from climetlab_maelstrom_power_production import batches, config, download
 
 from . import merger
 
 BASE_PATTERN = "{url}/maelstrom-ap6/"
+# Subdirectory of the climetlab cache owned by the plugin, where files
+# downloaded by the plugin itself (see `download_workers`) are stored.
+DOWNLOAD_SUBDIRECTORY = "maelstrom-power-production"
+
+
+class _MergedFiles(cml.Source):
+    """Local files that are always loaded via the merger of a dataset."""
+
+    def __init__(self, paths: list[str], merger: merger.AbstractMerger):
+        self.paths = paths
+        self.merger = merger
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({len(self.paths)} files)"
+
+    def to_xarray(self, **kwargs):
+        return self.merger.to_xarray(self.paths, **kwargs)
+
+    def to_pandas(self, **kwargs):
+        return self.merger.to_pandas(self.paths, **kwargs)
+
+    def to_tfdataset(self, **kwargs):
+        return self.merger.to_tfdataset(self.paths, **kwargs)
 
 
 class AbstractDataset(cml.Dataset):
@@ -25,6 +52,19 @@ class AbstractDataset(cml.Dataset):
     dataset = None
     _as_dataframe = None
     _merger: Optional[merger.AbstractMerger] = None
+    # Dimension along which the data are split into batches.
+    batch_dim = "time"
+    # Columns by which the Parquet files can be partitioned.
+    partition_columns: tuple[str, ...] = ("year", "month", "date")
+    # If set, files are downloaded by the plugin with this number of workers
+    # instead of one after another by climetlab.
+    download_workers: Optional[int] = None
+    # Directory of the downloaded files. Defaults to a subdirectory of the
+    # climetlab cache (see `DOWNLOAD_SUBDIRECTORY`).
+    download_directory: Optional[str] = None
+    download_statistics: Optional[download.DownloadStatistics] = None
+    # Whether the dataset can be loaded if some of its files are missing.
+    allow_missing_files = False
 
     @property
     @abc.abstractmethod
@@ -51,17 +91,149 @@ class AbstractDataset(cml.Dataset):
         return self._merger
 
     def _load_source(self, **kwargs) -> cml.Source:
-        request = {"url": config.ECMWF_CLOUD_URL, **kwargs}
+        request = {"url": config.get_base_url(), **kwargs}
         pattern = BASE_PATTERN + self.url_pattern
+        if self.download_workers is not None:
+            return self._download_source(pattern, **request)
         if self.merger is not None:
             return cml.load_source(
                 "url-pattern", pattern, merger=self.merger, **request
             )
         return cml.load_source("url-pattern", pattern, **request)
 
-    def to_dataframe(self) -> pd.DataFrame:
-        """Convert data to dataframe."""
-        if self._as_dataframe is None:
-            dataset = self.to_xarray()
-            self._as_dataframe = dataset.to_dataframe()
-        return self._as_dataframe
+    def _download_source(self, pattern: str, **request) -> cml.Source:
+        """Download the files concurrently and load them from disk."""
+        urls = Pattern(pattern).substitute(**request)
+        urls = [urls] if isinstance(urls, str) else urls
+        directory = self.download_directory or os.path.join(
+            cml.settings.get("cache-directory"), DOWNLOAD_SUBDIRECTORY
+        )
+
+        with tqdm(total=len(urls), unit="file", leave=False) as progress_bar:
+
+            def update_progress(progress: download.FileProgress) -> None:
+                if progress.done:
+                    throughput = downloader.statistics.throughput / 1024**2
+                    progress_bar.set_postfix_str(f"{throughput:.1f} MiB/s")
+                    progress_bar.update()
+
+            downloader = download.Downloader(
+                directory=directory,
+                workers=self.download_workers,  # type: ignore
+                progress=update_progress,
+                ignore_missing=self.allow_missing_files,
+            )
+            paths = downloader.download(urls)
+        if not paths:
+            raise download.DownloadFailedException(
+                f"None of the {len(urls)} files of the dataset are available"
+            )
+
+        self.download_statistics = downloader.statistics
+        if self.merger is not None:
+            # climetlab's multi source returns a single file as is and
+            # hence would skip the merger, e.g. if all but one file are missing.
+            return _MergedFiles(paths, merger=self.merger)
+        sources = [cml.load_source("file", path) for path in paths]
+        return cml.load_source("multi", sources)
+
+    def to_dataframe(self, cache: bool = True) -> pd.DataFrame:
+        """Convert data to dataframe.
+
+        Parameters
+        ----------
+        cache : bool, default True
+            Whether to keep the dataframe in memory for subsequent calls.
+
+        """
+        if self._as_dataframe is not None:
+            return self._as_dataframe
+        dataframe = self.to_xarray().to_dataframe()
+        if cache:
+            self._as_dataframe = dataframe
+        return dataframe
+
+    def to_dataframes(self, by: Union[str, int] = "day") -> Iterator[pd.DataFrame]:
+        """Convert data to dataframes part by part.
+
+        Only one part is converted at a time and nothing is cached, hence
+        memory stays bounded by the size of a part.
+
+        Parameters
+        ----------
+        by : str or int, default "day"
+            Split the data per `"day"`, per `"file"` (model run) or per
+            given number of time steps.
+
+        """
+        return batches.iterate_dataframes(self.to_xarray(), dim=self.batch_dim, by=by)
+
+    def to_batches(
+        self, batch_size: int = batches.DEFAULT_BATCH_SIZE, **kwargs
+    ) -> Iterator[batches.Batch]:
+        """Stream the data in batches of float32 arrays.
+
+        See `batches.iterate_batches` for the available options.
+
+        """
+        return batches.iterate_batches(
+            self.to_xarray(), dim=self.batch_dim, batch_size=batch_size, **kwargs
+        )
+
+    def to_arrow(self):
+        """Convert data to a flat `pyarrow.Table`.
+
+        Coordinates are dictionary-encoded and floating point variables are
+        stored as float32. Requires pyarrow to be installed.
+
+        """
+        from . import arrow
+
+        return arrow.to_table(
+            self.to_xarray(),
+            constant_columns=self._constant_columns,
+            time_coordinate=self.batch_dim,
+        )
+
+    def to_parquet(
+        self,
+        path: str,
+        partition_by: Optional[list[str]] = None,
+        by: Union[str, int] = "day",
+    ) -> None:
+        """Write data to a (partitioned) Parquet dataset.
+
+        The data are converted and written part by part (see `to_dataframes`).
+        Requires pyarrow to be installed.
+
+        Parameters
+        ----------
+        path : str
+            Root directory of the Parquet dataset.
+        partition_by : list[str], optional
+            Columns to partition the files by, see `partition_columns`.
+        by : str or int, default "day"
+            How to split the data into parts while writing.
+
+        """
+        from . import arrow
+
+        invalid = set(partition_by or []) - set(self.partition_columns)
+        if invalid:
+            raise ValueError(
+                f"Cannot partition by {sorted(invalid)}, "
+                f"available are {list(self.partition_columns)}"
+            )
+        arrow.write_parquet(
+            self.to_xarray(),
+            path=path,
+            partition_by=partition_by,
+            constant_columns=self._constant_columns,
+            dim=self.batch_dim,
+            by=by,
+        )
+
+    @property
+    def _constant_columns(self) -> dict[str, object]:
+        """Columns with the same value in each row of the exported data."""
+        return {}
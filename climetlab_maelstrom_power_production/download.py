@@ -0,0 +1,231 @@
+"""Download files concurrently with a bounded number of workers."""
+import concurrent.futures
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from typing import Callable, Optional
+
+DEFAULT_WORKERS = 8
+CHUNK_SIZE = 1024 * 1024
+TIMEOUT = 60
+
+
+class DownloadFailedException(Exception):
+    """A file could not be downloaded."""
+
+
+class FileProgress:
+    """Progress of the download of a single file.
+
+    Parameters
+    ----------
+    url : str
+        URL of the file.
+    path : str
+        Local path of the file.
+    size : int, optional
+        Size of the file in bytes, if reported by the server.
+
+    """
+
+    def __init__(self, url: str, path: str, size: Optional[int] = None):
+        """Initialize the progress."""
+        self.url = url
+        self.path = path
+        self.size = size
+        self.downloaded = 0
+        self.done = False
+
+    @property
+    def fraction(self) -> Optional[float]:
+        """Fraction of the file that is downloaded."""
+        if self.done:
+            return 1.0
+        if not self.size:
+            return None
+        return self.downloaded / self.size
+
+    def __repr__(self) -> str:
+        """Return the progress as a string."""
+        return (
+            f"{self.__class__.__name__}(url={self.url!r}, "
+            f"downloaded={self.downloaded}, size={self.size}, done={self.done})"
+        )
+
+
+class DownloadStatistics:
+    """Aggregate statistics of all downloads of a downloader."""
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.files = 0
+        self.cached_files = 0
+        self.bytes = 0
+        self._start: Optional[float] = None
+        self._end: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds between the start of the first and the end of the last download."""
+        if self._start is None:
+            return 0.0
+        end = self._end if self._end is not None else time.monotonic()
+        return end - self._start
+
+    @property
+    def throughput(self) -> float:
+        """Aggregate throughput in bytes per second."""
+        elapsed = self.elapsed
+        return self.bytes / elapsed if elapsed > 0 else 0.0
+
+    def _started(self) -> None:
+        with self._lock:
+            if self._start is None:
+                self._start = time.monotonic()
+            self._end = None
+
+    def _add(self, downloaded: int) -> None:
+        with self._lock:
+            self.bytes += downloaded
+
+    def _finished(self, cached: bool = False) -> None:
+        with self._lock:
+            self.files += 1
+            self.cached_files += int(cached)
+
+    def _stopped(self) -> None:
+        with self._lock:
+            self._end = time.monotonic()
+
+
+class Downloader:
+    """Download files concurrently using a pool of workers.
+
+    Files are stored in `directory` under the host and path of their URL,
+    e.g. `<directory>/example.com/maelstrom-ap6/ml_20190101_00.nc`. Hence,
+    files of different servers never replace each other. Files that already
+    exist are not downloaded again.
+
+    Parameters
+    ----------
+    directory : str
+        Directory where to store the files.
+    workers : int, default 8
+        Maximum number of files downloaded at the same time.
+    progress : Callable[[FileProgress], None], optional
+        Called from the worker threads whenever the download of a file
+        progressed or finished.
+    chunk_size : int, default 1 MiB
+        Number of bytes read at once.
+    timeout : float, default 60
+        Timeout in seconds for connecting and reading.
+    ignore_missing : bool, default False
+        Whether to skip files that do not exist on the server (HTTP 404)
+        instead of failing.
+
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        workers: int = DEFAULT_WORKERS,
+        progress: Optional[Callable[[FileProgress], None]] = None,
+        chunk_size: int = CHUNK_SIZE,
+        timeout: float = TIMEOUT,
+        ignore_missing: bool = False,
+    ):
+        """Initialize the downloader."""
+        if workers < 1:
+            raise ValueError(f"Number of workers must be positive, got {workers}")
+        self.directory = directory
+        self.workers = workers
+        self.progress = progress
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.ignore_missing = ignore_missing
+        self.missing: list[str] = []
+        self.statistics = DownloadStatistics()
+
+    def download(self, urls: list[str]) -> list[str]:
+        """Download the files and return their local paths in the order of `urls`.
+
+        If `ignore_missing` is set, missing files are skipped and their URLs
+        are appended to `missing`.
+
+        """
+        self.statistics._started()
+        try:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.workers
+            ) as executor:
+                paths = list(executor.map(self._download_file, urls))
+        finally:
+            self.statistics._stopped()
+        return [path for path in paths if path is not None]
+
+    def get_path(self, url: str) -> str:
+        """Get the local path of a file."""
+        parsed = urllib.parse.urlparse(url)
+        # Ports are separated by a colon, which is not allowed on all systems.
+        host = parsed.netloc.replace(":", "_")
+        return os.path.join(self.directory, host, *parsed.path.lstrip("/").split("/"))
+
+    def _download_file(self, url: str) -> Optional[str]:
+        path = self.get_path(url)
+        if os.path.exists(path):
+            progress = FileProgress(url=url, path=path, size=os.path.getsize(path))
+            self._finish(progress, cached=True)
+            return path
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first, so that an interrupted download
+        # is never mistaken for a complete file.
+        temporary = f"{path}.{os.getpid()}-{threading.get_ident()}.part"
+        try:
+            with urllib.request.urlopen(url, timeout=self.timeout) as response:
+                size = response.headers.get("Content-Length")
+                progress = FileProgress(
+                    url=url, path=path, size=int(size) if size is not None else None
+                )
+                with open(temporary, "wb") as file:
+                    self._copy(response, file, progress=progress)
+            if progress.size is not None and progress.downloaded != progress.size:
+                raise OSError(
+                    f"received {progress.downloaded} of {progress.size} bytes"
+                )
+            os.replace(temporary, path)
+        except (urllib.error.URLError, OSError) as e:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            if (
+                self.ignore_missing
+                and isinstance(e, urllib.error.HTTPError)
+                and e.code == 404
+            ):
+                self.missing.append(url)
+                return None
+            raise DownloadFailedException(f"Downloading {url} failed: {e}") from e
+
+        self._finish(progress)
+        return path
+
+    def _copy(self, response, file, progress: FileProgress) -> None:
+        while True:
+            chunk = response.read(self.chunk_size)
+            if not chunk:
+                break
+            file.write(chunk)
+            progress.downloaded += len(chunk)
+            self.statistics._add(len(chunk))
+            if self.progress is not None:
+                self.progress(progress)
+
+    def _finish(self, progress: FileProgress, cached: bool = False) -> None:
+        progress.done = True
+        self.statistics._finished(cached=cached)
+        if self.progress is not None:
+            self.progress(progress)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3# (C) Copyright 2021 ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+#
+import numpy as np
+import pandas as pd  # type: ignore
+import xarray as xr
+
+from climetlab_maelstrom_power_production import merger
+
+POWER_RATING = "power rating [kW]"
+
+
+class ProductionMerger(merger.AbstractMerger):
+    """A merger for the production data of multiple wind turbines.
+
+    The files are decoded one after another and combined along the dimension
+    `turbine`. The coordinates and the power rating of each wind turbine
+    are given as coordinates along that dimension.
+
+    Parameters
+    ----------
+    wind_turbine_ids : list[int]
+        IDs of the wind turbines in the order of the files.
+
+    """
+
+    concat_dim = "turbine"
+    time = "time"
+    longitude = "longitude"
+    latitude = "latitude"
+
+    def __init__(self, wind_turbine_ids: list[int]):
+        """Initialize the merger."""
+        self.wind_turbine_ids = wind_turbine_ids
+
+    def to_pandas(self, paths, **kwargs) -> pd.DataFrame:
+        """Merge a set of files into a single DataFrame."""
+        return self.to_xarray(paths, **kwargs).to_dataframe()
+
+    def to_xarray(self, paths, **kwargs) -> xr.Dataset:
+        """Merge a set of files into a single dataset."""
+        if len(paths) != len(self.wind_turbine_ids):
+            raise ValueError(
+                f"Got {len(paths)} files for {len(self.wind_turbine_ids)} wind turbines"
+            )
+        # The files are small and HDF5 is not thread-safe, hence they are
+        # decoded in the current thread. Only their download is concurrent.
+        datasets = [
+            self._load(path, wind_turbine_id, **kwargs)
+            for path, wind_turbine_id in zip(paths, self.wind_turbine_ids)
+        ]
+        return xr.concat(
+            datasets,
+            dim=self.concat_dim,
+            coords="different",
+            join="outer",
+            combine_attrs="drop_conflicts",
+        )
+
+    def _load(self, path, wind_turbine_id: int, **kwargs) -> xr.Dataset:
+        """Decode a file and index it by the wind turbine."""
+        with xr.open_dataset(path, engine=self.engine, **kwargs) as dataset:
+            dataset = dataset.load()
+        coordinates = {
+            self.longitude: np.ravel(dataset[self.longitude].values)[0],
+            self.latitude: np.ravel(dataset[self.latitude].values)[0],
+            POWER_RATING: float(dataset.attrs.get(POWER_RATING, np.nan)),
+        }
+        squeezed = [
+            dim for dim, size in dataset.sizes.items() if dim != self.time and size == 1
+        ]
+        return (
+            dataset.squeeze(squeezed, drop=True)
+            .drop_vars([self.longitude, self.latitude], errors="ignore")
+            .expand_dims({self.concat_dim: [wind_turbine_id]})
+            .assign_coords(
+                {
+                    name: (self.concat_dim, [value])
+                    for name, value in coordinates.items()
+                }
+            )
+        )
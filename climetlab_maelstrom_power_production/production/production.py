@@ -7,22 +7,33 @@
 # nor does it submit to any jurisdiction.
 #
 """Load wind turbine production data."""
+from typing import Optional, Union
+
 import climetlab as cml  # type: ignore
 
 from climetlab_maelstrom_power_production import dataset
 
+from . import merger
+
 PATTERN = "production_data/wind_turbine_{wind_turbine_id}.nc"
 
 NUMBER_OF_AVAILABLE_WIND_TURBINES = 4
 
 
 class Production(dataset.AbstractDataset):
-    """Access the power production data of a wind turbine.
+    """Access the power production data of one or multiple wind turbines.
 
     Parameters
     ----------
-    wind_turbine_id : int
-        Unique ID of the wind turbine.
+    wind_turbine_id : int, list[int] or "all"
+        Unique ID(s) of the wind turbine(s). If `"all"`, all available wind
+        turbines are loaded. For a list or `"all"`, the data are combined
+        along the dimension `turbine` (see `merger.ProductionMerger`), even
+        if the list holds a single ID.
+    download_workers : int, optional
+        Number of files to download concurrently.
+        If `None`, the files are downloaded by climetlab, unless multiple
+        wind turbines are requested. Then, all files are downloaded concurrently.
 
     """
 
@@ -34,17 +45,51 @@ class Production(dataset.AbstractDataset):
         "https://www.maelstrom-eurohpc.eu/content/docs/uploads/doc6.pdf in Section 3.6."
     )
     url_pattern = PATTERN
+    partition_columns = ("turbine", "year", "month", "date")
 
-    def __init__(self, wind_turbine_id: int):
+    def __init__(
+        self,
+        wind_turbine_id: Union[int, str, list[int]],
+        download_workers: Optional[int] = None,
+    ):
         """Initialize and load the dataset."""
-        wind_turbine_id = int(wind_turbine_id)
-        if wind_turbine_id > NUMBER_OF_AVAILABLE_WIND_TURBINES:
-            raise ValueError(
-                f"No data available for wind turbine with ID {wind_turbine_id}. "
-                f"Available are ID 1 to {NUMBER_OF_AVAILABLE_WIND_TURBINES}."
-            )
-        self.wind_turbine_id = wind_turbine_id
+        self.wind_turbine_id = _convert_wind_turbine_ids(wind_turbine_id)
+        if isinstance(self.wind_turbine_id, list):
+            self._merger = merger.ProductionMerger(self.wind_turbine_id)
+            if download_workers is None:
+                download_workers = len(self.wind_turbine_id)
+        self.download_workers = download_workers
         self.source = self._get_data()
 
     def _get_data(self) -> cml.Source:
         return self._load_source(wind_turbine_id=self.wind_turbine_id)
+
+    @property
+    def _constant_columns(self) -> dict[str, object]:
+        if isinstance(self.wind_turbine_id, list):
+            # Multiple wind turbines are indexed by the dimension `turbine`.
+            return {}
+        return {"turbine": self.wind_turbine_id}
+
+
+def _convert_wind_turbine_ids(
+    wind_turbine_id: Union[int, str, list[int]]
+) -> Union[int, list[int]]:
+    if wind_turbine_id == "all":
+        return list(range(1, NUMBER_OF_AVAILABLE_WIND_TURBINES + 1))
+    if isinstance(wind_turbine_id, (list, tuple)):
+        # Lists of any length keep the dimension `turbine`.
+        if not wind_turbine_id:
+            raise ValueError("At least one wind turbine ID is required")
+        return list(map(_convert_wind_turbine_id, wind_turbine_id))
+    return _convert_wind_turbine_id(wind_turbine_id)
+
+
+def _convert_wind_turbine_id(wind_turbine_id: Union[int, str]) -> int:
+    wind_turbine_id = int(wind_turbine_id)
+    if not 1 <= wind_turbine_id <= NUMBER_OF_AVAILABLE_WIND_TURBINES:
+        raise ValueError(
+            f"No data available for wind turbine with ID {wind_turbine_id}. "
+            f"Available are ID 1 to {NUMBER_OF_AVAILABLE_WIND_TURBINES}."
+        )
+    return wind_turbine_id
@@ -0,0 +1 @@
+"""Utilities for testing and benchmarking without access to the remote data."""
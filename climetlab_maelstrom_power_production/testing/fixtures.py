@@ -0,0 +1,49 @@
+"""Pytest fixtures serving synthetic data from a local object store.
+
+Requires pytest. Register the fixtures in the top-level `conftest.py` with
+
+    pytest_plugins = ["climetlab_maelstrom_power_production.testing.fixtures"]
+
+or import them into any other `conftest.py`.
+
+"""
+import pytest
+
+from climetlab_maelstrom_power_production import config
+
+from . import server, synthetic
+
+
+@pytest.fixture(scope="session")
+def object_store_directory(tmp_path_factory) -> str:
+    """Create a small synthetic dataset once per test session.
+
+    The dataset covers two days of all weather data types on a 4x3 grid
+    and four wind turbines (see `synthetic.create_dataset`).
+
+    """
+    directory = str(tmp_path_factory.mktemp("object-store"))
+    synthetic.create_dataset(
+        directory,
+        days=2,
+        longitudes=4,
+        latitudes=3,
+        wind_turbines=4,
+    )
+    return directory
+
+
+@pytest.fixture()
+def object_store(request, object_store_directory, monkeypatch):
+    """Serve the synthetic dataset and point the plugin at the server.
+
+    Yields the running `server.ObjectStore`. Its options, e.g. the
+    latency, can be given by indirect parametrization:
+
+        @pytest.mark.parametrize("object_store", [{"latency": 0.1}], indirect=True)
+
+    """
+    options = getattr(request, "param", {})
+    with server.ObjectStore(object_store_directory, **options) as store:
+        monkeypatch.setenv(config.URL_ENVIRONMENT_VARIABLE, store.url)
+        yield store
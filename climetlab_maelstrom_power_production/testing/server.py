@@ -0,0 +1,251 @@
+"""A local HTTP server standing in for the remote object store.
+
+The server serves the files of a directory, e.g. one created with
+`synthetic.create_dataset`, and can inject latency, limit the bandwidth and
+fail requests. Hence, downloads can be tested and benchmarked offline and
+reproducibly. Point the plugin at the server by setting the environment
+variable `MAELSTROM_POWER_PRODUCTION_URL` to its URL (see `config`).
+
+The server can also be started from the command line:
+
+    python -m climetlab_maelstrom_power_production.testing.server \
+        <directory> --generate --port 8000 --latency 0.05
+
+"""
+import argparse
+import functools
+import http.server
+import random
+import threading
+import time
+from collections.abc import Sequence
+from typing import Optional
+
+from climetlab_maelstrom_power_production import config
+
+from . import synthetic
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ObjectStore:
+    """Serve the files of a directory via HTTP in a background thread.
+
+    Parameters
+    ----------
+    directory : str
+        Root directory of the served files. A file
+        `<directory>/maelstrom-ap6/ml_20200101_00.nc` is served as
+        `<url>/maelstrom-ap6/ml_20200101_00.nc`.
+    host : str, default "127.0.0.1"
+        Address to listen on.
+    port : int, default 0
+        Port to listen on. If 0, a free port is chosen.
+    latency : float, default 0.0
+        Seconds to wait before answering each request.
+    bandwidth : float, optional
+        Maximum number of bytes per second sent in total over all
+        connections. If `None`, the bandwidth is not limited.
+    failure_rate : float, default 0.0
+        Probability of a request to fail with `failure_status`.
+    failure_status : int, default 503
+        HTTP status of failed requests.
+    truncation_rate : float, default 0.0
+        Probability of a response to be cut off after half of the file,
+        as if the connection was lost.
+    seed : int, optional
+        Seed of the random failures and truncations.
+
+    Notes
+    -----
+    The server counts the requests (`requests`), the failed and truncated
+    requests (`failures`) and the bytes of file content sent (`bytes_sent`).
+
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        bandwidth: Optional[float] = None,
+        failure_rate: float = 0.0,
+        failure_status: int = 503,
+        truncation_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        """Initialize the server without starting it."""
+        if bandwidth is not None and bandwidth <= 0:
+            raise ValueError(f"Bandwidth must be positive, got {bandwidth}")
+        for name, rate in [
+            ("Failure rate", failure_rate),
+            ("Truncation rate", truncation_rate),
+        ]:
+            if not 0.0 <= rate <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1, got {rate}")
+        self.directory = str(directory)
+        self.host = host
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.truncation_rate = truncation_rate
+        self.requests = 0
+        self.failures = 0
+        self.bytes_sent = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        # Time at which all bytes sent so far have passed the bandwidth limit.
+        self._next_send = 0.0
+        handler = functools.partial(_Handler, directory=self.directory, store=self)
+        self._server = http.server.ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server, to be used in place of `config.ECMWF_CLOUD_URL`."""
+        return f"http://{self.host}:{self._server.server_port}"
+
+    def start(self) -> "ObjectStore":
+        """Start serving in a background thread."""
+        if self._thread is None:
+            # Poll frequently, so that stopping the server does not delay tests.
+            self._thread = threading.Thread(
+                target=self._server.serve_forever,
+                kwargs={"poll_interval": 0.05},
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "ObjectStore":
+        """Start serving."""
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        """Stop serving."""
+        self.stop()
+
+    def _start_request(self) -> tuple[bool, bool]:
+        """Count a request and decide whether it fails or is truncated."""
+        with self._lock:
+            self.requests += 1
+            fail = self._random.random() < self.failure_rate
+            truncate = not fail and self._random.random() < self.truncation_rate
+            self.failures += int(fail or truncate)
+        return fail, truncate
+
+    def _throttle(self, size: int) -> None:
+        """Wait for the time sending `size` bytes takes at the bandwidth limit."""
+        with self._lock:
+            self.bytes_sent += size
+            if self.bandwidth is None:
+                return
+            now = time.monotonic()
+            self._next_send = max(now, self._next_send) + size / self.bandwidth
+            end = self._next_send
+        time.sleep(end - now)
+
+
+class _Handler(http.server.SimpleHTTPRequestHandler):
+    """Serve files with the latency, bandwidth and failures of a store."""
+
+    def __init__(self, *args, store: ObjectStore, **kwargs):
+        self.store = store
+        self.truncate = False
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self._inject():
+            super().do_GET()
+
+    def do_HEAD(self) -> None:  # noqa: N802
+        if self._inject():
+            super().do_HEAD()
+
+    def _inject(self) -> bool:
+        """Wait for the latency and fail the request if chosen to.
+
+        Returns whether the request should be answered normally.
+
+        """
+        if self.store.latency > 0:
+            time.sleep(self.store.latency)
+        fail, self.truncate = self.store._start_request()
+        if fail:
+            self.send_error(self.store.failure_status, "Injected failure")
+            return False
+        return True
+
+    def copyfile(self, source, outputfile) -> None:
+        if self.truncate:
+            # Send half of the file and drop the connection.
+            content = source.read()
+            chunk = content[: len(content) // 2]
+            self.store._throttle(len(chunk))
+            outputfile.write(chunk)
+            self.close_connection = True
+            return
+        while True:
+            chunk = source.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            self.store._throttle(len(chunk))
+            outputfile.write(chunk)
+
+    def log_message(self, format, *args) -> None:  # noqa: A002
+        pass
+
+
+def main(arguments: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", help="Root directory of the served files.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--bandwidth", type=float, help="Bytes per second.")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--truncation-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument(
+        "--generate",
+        action="store_true",
+        help="Create a synthetic dataset in the directory before serving.",
+    )
+    parser.add_argument("--days", type=int, default=2)
+    args = parser.parse_args(arguments)
+
+    if args.generate:
+        synthetic.create_dataset(args.directory, days=args.days)
+    store = ObjectStore(
+        args.directory,
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        bandwidth=args.bandwidth,
+        failure_rate=args.failure_rate,
+        truncation_rate=args.truncation_rate,
+        seed=args.seed,
+    )
+    print(f"Serving {args.directory} at {store.url}")
+    print(f"Set {config.URL_ENVIRONMENT_VARIABLE}={store.url} to use it")
+    try:
+        store._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""Generate synthetic files with the layout of the remote data.
+
+The files are written to a directory with the same structure as the object
+store, e.g. `<directory>/maelstrom-ap6/ml_20200101_00.nc`. Hence, they can be
+merged by the plugin or served by a local HTTP server in place of the
+real data. All values are random, but within physically plausible ranges.
+
+"""
+import os
+from collections.abc import Sequence
+from typing import Optional
+
+import numpy as np
+import pandas as pd  # type: ignore
+import xarray as xr
+
+from climetlab_maelstrom_power_production import dataset
+from climetlab_maelstrom_power_production.constants import a_b
+from climetlab_maelstrom_power_production.production import merger as production_merger
+from climetlab_maelstrom_power_production.production import production
+from climetlab_maelstrom_power_production.weather import abc
+from climetlab_maelstrom_power_production.weather import merger as weather_merger
+
+# Directory of the files relative to the root of the object store.
+PREFIX = dataset.BASE_PATTERN.format(url="").strip("/")
+
+FORECAST_HOURS = 48
+DEFAULT_MODEL_LEVELS = tuple(range(128, 138))
+DEFAULT_PRESSURE_LEVELS = (500, 700, 850, 925, 1000)
+WEATHER_VARIABLES = {
+    "ml": ("t", "q", "u", "v"),
+    "pl": ("t", "q", "u", "v", "z"),
+    "sfc": ("sp", "t2m", "u10", "v10"),
+}
+PRODUCTION_INTERVAL = "10min"
+
+
+def get_grid(
+    longitudes: int,
+    latitudes: int,
+    resolution: float = 0.1,
+    north_west: tuple[float, float] = (55.0, 5.0),
+) -> tuple[np.ndarray, np.ndarray]:
+    """Get the coordinates of a regular grid.
+
+    Longitudes are ascending and latitudes descending from the north-west
+    corner, as in the remote data.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        Longitudes and latitudes of the grid.
+
+    """
+    north, west = north_west
+    return (
+        np.round(west + resolution * np.arange(longitudes), 6),
+        np.round(north - resolution * np.arange(latitudes), 6),
+    )
+
+
+def create_weather_file(
+    path: str,
+    type: str,  # noqa: A002
+    init_time: str,
+    longitudes: np.ndarray,
+    latitudes: np.ndarray,
+    levels: Optional[Sequence[int]] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> str:
+    """Create a file with the layout of the weather data of a model run.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file.
+    type : str
+        Type of the weather data: `ml` (model level), `pl` (pressure level)
+        or `sfc` (surface level).
+    init_time : str
+        Initialization time of the model run. The file holds the 48 hourly
+        time steps starting at this time.
+    longitudes : np.ndarray
+        Longitudes of the grid.
+    latitudes : np.ndarray
+        Latitudes of the grid.
+    levels : list[int], optional
+        Model or pressure levels. Defaults to `DEFAULT_MODEL_LEVELS` or
+        `DEFAULT_PRESSURE_LEVELS`. Ignored for the surface level data.
+    rng : numpy.random.Generator, optional
+        Random number generator for the values.
+
+    Returns
+    -------
+    str
+        Path of the file.
+
+    """
+    if type not in WEATHER_VARIABLES:
+        raise ValueError(
+            f"Unknown type {type!r}, must be one of {sorted(WEATHER_VARIABLES)}"
+        )
+    rng = np.random.default_rng() if rng is None else rng
+    coords = {"time": pd.date_range(init_time, periods=FORECAST_HOURS, freq="1h")}
+    if type != "sfc":
+        if levels is None:
+            levels = DEFAULT_MODEL_LEVELS if type == "ml" else DEFAULT_PRESSURE_LEVELS
+        coords["level"] = np.asarray(levels, dtype=np.int64)
+    coords["latitude"] = latitudes
+    coords["longitude"] = longitudes
+    dims = list(coords)
+    shape = tuple(len(values) for values in coords.values())
+    data = xr.Dataset(
+        data_vars={
+            name: (dims, _get_values(name, shape=shape, rng=rng))
+            for name in WEATHER_VARIABLES[type]
+        },
+        coords=coords,
+    )
+    _to_netcdf(data, path)
+    return path
+
+
+def create_production_file(
+    path: str,
+    wind_turbine_id: int,
+    start: str,
+    days: int,
+    longitude: float,
+    latitude: float,
+    power_rating: float = 2000.0,
+    rng: Optional[np.random.Generator] = None,
+) -> str:
+    """Create a file with the layout of the production data of a wind turbine.
+
+    The production and wind speed are given in 10-minute intervals. The
+    variables `regulation` and `status` are mostly 0, i.e. normal operation.
+
+    Returns
+    -------
+    str
+        Path of the file.
+
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    time = pd.date_range(
+        start,
+        end=pd.Timestamp(start) + pd.Timedelta(days=days),
+        freq=PRODUCTION_INTERVAL,
+        inclusive="left",
+    )
+    shape = (time.size, 1, 1)
+    dims = ["time", "latitude", "longitude"]
+    data = xr.Dataset(
+        data_vars={
+            "production": (
+                dims,
+                power_rating * rng.beta(0.8, 1.5, size=shape).astype(np.float32),
+            ),
+            "wind_speed": (dims, rng.weibull(2.0, size=shape).astype(np.float32) * 8),
+            "regulation": (dims, (rng.random(shape) < 0.02).astype(np.int8)),
+            "status": (dims, (rng.random(shape) < 0.01).astype(np.int8)),
+        },
+        coords={"time": time, "latitude": [latitude], "longitude": [longitude]},
+        attrs={production_merger.POWER_RATING: power_rating},
+    )
+    _to_netcdf(data, path)
+    return path
+
+
+def create_constants_file(path: str) -> str:
+    """Create a file with the layout of `ECMWF_AB137.nc`."""
+    _to_netcdf(a_b.to_xarray(), path)
+    return path
+
+
+def create_dataset(
+    directory: str,
+    days: int = 1,
+    start: str = "2020-01-01",
+    longitudes: int = 10,
+    latitudes: int = 10,
+    model_levels: Sequence[int] = DEFAULT_MODEL_LEVELS,
+    pressure_levels: Sequence[int] = DEFAULT_PRESSURE_LEVELS,
+    types: Sequence[str] = ("ml", "pl", "sfc"),
+    wind_turbines: int = 2,
+    seed: int = 0,
+) -> dict[str, list[str]]:
+    """Create all files of a synthetic dataset in the layout of the object store.
+
+    Parameters
+    ----------
+    directory : str
+        Root directory of the object store. The files are written to the
+        subdirectory `maelstrom-ap6`.
+    days : int, default 1
+        Number of days starting at `start`. Each day has two model runs.
+    start : str, default "2020-01-01"
+        First day of the data.
+    longitudes : int, default 10
+        Number of grid points along the longitude.
+    latitudes : int, default 10
+        Number of grid points along the latitude.
+    model_levels : list[int]
+        Levels of the model level data.
+    pressure_levels : list[int]
+        Levels of the pressure level data.
+    types : list[str], default ("ml", "pl", "sfc")
+        Types of weather data to create.
+    wind_turbines : int, default 2
+        Number of wind turbines, located at random grid points.
+    seed : int, default 0
+        Seed of the random values.
+
+    Returns
+    -------
+    dict[str, list[str]]
+        Paths of the files by type (`ml`, `pl`, `sfc`, `production` and
+        `constants`). The weather files are sorted by initialization time.
+
+    """
+    rng = np.random.default_rng(seed)
+    root = os.path.join(directory, PREFIX)
+    grid = get_grid(longitudes=longitudes, latitudes=latitudes)
+    levels = {"ml": model_levels, "pl": pressure_levels, "sfc": None}
+    init_times = pd.date_range(
+        start,
+        periods=2 * days,
+        freq=pd.Timedelta(weather_merger.WeatherMerger.run_interval),
+    )
+
+    paths: dict[str, list[str]] = {}
+    for type in types:  # noqa: A001
+        paths[type] = [
+            create_weather_file(
+                os.path.join(
+                    root,
+                    abc.PATTERN.format(
+                        type=type,
+                        date_with_model_timestamp=init_time.strftime("%Y%m%d_%H"),
+                    ),
+                ),
+                type=type,
+                init_time=str(init_time),
+                longitudes=grid[0],
+                latitudes=grid[1],
+                levels=levels[type],
+                rng=rng,
+            )
+            for init_time in init_times
+        ]
+    paths["production"] = [
+        create_production_file(
+            os.path.join(
+                root, production.PATTERN.format(wind_turbine_id=wind_turbine_id)
+            ),
+            wind_turbine_id=wind_turbine_id,
+            start=start,
+            days=days,
+            longitude=float(rng.choice(grid[0])),
+            latitude=float(rng.choice(grid[1])),
+            rng=rng,
+        )
+        for wind_turbine_id in range(1, wind_turbines + 1)
+    ]
+    paths["constants"] = [
+        create_constants_file(os.path.join(root, a_b.PATTERN)),
+    ]
+    return paths
+
+
+def _get_values(
+    name: str, shape: tuple[int, ...], rng: np.random.Generator
+) -> np.ndarray:
+    """Get random values of a variable within a plausible range."""
+    if name in ("t", "t2m"):
+        values = rng.normal(280.0, 5.0, size=shape)
+    elif name == "q":
+        values = rng.uniform(0.001, 0.01, size=shape)
+    elif name == "sp":
+        values = rng.normal(100000.0, 1000.0, size=shape)
+    elif name == "z":
+        values = rng.normal(30000.0, 5000.0, size=shape)
+    else:
+        values = rng.normal(0.0, 6.0, size=shape)
+    return values.astype(np.float32)
+
+
+def _to_netcdf(data: xr.Dataset, path: str) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    data.to_netcdf(path)
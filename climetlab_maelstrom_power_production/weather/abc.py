@@ -9,6 +9,7 @@
 import abc
 import datetime
 import itertools
+from collections.abc import Sequence
 from typing import Optional, Union
 
 import climetlab as cml  # type: ignore
@@ -16,12 +17,10 @@ import pandas as pd  # type: ignore
 
 import climetlab_maelstrom_power_production.merger
 from climetlab_maelstrom_power_production import dataset
+from climetlab_maelstrom_power_production.production import production
 
 from . import merger
 
-# TODO: Implement merging of the two datasets (currently only `PATTERN_1` is loaded).
-#  Make sure to always take the more recent data if there are duplicates.
-
 PATTERN = "{type}_{date_with_model_timestamp}.nc"
 MODEL_TIMESTAMP_1 = "00"
 MODEL_TIMESTAMP_2 = "12"
@@ -50,6 +49,32 @@ class Weather(dataset.AbstractDataset):
     date : str or t.List[str], default None
         Date(s) for which to get the weather data.
         If `None`, all available dates will be fetched.
+    zarr_store_directory : str, optional
+        Directory where to keep the merged data as Zarr stores.
+        If given, the merged data are converted to a Zarr store the first
+        time they are loaded, and later loads of the same type and dates
+        open that store instead of the source files.
+    area : tuple[float, float, float, float], optional
+        Bounding box (north, west, south, east) of the grid points to load.
+    grid_points : list[tuple[float, float]], optional
+        Coordinates (longitude, latitude) whose closest grid points to load.
+    wind_turbine_ids : int or list[int], optional
+        ID(s) of the wind turbines whose closest grid points to load.
+    variables : list[str], optional
+        Names of the variables to load. If `None`, all variables are loaded.
+    levels : list[int], optional
+        Model or pressure levels to load. If `None`, all levels are loaded.
+        Ignored for the surface level data.
+    lead_time_cube : bool, default False
+        Whether to index the data by initialization time and lead time
+        (`init_time`, `step`) instead of merging the model runs into a
+        single timeline.
+    download_workers : int, optional
+        Number of files to download concurrently.
+        If `None`, the files are downloaded one after another by climetlab.
+
+    Only one of `area`, `grid_points` and `wind_turbine_ids` may be given.
+    If none is given, the data for whole Europe are loaded.
 
     """
 
@@ -57,11 +82,39 @@ class Weather(dataset.AbstractDataset):
     model_timestamp_1 = MODEL_TIMESTAMP_1
     model_timestamp_2 = MODEL_TIMESTAMP_2
     dates = AVAILABLE_DATA_DATES
+    _merger: merger.WeatherMerger
+    partition_columns = ("level", "year", "month", "date")
+    # Missing model runs are replaced by older runs when merging.
+    allow_missing_files = True
 
-    def __init__(self, date: Optional[Union[str, list[str]]] = None):
+    def __init__(
+        self,
+        date: Optional[Union[str, list[str]]] = None,
+        zarr_store_directory: Optional[str] = None,
+        area: Optional[merger.Area] = None,
+        grid_points: Optional[Sequence[merger.GridPoint]] = None,
+        wind_turbine_ids: Optional[Union[int, list[int]]] = None,
+        variables: Optional[list[str]] = None,
+        levels: Optional[list[int]] = None,
+        lead_time_cube: bool = False,
+        download_workers: Optional[int] = None,
+    ):
         """Initialize and load the dataset."""
+        _check_spatial_selection(
+            area=area, grid_points=grid_points, wind_turbine_ids=wind_turbine_ids
+        )
         self.date = _convert_dates(date) if date is not None else self.dates
-        self._merger = merger.WeatherMerger()
+        if wind_turbine_ids is not None:
+            grid_points = _get_wind_turbine_coordinates(wind_turbine_ids)
+        self._merger = merger.WeatherMerger(
+            zarr_store_directory=zarr_store_directory,
+            area=area,
+            grid_points=grid_points,
+            variables=variables,
+            levels=levels,
+            lead_time_cube=lead_time_cube,
+        )
+        self.download_workers = download_workers
 
         self.source = self._get_data()
 
@@ -81,6 +134,11 @@ class Weather(dataset.AbstractDataset):
         """Get the merger for the weather data."""
         return self._merger
 
+    @property
+    def batch_dim(self) -> str:  # type: ignore
+        """Dimension along which the data are split into batches."""
+        return self._merger.batch_dim
+
     def _get_data(self) -> cml.Source:
         dates_with_model_timestamps = self._add_timestamps_to_each_date()
         return self._load_source(
@@ -98,6 +156,36 @@ class Weather(dataset.AbstractDataset):
         return list(dates_with_model_timestamps)
 
 
+def _check_spatial_selection(**selections) -> None:
+    given = [name for name, selection in selections.items() if selection is not None]
+    if len(given) > 1:
+        raise ValueError(
+            f"Only one of {', '.join(selections)} may be given, got {', '.join(given)}"
+        )
+    area = selections.get("area")
+    if area is not None:
+        north, west, south, east = area
+        if north < south or east < west:
+            raise ValueError(
+                f"Area {area} is invalid (north, west, south, east required)"
+            )
+
+
+def _get_wind_turbine_coordinates(
+    wind_turbine_ids: Union[int, list[int]]
+) -> list[merger.GridPoint]:
+    """Get the coordinates (longitude, latitude) of wind turbines."""
+    if isinstance(wind_turbine_ids, int):
+        wind_turbine_ids = [wind_turbine_ids]
+    coordinates = []
+    for wind_turbine_id in wind_turbine_ids:
+        data = production.Production(wind_turbine_id).to_xarray()
+        longitude = float(data.coords["longitude"].values[0])
+        latitude = float(data.coords["latitude"].values[0])
+        coordinates.append((longitude, latitude))
+    return coordinates
+
+
 def _convert_dates(dates: Union[str, list[str]]) -> list[datetime.datetime]:
     if isinstance(dates, str):
         dates_as_datetime = [_convert_to_datetime(dates)]  # type: ignore
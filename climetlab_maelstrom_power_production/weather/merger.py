@@ -6,23 +6,115 @@
 # granted to it by virtue of its status as an intergovernmental organisation
 # nor does it submit to any jurisdiction.
 #
+import hashlib
+import os
+import shutil
+import warnings
+from collections.abc import Iterator, Sequence
 from typing import Optional
 
+import numpy as np
 import pandas as pd  # type: ignore
 import xarray as xr
 
-from climetlab_maelstrom_power_production import merger
+from climetlab_maelstrom_power_production import batches, merger
+
+Area = tuple[float, float, float, float]
+GridPoint = tuple[float, float]
+
+# Encoding keys that are kept when converting the merged NetCDF data to Zarr.
+# All others (e.g. NetCDF chunk sizes or compression settings) are specific
+# to the source files and conflict with the chunks of the Zarr store.
+ZARR_ENCODING_KEYS = (
+    "dtype",
+    "_FillValue",
+    "scale_factor",
+    "add_offset",
+    "units",
+    "calendar",
+)
 
 
 class WeatherMerger(merger.AbstractMerger):
-    """A merger for the weather data."""
+    """A merger for the weather data.
+
+    Parameters
+    ----------
+    options : dict, optional
+        Additional options passed to `xarray.open_mfdataset`.
+    zarr_store_directory : str, optional
+        Directory where to store the merged data as Zarr stores.
+        If given, the merged result of a set of files is converted to a
+        chunked and consolidated Zarr store the first time it is loaded.
+        Subsequent loads of the same set of files open that store instead
+        of scanning all source files again.
+    area : tuple[float, float, float, float], optional
+        Bounding box (north, west, south, east) of the grid points to load.
+    grid_points : list[tuple[float, float]], optional
+        Coordinates (longitude, latitude) whose closest grid points to load.
+        The result contains all combinations of the closest longitudes and
+        latitudes, hence it stays a regular grid.
+    variables : list[str], optional
+        Names of the variables to load.
+    levels : list[int], optional
+        Levels (model or pressure levels) to load.
+        Ignored for data without levels (surface level data).
+    lead_time_cube : bool, default False
+        Whether to return the data indexed by initialization time and lead
+        time (`init_time`, `step`) instead of a single timeline.
+        The valid time of each value is given by the coordinate `valid_time`.
+        All time steps of all model runs are kept.
+
+    Notes
+    -----
+    The selections are applied to each file before the files are
+    concatenated. Hence, only the requested data are ever loaded.
+
+    The model runs are calculated at 00:00 and 12:00 for 48 hours each,
+    hence the files overlap. For each valid time, the value of the most
+    recent run is used (see `_stitch`). The lead time of each value is kept
+    in the coordinate `step`. Alternatively, the model runs can be returned
+    as a lead time cube, which is a lazy view on the files without any
+    slicing (see `lead_time_cube`).
+
+    """
 
     # Coordinate to use for merging multiple datasets.
     concat_dim = "time"
+    # Chunks of the Zarr stores. Dimensions not given keep the source chunks.
+    zarr_chunks = {"time": 24, "init_time": 1}
+    longitude = "longitude"
+    latitude = "latitude"
+    level = "level"
+    step = "step"
+    init_time = "init_time"
+    valid_time = "valid_time"
+    # Interval between two model runs. The merged data end one interval after
+    # the most recent run, as if no run was missing.
+    run_interval = np.timedelta64(12, "h")
+    # Chunk size of the files along the time dimension, i.e. one run interval
+    # of hourly data. Stitching then only reads the chunks of the kept time
+    # steps instead of all time steps of each file.
+    time_chunks = 12
 
-    def __init__(self, options: Optional[dict] = None):
+    def __init__(
+        self,
+        options: Optional[dict] = None,
+        zarr_store_directory: Optional[str] = None,
+        area: Optional[Area] = None,
+        grid_points: Optional[Sequence[GridPoint]] = None,
+        variables: Optional[Sequence[str]] = None,
+        levels: Optional[Sequence[int]] = None,
+        lead_time_cube: bool = False,
+    ):
         """Initialize the merger."""
         self.options = options or {}
+        self.zarr_store_directory = zarr_store_directory
+        self.area = area
+        self.grid_points = grid_points
+        self.variables = variables
+        self.levels = levels
+        self.lead_time_cube = lead_time_cube
 
     def to_pandas(self, paths, **kwargs) -> pd.DataFrame:
         """Merge a set of files into a single DataFrame."""
@@ -30,27 +122,238 @@ class WeatherMerger(merger.AbstractMerger):
 
     def to_xarray(self, paths, **kwargs) -> xr.Dataset:
         """Merge a set of files into a single dataset."""
-        return xr.open_mfdataset(
+        if self.zarr_store_directory is None:
+            return self._merge(paths, **kwargs)
+        store = self._get_zarr_store_path(paths, **kwargs)
+        if not os.path.exists(store):
+            self._write_zarr_store(self._merge(paths, **kwargs), path=store)
+        return xr.open_zarr(store, consolidated=True)
+
+    def to_batches(
+        self, paths, batch_size: int = batches.DEFAULT_BATCH_SIZE, **kwargs
+    ) -> Iterator[batches.Batch]:
+        """Stream the merged files in batches along the time dimension.
+
+        For a lead time cube, the batches are split along the initialization
+        time. See `batches.iterate_batches` for the available options.
+
+        """
+        return batches.iterate_batches(
+            self.to_xarray(paths), dim=self.batch_dim, batch_size=batch_size, **kwargs
+        )
+
+    def to_tfdataset(
+        self, paths, batch_size: int = batches.DEFAULT_BATCH_SIZE, **kwargs
+    ):
+        """Stream the merged files as a batched `tf.data.Dataset`."""
+        return batches.to_tfdataset(
+            self.to_xarray(paths), dim=self.batch_dim, batch_size=batch_size, **kwargs
+        )
+
+    @property
+    def batch_dim(self) -> str:
+        """Dimension along which the merged data are split into batches."""
+        return self.init_time if self.lead_time_cube else self.concat_dim
+
+    def _merge(self, paths, **kwargs) -> xr.Dataset:
+        options = {**self.options, **kwargs}
+        if self.lead_time_cube:
+            concat_dim, preprocess = self.init_time, self._preprocess_run
+        else:
+            concat_dim, preprocess = self.concat_dim, self._preprocess
+            options.setdefault("chunks", {self.concat_dim: self.time_chunks})
+        dataset = xr.open_mfdataset(
             paths,
             engine=self.engine,
-            concat_dim=self.concat_dim,
+            concat_dim=concat_dim,
             combine="nested",
             coords="minimal",
             data_vars="minimal",
-            preprocess=self._slice_first_twelve_hours,
+            preprocess=preprocess,
             compat="override",
             parallel=True,
-            **self.options,
+            **options,
+        )
+        if self.lead_time_cube:
+            return dataset.assign_coords(
+                {self.valid_time: dataset[self.init_time] + dataset[self.step]}
+            )
+        return self._stitch(dataset)
+
+    def _preprocess(self, dataset: xr.Dataset) -> xr.Dataset:
+        """Reduce each file to the data required before concatenation."""
+        dataset = self._select(dataset)
+        return self._assign_lead_time(dataset)
+
+    def _preprocess_run(self, dataset: xr.Dataset) -> xr.Dataset:
+        """Index a file by initialization time and lead time."""
+        dataset = self._assign_lead_time(self._select(dataset))
+        initialization = dataset[self.concat_dim].values[:1]
+        return (
+            dataset.swap_dims({self.concat_dim: self.step})
+            .drop_vars(self.concat_dim)
+            .expand_dims({self.init_time: initialization})
         )
 
-    def _slice_first_twelve_hours(self, dataset: xr.Dataset) -> xr.Dataset:
-        """Cut an hourly dataset after the first 12 hours.
+    def _select(self, dataset: xr.Dataset) -> xr.Dataset:
+        dataset = self._select_variables(dataset)
+        dataset = self._select_levels(dataset)
+        dataset = self._select_area(dataset)
+        return self._select_grid_points(dataset)
+
+    def _select_variables(self, dataset: xr.Dataset) -> xr.Dataset:
+        """Drop all variables that were not requested."""
+        if self.variables is None:
+            return dataset
+        missing = set(self.variables) - set(dataset.data_vars)
+        if missing:
+            raise ValueError(
+                f"Variables {sorted(missing)} not available, "
+                f"available are {sorted(dataset.data_vars)}"
+            )
+        return dataset[list(self.variables)]
+
+    def _select_levels(self, dataset: xr.Dataset) -> xr.Dataset:
+        """Select the requested levels."""
+        if self.levels is None or self.level not in dataset.dims:
+            return dataset
+        try:
+            return dataset.sel({self.level: list(self.levels)})
+        except KeyError:
+            raise ValueError(
+                f"Levels {self.levels} not available, available are "
+                f"{dataset[self.level].values.tolist()}"
+            )
+
+    def _select_area(self, dataset: xr.Dataset) -> xr.Dataset:
+        """Select the grid points inside the bounding box."""
+        if self.area is None:
+            return dataset
+        north, west, south, east = self.area
+        longitudes = dataset[self.longitude].values
+        latitudes = dataset[self.latitude].values
+        indexes = {
+            self.longitude: np.flatnonzero((longitudes >= west) & (longitudes <= east)),
+            self.latitude: np.flatnonzero((latitudes >= south) & (latitudes <= north)),
+        }
+        if any(index.size == 0 for index in indexes.values()):
+            raise ValueError(f"Area {self.area} does not contain any grid points")
+        return dataset.isel(indexes)
 
-        This is necessary to overwrite older model runs with newer ones.
+    def _select_grid_points(self, dataset: xr.Dataset) -> xr.Dataset:
+        """Select the grid points closest to the given coordinates."""
+        if self.grid_points is None:
+            return dataset
+        longitudes, latitudes = np.asarray(self.grid_points, dtype=float).T
+        indexes = {
+            self.longitude: _get_closest_indexes(
+                dataset[self.longitude].values, values=longitudes
+            ),
+            self.latitude: _get_closest_indexes(
+                dataset[self.latitude].values, values=latitudes
+            ),
+        }
+        return dataset.isel(indexes)
 
-        Models are calculated at 00:00 and 12:00 for 48 hours each. Hence,
-        when using two model runs, one always wants the newer values of the
-        recent run to overwrite the older ones.
+    def _assign_lead_time(self, dataset: xr.Dataset) -> xr.Dataset:
+        """Assign the lead time of each time step relative to the model run.
+
+        The first time step of each file is the initialization time of the run.
+
+        """
+        time = dataset[self.concat_dim]
+        return dataset.assign_coords({self.step: time - time[0]})
+
+    def _stitch(self, dataset: xr.Dataset) -> xr.Dataset:
+        """Select the value of the most recent model run for each valid time.
+
+        The concatenated files contain each valid time up to four times (once
+        per overlapping run). Sorting by valid time and, for equal valid
+        times, by descending initialization time puts the most recent run
+        first. Hence, the indexes to keep are the first of each valid time.
+
+        If a run is missing, its valid times are taken from the older runs
+        at longer lead times. The files are chunked by run interval along the
+        time dimension (see `time_chunks`), hence the chunks holding only
+        discarded time steps are never read.
+
+        """
+        time = dataset[self.concat_dim].values
+        initialization = time - dataset[self.step].values
+        order = np.lexsort((-initialization.astype(np.int64), time))
+        sorted_time = time[order]
+        is_first = np.ones(sorted_time.size, dtype=bool)
+        is_first[1:] = sorted_time[1:] != sorted_time[:-1]
+        indexes = order[is_first]
+        indexes = indexes[time[indexes] < initialization.max() + self.run_interval]
+
+        stitched = dataset.isel({self.concat_dim: indexes})
+        _warn_about_gaps(stitched[self.concat_dim].values)
+        return stitched
+
+    def _get_zarr_store_path(self, paths, **kwargs) -> str:
+        """Get the path of the Zarr store for a set of files.
+
+        The name of the store is a hash of the source files and the merge
+        options, hence each distinct request gets its own store.
 
         """
-        return dataset.isel({self.concat_dim: slice(None, 12)})
+        paths = [paths] if isinstance(paths, str) else paths
+        key = repr(
+            (
+                sorted(map(str, paths)),
+                sorted(self.options.items()),
+                self.area,
+                self.grid_points,
+                self.variables,
+                self.levels,
+                self.lead_time_cube,
+                sorted(kwargs.items()),
+            )
+        )
+        name = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.zarr_store_directory, f"{name}.zarr")  # type: ignore
+
+    def _write_zarr_store(self, dataset: xr.Dataset, path: str) -> None:
+        """Write a dataset to a consolidated Zarr store.
+
+        The store is written to a temporary location first and moved
+        afterwards. Hence, concurrent processes never open an incomplete store.
+
+        """
+        chunks = {
+            dim: size for dim, size in self.zarr_chunks.items() if dim in dataset.dims
+        }
+        dataset = dataset.chunk(chunks)
+        for variable in dataset.variables.values():
+            variable.encoding = {
+                key: value
+                for key, value in variable.encoding.items()
+                if key in ZARR_ENCODING_KEYS
+            }
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        dataset.to_zarr(temporary, mode="w", consolidated=True)
+        try:
+            os.rename(temporary, path)
+        except OSError:
+            # Another process has written the same store in the meantime.
+            shutil.rmtree(temporary, ignore_errors=True)
+
+
+def _get_closest_indexes(axis: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Get the sorted unique indexes of the axis values closest to the given values."""
+    distances = np.abs(axis[:, np.newaxis] - values[np.newaxis, :])
+    return np.unique(distances.argmin(axis=0))
+
+
+def _warn_about_gaps(time: np.ndarray) -> None:
+    """Warn if time steps are missing, e.g. because of missing model runs."""
+    if time.size < 2:
+        return
+    differences = np.diff(time)
+    gaps = np.flatnonzero(differences > differences.min())
+    if gaps.size > 0:
+        missing = ", ".join(f"{time[i]} to {time[i + 1]}" for i in gaps)
+        warnings.warn(f"Weather data have gaps between {missing}")
@@ -1,19 +1,30 @@
+from .cleaning import DEFAULT_RULES, Rule, filter_production_data
 from .data import (
+    get_closest_grid_point_indexes_to_wind_turbines,
     get_closest_grid_point_to_wind_turbine,
     get_power_rating,
     resample_and_clear_production_data_to_hourly_timeseries,
+    resample_to_hourly,
 )
-from .density import calculate_air_density
+from .density import calculate_air_density, calculate_density
+from .features import FeatureMatrix, build_feature_matrix
+from .grid import GridIndex
+from .height import calculate_level_heights, interpolate_to_heights
+from .interpolation import PointInterpolator, interpolate_to_sites
 from .metrics import (
+    ErrorAccumulator,
+    GroupedErrorAccumulator,
     normalized_mean_absolute_error,
     normalized_root_mean_squared_error,
     root_mean_squared_error,
 )
-from .model import predict_power_production, train_model
+from .model import predict_power_production, register_backend, train_model
 from .plot import plot_forecast_and_real_production_data
-from .pressure import calculate_pressure
+from .pressure import calculate_pressure, calculate_pressure_on_levels
+from .sweep import Job, create_jobs, run_sweep
 from .time import (
     get_dates_from_time_coordinate,
+    get_time_features,
     get_time_of_day,
     get_time_of_day_and_year,
     get_time_of_year,
@@ -21,5 +32,6 @@ from .time import (
 from .wind import (
     calculate_absolute_wind_speed,
     calculate_absolute_wind_speed_and_wind_direction,
+    calculate_wind_at_heights,
     calculate_wind_direction_angle,
 )
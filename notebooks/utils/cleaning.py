@@ -0,0 +1,155 @@
+"""Filter curtailed, stopped and faulty intervals from the production data."""
+import dataclasses
+from collections.abc import Sequence
+from typing import Optional
+
+import pandas as pd
+import xarray as xr
+
+ACTIONS = ("mask", "drop", "flag")
+
+
+@dataclasses.dataclass(frozen=True)
+class Rule:
+    """A rule flagging invalid intervals by the values of a variable.
+
+    An interval is flagged if the value of `variable` is not in
+    `valid_values`, is in `invalid_values`, is below `minimum` or above
+    `maximum`. Missing values of `variable` are never flagged.
+
+    Attributes
+    ----------
+    name : str
+        Name of the rule in the report.
+    variable : str
+        Variable whose values are checked, e.g. the turbine status.
+    valid_values : tuple, optional
+        Values of a valid interval.
+    invalid_values : tuple, optional
+        Values of an invalid interval.
+    minimum : float, optional
+        Smallest valid value.
+    maximum : float, optional
+        Largest valid value.
+
+    """
+
+    name: str
+    variable: str
+    valid_values: Optional[tuple] = None
+    invalid_values: Optional[tuple] = None
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+
+    def flag(self, data: xr.Dataset) -> xr.DataArray:
+        """Get whether each interval is invalid according to the rule."""
+        values = data[self.variable]
+        flagged = xr.zeros_like(values, dtype=bool)
+        if self.valid_values is not None:
+            flagged |= ~values.isin(self.valid_values)
+        if self.invalid_values is not None:
+            flagged |= values.isin(self.invalid_values)
+        if self.minimum is not None:
+            flagged |= values < self.minimum
+        if self.maximum is not None:
+            flagged |= values > self.maximum
+        return flagged & values.notnull()
+
+
+# Default rules assuming that a regulation of 0 means no curtailment by the
+# grid operator and a status of 0 means normal operation.
+DEFAULT_RULES = (
+    Rule(name="curtailed", variable="regulation", valid_values=(0,)),
+    Rule(name="not operating", variable="status", valid_values=(0,)),
+)
+
+
+def filter_production_data(
+    production_data: xr.Dataset,
+    rules: Sequence[Rule] = DEFAULT_RULES,
+    action: str = "mask",
+    variables: Optional[Sequence[str]] = None,
+    dim: str = "time",
+) -> tuple[xr.Dataset, pd.DataFrame]:
+    """Remove or flag invalid intervals of the production data.
+
+    All rules are evaluated on whole arrays, hence the data of all turbines
+    are filtered in a single pass. The filtering should be applied to the
+    raw data before resampling (see `data.resample_to_hourly`). Rules whose
+    variable is not in the data are skipped.
+
+    Parameters
+    ----------
+    production_data : xarray.Dataset
+        Production data of one or multiple wind turbines.
+    rules : list[Rule], default DEFAULT_RULES
+        Rules flagging invalid intervals.
+    action : str, default "mask"
+        What to do with flagged intervals:
+
+        - `"mask"`: set `variables` to `NaN`, which are then ignored when
+          resampling.
+        - `"drop"`: drop time steps that are flagged for all turbines
+          (i.e. all indexes of other dimensions).
+        - `"flag"`: keep the data and add the boolean variable `flagged`.
+    variables : list[str], optional
+        Variables to mask. Defaults to all variables along `dim` that are not
+        checked by any rule.
+    dim : str, default "time"
+        Time dimension.
+
+    Returns
+    -------
+    tuple[xr.Dataset, pd.DataFrame]
+        The filtered data and a report with the number (`flagged`) and
+        fraction (`fraction`) of intervals flagged by each rule (and per
+        index of other dimensions, e.g. per turbine), as well as those
+        flagged only by the respective rule (`flagged_exclusively`).
+
+    """
+    if action not in ACTIONS:
+        raise ValueError(f"Unknown action {action!r}, must be one of {ACTIONS}")
+    applicable = [rule for rule in rules if rule.variable in production_data]
+    if not applicable:
+        raise ValueError(
+            "None of the variables checked by the rules is in the data: "
+            f"{[rule.variable for rule in rules]}"
+        )
+    flags = xr.concat(
+        [rule.flag(production_data) for rule in applicable],
+        dim=pd.Index([rule.name for rule in applicable], name="rule"),
+        coords="minimal",
+        compat="override",
+    )
+    flagged = flags.any("rule")
+    exclusively = flags & (flags.sum("rule") == 1)
+    statistics = xr.Dataset(
+        {
+            "flagged": flags.sum(dim),
+            "flagged_exclusively": exclusively.sum(dim),
+            "fraction": flags.mean(dim),
+        }
+    )
+    dim_order = ["rule", *(other for other in statistics.dims if other != "rule")]
+    report = statistics.to_dataframe(dim_order=dim_order)[
+        ["flagged", "flagged_exclusively", "fraction"]
+    ]
+
+    if action == "flag":
+        return production_data.assign(flagged=flagged), report
+    if action == "drop":
+        other_dims = [other for other in flagged.dims if other != dim]
+        keep = ~flagged.all(other_dims) if other_dims else ~flagged
+        return production_data.isel({dim: keep.values}), report
+
+    checked = {rule.variable for rule in applicable}
+    if variables is None:
+        variables = [
+            name
+            for name, values in production_data.data_vars.items()
+            if dim in values.dims and name not in checked
+        ]
+    masked = production_data.copy()
+    for name in variables:
+        masked[name] = production_data[name].where(~flagged)
+    return masked, report
@@ -1,10 +1,13 @@
+from collections.abc import Iterator, Sequence
 from datetime import datetime
-from typing import Dict, List, Set, Tuple, Union
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 import numpy as np
 import pandas as pd
 import xarray as xr
 
+from . import cleaning, grid
+
 Number = Union[int, float]
 
 
@@ -40,6 +43,39 @@ def get_closest_grid_point_to_wind_turbine(
     return {"longitude": longitude, "latitude": latitude}
 
 
+def get_closest_grid_point_indexes_to_wind_turbines(
+    production_data: xr.Dataset,
+    data: xr.Dataset,
+    dim: str = "turbine",
+) -> dict[str, xr.DataArray]:
+    """Get the indexes of the grid points in the data closest to many wind turbines.
+
+    Parameters
+    ----------
+    production_data : xarray.Dataset
+        Production data of one or multiple wind turbines, whose
+        coordinates `longitude` and `latitude` give the turbine locations.
+    data : xarray.Dataset
+        The weather data containing the grid points.
+    dim : str, default "turbine"
+        Name of the dimension along which the turbines are selected.
+
+    Returns
+    -------
+    dict[str, xarray.DataArray]
+        Integer indexes of the closest grid points along `dim`.
+        Can be passed to `data.isel` to select the data of all turbines
+        at once.
+
+    """
+    index = grid.GridIndex.from_dataset(data)
+    return index.indexers(
+        np.ravel(production_data.coords["longitude"].values),
+        np.ravel(production_data.coords["latitude"].values),
+        dim=dim,
+    )
+
+
 def _get_wind_turbine_coordinates(ds: xr.Dataset) -> tuple[Number, Number]:
     """Get the coordinates (longitude, latitude) of a wind turbine from the production data.
 
@@ -112,16 +148,15 @@ def _get_closest_grid_point(
 
 
 def _get_closest_coordinate(coordinates: np.ndarray, value: Number) -> Number:
-    exact_match = [coordinate for coordinate in coordinates if coordinate == value]
-    if exact_match:
-        [match] = exact_match
-        return match
-    return min(coordinates, key=lambda x: abs(x - value))
+    coordinates = np.asarray(coordinates)
+    return coordinates[np.argmin(np.abs(coordinates - value))]
 
 
 def resample_and_clear_production_data_to_hourly_timeseries(
     production_data: xr.Dataset,
     dates: list[datetime],
+    variable: str = "production",
+    rules: Optional[Sequence[cleaning.Rule]] = None,
 ) -> xr.DataArray:
     """Resample the production data to an hourly timeseries and clear negative values.
 
@@ -131,6 +166,11 @@ def resample_and_clear_production_data_to_hourly_timeseries(
         Production data from the `maelstrom-power-production` dataset.
     dates : List[datetime]
         Dates from the weather data to get all matching timestamps of the resample.
+    variable : str, default "production"
+        Variable to resample.
+    rules : list[cleaning.Rule], optional
+        Rules to mask invalid intervals (e.g. curtailment) before resampling
+        (see `cleaning.filter_production_data`).
 
     Returns
     -------
@@ -138,22 +178,111 @@ def resample_and_clear_production_data_to_hourly_timeseries(
         Production data resampled to an hourly time series.
         The data are averaged (mean) over the time windows.
         Negative values are set to 0.
+        Dimensions of size 1 other than `time` are dropped.
 
     """
-    resampled = _resample_production_data_to_hourly_timeseries(
-        production_data.to_dataframe()
+    if rules is not None:
+        production_data, _ = cleaning.filter_production_data(
+            production_data, rules=rules, variables=[variable]
+        )
+    resampled = resample_to_hourly(production_data, variables=[variable])[variable]
+    dates_intersection = _get_intersection_of_dates(
+        resampled["time"].values, np.asarray(dates, dtype="datetime64[ns]")
     )
-
-    dates_intersection = _get_intersection_of_dates(resampled, dates)
-    resampled_and_matching_dates = resampled.loc[dates_intersection]
-    resampled_and_matching_dates[resampled_and_matching_dates < 0.0] = 0.0
-
-    if resampled_and_matching_dates.size == 0:
+    if dates_intersection.size == 0:
         raise RuntimeError(
             "Resampled production data have no temporal intersection with given dates"
         )
+    resampled_and_matching_dates = resampled.sel(time=dates_intersection)
+    cleared = np.maximum(resampled_and_matching_dates, 0.0)
+    squeezed = [
+        dim for dim in cleared.dims if dim != "time" and cleared.sizes[dim] == 1
+    ]
+    return cleared.squeeze(squeezed, drop=True)
+
+
+def resample_to_hourly(
+    data: xr.Dataset,
+    variables: Optional[Sequence[str]] = None,
+    dim: str = "time",
+    chunk_size: int = 100_000,
+) -> xr.Dataset:
+    """Resample data to hourly means.
+
+    All variables are resampled at once with NumPy binning on the
+    `datetime64` values of `dim`, without converting the data to a
+    DataFrame. The data are read in chunks of whole hours along `dim`,
+    hence lazy (dask) data do not need to fit into memory at once.
+    Missing values are ignored, hours without data are `NaN`.
+
+    Parameters
+    ----------
+    data : xarray.Dataset
+        Data with a sorted time coordinate, e.g. the production data of one
+        or multiple wind turbines.
+    variables : list[str], optional
+        Variables to resample. Defaults to all data variables along `dim`.
+    dim : str, default "time"
+        Time dimension.
+    chunk_size : int, default 100000
+        Approximate number of time steps read at once.
+
+    Returns
+    -------
+    xr.Dataset
+        Hourly means of the variables with all other dimensions unchanged.
+
+    """
+    if variables is None:
+        variables = [
+            name for name, values in data.data_vars.items() if dim in values.dims
+        ]
+    hours = data[dim].values.astype("datetime64[h]")
+    if np.any(hours[1:] < hours[:-1]):
+        raise ValueError(f"Coordinate {dim!r} must be sorted")
+    resampled_hours = np.arange(hours[0], hours[-1] + 1) if hours.size else hours
+    resampled = {}
+    for name in variables:
+        values = data[name].transpose(dim, ...)
+        other_shape = values.shape[1:]
+        sums = np.zeros((resampled_hours.size, *other_shape))
+        counts = np.zeros((resampled_hours.size, *other_shape))
+        for part in _iterate_whole_hours(hours, size=chunk_size):
+            chunk = np.asarray(values.isel({dim: part}).values, dtype=float)
+            chunk_hours = hours[part]
+            starts = np.flatnonzero(
+                np.concatenate([[True], chunk_hours[1:] != chunk_hours[:-1]])
+            )
+            positions = (chunk_hours[starts] - resampled_hours[0]).astype(np.int64)
+            valid = ~np.isnan(chunk)
+            sums[positions] = np.add.reduceat(
+                np.where(valid, chunk, 0.0), starts, axis=0
+            )
+            counts[positions] = np.add.reduceat(valid, starts, axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = sums / counts
+        resampled[name] = (values.dims, means)
+    coords = {
+        name: coordinate
+        for name, coordinate in data.coords.items()
+        if dim not in coordinate.dims
+    }
+    return xr.Dataset(
+        resampled,
+        coords={**coords, dim: resampled_hours.astype("datetime64[ns]")},
+    )
+
 
-    return resampled_and_matching_dates.to_xarray()
+def _iterate_whole_hours(hours: np.ndarray, size: int) -> Iterator[slice]:
+    """Iterate over slices of about `size` time steps that end at full hours."""
+    start = 0
+    while start < hours.size:
+        stop = min(start + size, hours.size)
+        if stop < hours.size:
+            # Extend the slice to the end of the hour of its last time step.
+            stop = int(np.searchsorted(hours, hours[stop - 1], side="right"))
+        yield slice(start, stop)
+        start = stop
 
 
 def _resample_production_data_to_hourly_timeseries(
@@ -162,16 +291,34 @@ def _resample_production_data_to_hourly_timeseries(
     production_column_name: str = "production",
 ) -> pd.Series:
     """Resample the production data to an hourly timeseries."""
-    production_copy = production.copy()
-    production_copy.reset_index(inplace=True)
-    production_copy = production_copy.set_index(time_index_name)
-    return production_copy[production_column_name].resample("1h").mean()
+    if time_index_name in production.index.names:
+        times = production.index.get_level_values(time_index_name)
+    else:
+        times = production[time_index_name]
+    times = np.asarray(times, dtype="datetime64[ns]")
+    order = np.argsort(times, kind="stable")
+    data = xr.Dataset(
+        {
+            production_column_name: (
+                "time",
+                production[production_column_name].values[order],
+            )
+        },
+        coords={"time": times[order]},
+    )
+    resampled = resample_to_hourly(data)[production_column_name]
+    return pd.Series(
+        resampled.values,
+        index=pd.DatetimeIndex(
+            resampled["time"].values, name=time_index_name, freq="h"
+        ),
+        name=production_column_name,
+    )
 
 
-def _get_intersection_of_dates(
-    left: pd.DataFrame, right: list[datetime]
-) -> set[pd.Timestamp]:
-    return sorted(set(left.index) & set(right))
+def _get_intersection_of_dates(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Get the sorted dates contained in both arrays."""
+    return np.intersect1d(left, right)
 
 
 def get_power_rating(
@@ -3,6 +3,7 @@ from typing import Dict, Optional
 
 import numpy as np
 import xarray as xr
+from numpy.typing import DTypeLike
 
 from .pressure import calculate_pressure
 
@@ -26,7 +27,7 @@ def calculate_air_density(
     model_level: int,
     model_level_data: xr.Dataset,
     surface_data: xr.Dataset,
-    constants: xr.Dataset,
+    constants: Optional[xr.Dataset] = None,
 ) -> xr.DataArray:
     """Calculate the air density from the model data.
 
@@ -40,8 +41,9 @@ def calculate_air_density(
         Model level data from the `maelstrom-weather-model-level` dataset.
     surface_data : xarray.Dataset
         Surface from the `maelstrom-weather-surface-level` dataset.
-    constants : xarray.Dataset
+    constants : xarray.Dataset, optional
         Constants data from the `maelstrom-constants-a-b` dataset.
+        If `None`, the constants bundled with the plugin are used.
 
     Returns
     -------
@@ -66,6 +68,54 @@ def calculate_air_density(
     return air_density
 
 
+def calculate_density(
+    temperature: xr.DataArray,
+    pressure: xr.DataArray,
+    specific_humidity: xr.DataArray,
+    relative_humidity: Optional[xr.DataArray] = None,
+    dtype: Optional[DTypeLike] = None,
+) -> xr.DataArray:
+    """Calculate the air density for fields of any shape.
+
+    The computation is element-wise and branch-free, hence it runs over
+    whole (e.g. time, level, latitude, longitude) fields in a single pass
+    and stays lazy for dask-backed data.
+
+    Parameters
+    ----------
+    temperature : xarray.DataArray
+        Temperature (ºC).
+    pressure : xarray.DataArray
+        Pressure (mBar). Broadcast against the other fields.
+    specific_humidity : xarray.DataArray
+        Specific humidity.
+    relative_humidity : xarray.DataArray, optional
+        Relative humidity in % (from 0-100), used where the relative humidity
+        derived from `specific_humidity` is missing.
+    dtype : numpy.dtype, optional
+        Data type to compute in, e.g. `numpy.float32` to halve the memory
+        of large fields. Defaults to the data type of the inputs.
+
+    Returns
+    -------
+    xr.DataArray
+        Air density.
+
+    """
+    if dtype is not None:
+        temperature = temperature.astype(dtype)
+        pressure = pressure.astype(dtype)
+        specific_humidity = specific_humidity.astype(dtype)
+        if relative_humidity is not None:
+            relative_humidity = relative_humidity.astype(dtype)
+    return _calculate_density(
+        temperature=temperature,
+        pressure=pressure,
+        specific_humidity=specific_humidity,
+        relative_humidity=relative_humidity,
+    )
+
+
 def _calculate_density(
     temperature: xr.DataArray,
     pressure: xr.DataArray,
@@ -90,25 +140,33 @@ def _calculate_density(
     p = pressure
     q = specific_humidity
     rh = relative_humidity
-    rh_from_q = _rh(theta, p, q)
+    # The saturated vapor pressure is required twice, compute it only once.
+    p_d = _p_d(theta)
+    rh_from_q = _rh(theta, p, q, p_d=p_d)
 
     if rh is not None:
-        ind = rh_from_q.isnull()
-        rh_from_q[ind] = rh[ind] / 100
+        rh_from_q = rh_from_q.where(rh_from_q.notnull(), rh / 100)
 
     #  That's all, we can do..
-    return 100 * p / (_r_f(theta, p, rh_from_q) * (theta + 273.15))
+    return 100 * p / (_r_f(theta, p, rh_from_q, p_d=p_d) * (theta + 273.15))
 
 
-def _rh(theta: xr.DataArray, p: xr.DataArray, q: xr.DataArray) -> xr.DataArray:
+def _rh(
+    theta: xr.DataArray,
+    p: xr.DataArray,
+    q: xr.DataArray,
+    p_d: Optional[xr.DataArray] = None,
+) -> xr.DataArray:
     """Calculate relative humidity from specific humidity.
 
     :param pandas.Series q: specific humidity
     :param pandas.Series p: pressure (mBar)
     :param pandas.Series theta: temperature ºC
+    :param pandas.Series p_d: (optional) saturated vapor pressure of `theta`
     :returns: relative humidity (float btw 0 and 1)
     """
-    p_d = _p_d(theta)
+    if p_d is None:
+        p_d = _p_d(theta)
     f1 = 1 - mol_quot
     return q * (p - f1 * p_d) / ((1 - f1) * p_d)
 
@@ -117,21 +175,23 @@ def _p_d(theta: xr.DataArray) -> xr.DataArray:
     """Saturated vapor pressure of water in air using Magnus' formula.
 
     Automated change of coefficients according to temperature.
+    The coefficients are selected element-wise without masked assignments.
 
     :param pandas.Series theta: temperature (ºC)
 
     :returns: `pandas.Series`, approximated saturation vapor pressure
     """
-    ind1 = theta >= 0
-    ind2 = theta < 0
-    p_d = xr.DataArray(
-        data=[0.0 for _ in range(theta.size)],
-        coords=theta.coords,
-        dims=theta.dims,
-        name="saturated vapor pressure",
+    positive = theta >= 0
+    # Python floats would promote the coefficients and hence the whole
+    # formula to float64, so they are converted to the data type of `theta`.
+    dtype = np.result_type(theta.dtype, np.float32).type
+    coefficients = (
+        xr.where(positive, dtype(c1), dtype(c2))
+        for c1, c2 in zip(magnus_const1, magnus_const2)
     )
-    p_d[ind1] = _magnus(theta[ind1], *magnus_const1)
-    p_d[ind2] = _magnus(theta[ind2], *magnus_const2)
+    p_d = _magnus(theta, *coefficients)
+    if isinstance(p_d, xr.DataArray):
+        p_d = p_d.rename("saturated vapor pressure")
     return p_d
 
 
@@ -148,13 +208,21 @@ def _magnus(
     return c0 * np.exp(c1 * theta / (c2 + theta))
 
 
-def _r_f(theta: xr.DataArray, p: xr.DataArray, rh: xr.DataArray) -> xr.DataArray:
+def _r_f(
+    theta: xr.DataArray,
+    p: xr.DataArray,
+    rh: xr.DataArray,
+    p_d: Optional[xr.DataArray] = None,
+) -> xr.DataArray:
     """Calculate modified gas constant to accomodate for the water content of the air.
 
     :param float theta: temperature in ºC
     :param float p: pressure in mBar
     :param float rh: relative humidity (0<= rh <= 1)
+    :param float p_d: (optional) saturated vapor pressure of `theta`
 
     :returns float: tweaked gas constant
     """
-    return r_l / (1 - rh * (_p_d(theta) / p) * (1 - r_l / r_d))
+    if p_d is None:
+        p_d = _p_d(theta)
+    return r_l / (1 - rh * (p_d / p) * (1 - r_l / r_d))
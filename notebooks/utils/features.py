@@ -0,0 +1,151 @@
+"""Build feature matrices for model training from aligned data arrays."""
+import dataclasses
+from collections.abc import Sequence
+from typing import Optional
+
+import numpy as np
+import xarray as xr
+
+
+@dataclasses.dataclass(frozen=True)
+class FeatureMatrix:
+    """Features and target aligned on common time stamps.
+
+    Attributes
+    ----------
+    x : np.ndarray
+        C-contiguous feature matrix with one row per sample and one column
+        per feature.
+    y : np.ndarray, optional
+        Target value of each sample.
+    times : np.ndarray
+        Time stamp of each sample.
+    sites : np.ndarray, optional
+        Site of each sample if the data of multiple sites are stacked.
+
+    """
+
+    x: np.ndarray
+    y: Optional[np.ndarray]
+    times: np.ndarray
+    sites: Optional[np.ndarray] = None
+
+
+def build_feature_matrix(
+    features: Sequence[xr.DataArray],
+    target: Optional[xr.DataArray] = None,
+    time_coordinate_name: str = "time",
+    site_dim: Optional[str] = None,
+    dtype: np.dtype = np.float32,
+) -> FeatureMatrix:
+    """Build a feature matrix from data arrays on their common time stamps.
+
+    The time stamps common to all features (and the target) are found with
+    a sorted-index join. The values of each feature are then written
+    directly into one preallocated matrix.
+
+    Parameters
+    ----------
+    features : list[xarray.DataArray]
+        Features along the time coordinate and optionally `site_dim`.
+        Features without `site_dim` (e.g. the time of day) are repeated for
+        each site.
+    target : xarray.DataArray, optional
+        Target values, e.g. the power production.
+    time_coordinate_name : str, default "time"
+        Name of the time coordinate.
+    site_dim : str, optional
+        Dimension of the sites (e.g. `turbine`) if the data of multiple
+        sites are stacked. The samples are ordered by site and then time.
+    dtype : numpy.dtype, default numpy.float32
+        Data type of the feature matrix and target.
+
+    Returns
+    -------
+    FeatureMatrix
+
+    """
+    arrays = [*features, *([target] if target is not None else [])]
+    if not arrays:
+        raise ValueError("At least one feature is required")
+    times = _get_common_times(arrays, time_coordinate_name=time_coordinate_name)
+    sites = _get_sites(arrays, site_dim=site_dim)
+    number_of_sites = 1 if sites is None else sites.size
+    rows = number_of_sites * times.size
+
+    x = np.empty((rows, len(features)), dtype=dtype, order="C")
+    for column, feature in enumerate(features):
+        x[:, column] = _get_column(
+            feature,
+            times=times,
+            time_coordinate_name=time_coordinate_name,
+            site_dim=site_dim,
+            number_of_sites=number_of_sites,
+        )
+    y = None
+    if target is not None:
+        y = np.empty(rows, dtype=dtype)
+        y[:] = _get_column(
+            target,
+            times=times,
+            time_coordinate_name=time_coordinate_name,
+            site_dim=site_dim,
+            number_of_sites=number_of_sites,
+        )
+    return FeatureMatrix(
+        x=x,
+        y=y,
+        times=np.tile(times, number_of_sites),
+        sites=None if sites is None else np.repeat(sites, times.size),
+    )
+
+
+def _get_common_times(
+    arrays: Sequence[xr.DataArray], time_coordinate_name: str
+) -> np.ndarray:
+    # The time coordinates may repeat time stamps, hence they are not
+    # assumed to be unique.
+    common = np.unique(arrays[0][time_coordinate_name].values)
+    for array in arrays[1:]:
+        common = np.intersect1d(common, array[time_coordinate_name].values)
+    return common
+
+
+def _get_sites(
+    arrays: Sequence[xr.DataArray], site_dim: Optional[str]
+) -> Optional[np.ndarray]:
+    if site_dim is None:
+        return None
+    with_sites = [array for array in arrays if site_dim in array.dims]
+    if not with_sites:
+        raise ValueError(f"None of the data has the site dimension {site_dim!r}")
+    sites = with_sites[0][site_dim].values
+    for array in with_sites[1:]:
+        if not np.array_equal(array[site_dim].values, sites):
+            raise ValueError(f"All data must have the same {site_dim!r} coordinate")
+    return sites
+
+
+def _get_column(
+    array: xr.DataArray,
+    times: np.ndarray,
+    time_coordinate_name: str,
+    site_dim: Optional[str],
+    number_of_sites: int,
+) -> np.ndarray:
+    array_times = array[time_coordinate_name].values
+    order = np.argsort(array_times, kind="stable")
+    positions = order[np.searchsorted(array_times, times, sorter=order)]
+    dims = [time_coordinate_name]
+    if site_dim is not None and site_dim in array.dims:
+        dims.insert(0, site_dim)
+    extra = set(array.dims) - set(dims)
+    if extra:
+        raise ValueError(
+            f"Data {array.name!r} has unexpected dimensions {sorted(map(str, extra))}"
+        )
+    values = array.transpose(*dims).values
+    selected = np.take(values, positions, axis=-1)
+    if selected.ndim == 1:
+        selected = np.broadcast_to(selected, (number_of_sites, times.size))
+    return selected.reshape(-1)
@@ -0,0 +1,149 @@
+"""Nearest grid point lookup for many sites at once."""
+import numpy as np
+import xarray as xr
+
+
+class GridIndex:
+    """Index of a grid to find the grid points closest to given coordinates.
+
+    The index is built once per grid and answers queries for any number
+    of sites in a single vectorized call.
+
+    For regular grids (1-dimensional longitude and latitude axes), the
+    closest value on each axis is found by a binary search on the sorted
+    axis. For curvilinear grids (2-dimensional longitude and latitude),
+    a KD-tree of the grid points on the unit sphere is used.
+
+    Parameters
+    ----------
+    longitude : xarray.DataArray
+        Longitudes of the grid.
+    latitude : xarray.DataArray
+        Latitudes of the grid. Must have the same dimensions as `longitude`
+        if the grid is curvilinear.
+
+    """
+
+    def __init__(self, longitude: xr.DataArray, latitude: xr.DataArray):
+        self.longitude = longitude
+        self.latitude = latitude
+        self.regular = longitude.ndim == 1 and latitude.ndim == 1
+        if self.regular:
+            self._axes = [_SortedAxis(longitude.values), _SortedAxis(latitude.values)]
+        else:
+            if longitude.dims != latitude.dims:
+                raise ValueError(
+                    "Longitude and latitude of a curvilinear grid must have the same "
+                    f"dimensions, got {longitude.dims} and {latitude.dims}"
+                )
+            from scipy.spatial import cKDTree
+
+            points = _to_unit_sphere(longitude.values.ravel(), latitude.values.ravel())
+            self._tree = cKDTree(points)
+
+    @classmethod
+    def from_dataset(
+        cls,
+        data: xr.Dataset,
+        longitude: str = "longitude",
+        latitude: str = "latitude",
+    ) -> "GridIndex":
+        """Build the index from the coordinates of a dataset."""
+        return cls(data.coords[longitude], data.coords[latitude])
+
+    def query(
+        self, longitudes: np.ndarray, latitudes: np.ndarray
+    ) -> dict[str, np.ndarray]:
+        """Get the indexes of the grid points closest to the given coordinates.
+
+        Parameters
+        ----------
+        longitudes : np.ndarray
+            Longitudes of the sites.
+        latitudes : np.ndarray
+            Latitudes of the sites.
+
+        Returns
+        -------
+        dict[str, np.ndarray]
+            Integer index of each site along each dimension of the grid,
+            e.g. `{"longitude": ..., "latitude": ...}`. Can be passed to
+            `isel` (see `indexers`).
+
+        """
+        longitudes = np.atleast_1d(np.asarray(longitudes, dtype=float))
+        latitudes = np.atleast_1d(np.asarray(latitudes, dtype=float))
+        if self.regular:
+            longitude_axis, latitude_axis = self._axes
+            return {
+                self.longitude.dims[0]: longitude_axis.closest(longitudes),
+                self.latitude.dims[0]: latitude_axis.closest(latitudes),
+            }
+        _, flat_indexes = self._tree.query(_to_unit_sphere(longitudes, latitudes))
+        indexes = np.unravel_index(flat_indexes, self.longitude.shape)
+        return dict(zip(self.longitude.dims, indexes))
+
+    def indexers(
+        self, longitudes: np.ndarray, latitudes: np.ndarray, dim: str = "site"
+    ) -> dict[str, xr.DataArray]:
+        """Get pointwise indexers of the closest grid points for `isel`.
+
+        Selecting with these indexers returns the data of each site along
+        the new dimension `dim`.
+
+        """
+        return {
+            name: xr.DataArray(indexes, dims=dim)
+            for name, indexes in self.query(longitudes, latitudes).items()
+        }
+
+
+class _SortedAxis:
+    """A grid axis sorted once for binary search."""
+
+    def __init__(self, values: np.ndarray):
+        values = np.asarray(values, dtype=float)
+        self.order = np.argsort(values, kind="stable")
+        self.sorted = values[self.order]
+
+    def closest(self, values: np.ndarray) -> np.ndarray:
+        """Get the index (in the original order) of the closest value for each value."""
+        right = np.clip(np.searchsorted(self.sorted, values), 1, self.sorted.size - 1)
+        left = right - 1
+        if self.sorted.size == 1:
+            right = left = np.zeros_like(right)
+        take_left = np.abs(values - self.sorted[left]) <= np.abs(
+            self.sorted[right] - values
+        )
+        return self.order[np.where(take_left, left, right)]
+
+    def bracket(self, values: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the indexes of the axis values enclosing each value.
+
+        Returns the indexes (in the original order) of the lower and upper
+        enclosing value and the fraction of the distance between them.
+        Values outside of the axis are clamped to its first or last value.
+
+        """
+        if self.sorted.size == 1:
+            zeros = np.zeros(values.shape, dtype=int)
+            return self.order[zeros], self.order[zeros], np.zeros(values.shape)
+        upper = np.clip(np.searchsorted(self.sorted, values), 1, self.sorted.size - 1)
+        lower = upper - 1
+        fraction = (values - self.sorted[lower]) / (
+            self.sorted[upper] - self.sorted[lower]
+        )
+        return self.order[lower], self.order[upper], np.clip(fraction, 0.0, 1.0)
+
+
+def _to_unit_sphere(longitudes: np.ndarray, latitudes: np.ndarray) -> np.ndarray:
+    longitudes = np.deg2rad(longitudes)
+    latitudes = np.deg2rad(latitudes)
+    return np.stack(
+        [
+            np.cos(latitudes) * np.cos(longitudes),
+            np.cos(latitudes) * np.sin(longitudes),
+            np.sin(latitudes),
+        ],
+        axis=-1,
+    )
@@ -0,0 +1,180 @@
+"""Heights of the model levels and vertical interpolation to fixed heights."""
+from collections.abc import Sequence
+from typing import Optional
+
+import numpy as np
+import xarray as xr
+
+r_d = 287.05  # Gas constant of dry air [J/kg/K]
+g = 9.80665  # Gravitational acceleration [m/s^2]
+virtual_temperature_factor = 0.609133  # R_water / R_dry - 1
+
+
+def calculate_level_heights(
+    temperature: xr.DataArray,
+    specific_humidity: xr.DataArray,
+    surface_pressure: xr.DataArray,
+    constants: Optional[xr.Dataset] = None,
+) -> xr.DataArray:
+    """Calculate the height of the model levels above the surface.
+
+    The heights are derived with the hypsometric equation from the
+    pressure of the half levels and the virtual temperature, integrating
+    from the surface upwards. Hence, the data must contain all model levels
+    from the lowest (137) up to the highest level of interest.
+
+    Parameters
+    ----------
+    temperature : xarray.DataArray
+        Temperature (K) on the model levels (dimension `level`).
+    specific_humidity : xarray.DataArray
+        Specific humidity on the model levels.
+    surface_pressure : xarray.DataArray
+        Surface pressure (Pa).
+    constants : xarray.Dataset, optional
+        Constants from the `maelstrom-constants-a-b` dataset.
+        If `None`, the constants bundled with the plugin are used.
+
+    Returns
+    -------
+    xr.DataArray
+        Height (m) of each model level above the surface.
+
+    """
+    A, B = _get_half_level_coefficients(constants)
+    levels = temperature["level"].values
+    _check_levels(levels, number_of_levels=A.size - 1)
+
+    def half_level_pressure(offset: int) -> xr.DataArray:
+        index = {"half_level": xr.DataArray(levels + offset, dims="level")}
+        return A.isel(index) + B.isel(index) * surface_pressure
+
+    # Level k lies between the half levels k - 1 (above) and k (below).
+    pressure_above = half_level_pressure(-1)
+    pressure_below = half_level_pressure(0)
+    pressure_full = 0.5 * (pressure_above + pressure_below)
+    scale_height = (
+        r_d * temperature * (1 + virtual_temperature_factor * specific_humidity) / g
+    )
+    # The pressure of half level 0 (top of the atmosphere) is 0, hence the
+    # thickness of level 1 is infinite. As in IFS, log(2) is used instead,
+    # which equals the log pressure ratio to its full level.
+    with np.errstate(divide="ignore"):
+        log_pressure_ratio = np.log(pressure_below / pressure_above)
+    log_pressure_ratio = log_pressure_ratio.where(temperature["level"] != 1, np.log(2))
+    thickness = scale_height * log_pressure_ratio
+    height_below = _cumulative_sum_from_surface(thickness) - thickness
+    height = height_below + scale_height * np.log(pressure_below / pressure_full)
+    return height.transpose(*temperature.dims).rename("height")
+
+
+def interpolate_to_heights(
+    data: xr.Dataset,
+    level_heights: xr.DataArray,
+    heights: Sequence[float],
+    variables: Sequence[str] = ("u", "v"),
+) -> xr.Dataset:
+    """Interpolate variables from the model levels to fixed heights.
+
+    The enclosing model levels of each height are searched once per grid
+    point and time step and are reused for all variables. The values are
+    interpolated linearly in height. Heights below the lowest or above the
+    highest model level get the value of that level.
+
+    Parameters
+    ----------
+    data : xarray.Dataset
+        Model level data from the `maelstrom-weather-model-level` dataset.
+    level_heights : xarray.DataArray
+        Height of each model level (see `calculate_level_heights`).
+    heights : list[float]
+        Heights (m) to interpolate to, e.g. hub heights `[80, 100, 120]`.
+    variables : list[str], default ("u", "v")
+        Variables to interpolate.
+
+    Returns
+    -------
+    xr.Dataset
+        The variables with the dimension `height` instead of `level`.
+
+    """
+    stacked = data[list(variables)].to_array("variable")
+    heights = np.asarray(heights, dtype=float)
+    interpolated = xr.apply_ufunc(
+        _interpolate,
+        level_heights,
+        stacked,
+        kwargs={"heights": heights},
+        input_core_dims=[["level"], ["level"]],
+        output_core_dims=[["height"]],
+        dask="parallelized",
+        dask_gufunc_kwargs={"output_sizes": {"height": heights.size}},
+        output_dtypes=[stacked.dtype],
+    )
+    return interpolated.assign_coords(height=heights).to_dataset("variable")
+
+
+def _get_half_level_coefficients(
+    constants: Optional[xr.Dataset],
+) -> tuple[xr.DataArray, xr.DataArray]:
+    if constants is None:
+        from climetlab_maelstrom_power_production.constants import l137
+
+        A, B = l137.get_table()
+    else:
+        half_levels = constants.loc[{"dim0": 0}]
+        A, B = half_levels["hyam"].values, half_levels["hybm"].values
+    return xr.DataArray(A, dims="half_level"), xr.DataArray(B, dims="half_level")
+
+
+def _check_levels(levels: np.ndarray, number_of_levels: int) -> None:
+    if levels.size == 0 or np.any(levels < 1):
+        raise ValueError(f"Invalid model levels {levels}")
+    expected = np.arange(levels.min(), number_of_levels + 1)
+    if not np.array_equal(np.sort(levels), expected):
+        raise ValueError(
+            "Calculating the level heights requires all model levels from the "
+            f"highest level of interest to the lowest level {number_of_levels}, "
+            f"got {levels}"
+        )
+
+
+def _cumulative_sum_from_surface(thickness: xr.DataArray) -> xr.DataArray:
+    # Higher level numbers are closer to the surface.
+    descending = thickness.sortby("level", ascending=False)
+    return descending.cumsum("level").sortby("level")
+
+
+def _interpolate(
+    level_heights: np.ndarray, values: np.ndarray, heights: np.ndarray
+) -> np.ndarray:
+    # The level heights lack the axis of the variables (size 1), hence the
+    # enclosing levels are searched once and only the values are gathered
+    # per variable.
+    ndim = max(level_heights.ndim, values.ndim)
+    level_heights = level_heights.reshape(
+        (1,) * (ndim - level_heights.ndim) + level_heights.shape
+    )
+    values = values.reshape((1,) * (ndim - values.ndim) + values.shape)
+    order = np.argsort(level_heights, axis=-1)
+    level_heights = np.take_along_axis(level_heights, order, axis=-1)
+
+    size = level_heights.shape[-1]
+    upper = (level_heights[..., np.newaxis, :] <= heights[:, np.newaxis]).sum(axis=-1)
+    upper = np.clip(upper, 1, max(size - 1, 1))
+    lower = upper - 1
+    if size == 1:
+        upper = lower
+
+    height_lower = np.take_along_axis(level_heights, lower, axis=-1)
+    height_upper = np.take_along_axis(level_heights, upper, axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weight = (heights - height_lower) / (height_upper - height_lower)
+    weight = np.clip(np.nan_to_num(weight, nan=0.0), 0.0, 1.0)
+
+    # Indexes of the enclosing levels in the unsorted level axis.
+    lower = np.take_along_axis(order, lower, axis=-1)
+    upper = np.take_along_axis(order, upper, axis=-1)
+    value_lower = np.take_along_axis(values, lower, axis=-1)
+    value_upper = np.take_along_axis(values, upper, axis=-1)
+    return value_lower + weight * (value_upper - value_lower)
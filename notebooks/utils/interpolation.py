@@ -0,0 +1,254 @@
+"""Interpolation of gridded weather data to arbitrary locations."""
+import functools
+from typing import Union
+
+import numpy as np
+import xarray as xr
+
+from . import grid
+
+Data = Union[xr.Dataset, xr.DataArray]
+
+METHODS = ("bilinear", "idw")
+
+
+class PointInterpolator:
+    """Interpolate gridded data to a set of sites.
+
+    The interpolation weights are computed once when creating the
+    interpolator. Applying it to data is a single pointwise gather of the
+    neighbouring grid points of all sites followed by a weighted sum, which
+    stays lazy for dask-backed data and applies to all other dimensions
+    (e.g. time and level) at once.
+
+    Parameters
+    ----------
+    longitude : xarray.DataArray
+        Longitudes of the grid.
+    latitude : xarray.DataArray
+        Latitudes of the grid.
+    longitudes : np.ndarray
+        Longitudes of the sites.
+    latitudes : np.ndarray
+        Latitudes of the sites.
+    method : str, default "bilinear"
+        Interpolation method:
+
+        - `"bilinear"`: bilinear interpolation between the 4 enclosing grid
+          points. Requires a regular grid. Sites outside of the grid get the
+          values of the closest grid edge.
+        - `"idw"`: inverse distance weighting of the `neighbours` closest
+          grid points (great-circle distance).
+    neighbours : int, default 4
+        Number of grid points used for inverse distance weighting.
+    power : float, default 2
+        Power of the distance for inverse distance weighting.
+    dim : str, default "site"
+        Name of the dimension of the sites in the interpolated data.
+
+    """
+
+    def __init__(
+        self,
+        longitude: xr.DataArray,
+        latitude: xr.DataArray,
+        longitudes: np.ndarray,
+        latitudes: np.ndarray,
+        method: str = "bilinear",
+        neighbours: int = 4,
+        power: float = 2.0,
+        dim: str = "site",
+    ):
+        longitudes = np.atleast_1d(np.asarray(longitudes, dtype=float))
+        latitudes = np.atleast_1d(np.asarray(latitudes, dtype=float))
+        if method == "bilinear":
+            indexes, weights = _get_bilinear_weights(
+                longitude, latitude, longitudes=longitudes, latitudes=latitudes
+            )
+        elif method == "idw":
+            indexes, weights = _get_idw_weights(
+                longitude,
+                latitude,
+                longitudes=longitudes,
+                latitudes=latitudes,
+                neighbours=neighbours,
+                power=power,
+            )
+        else:
+            raise ValueError(f"Unknown method {method!r}, must be one of {METHODS}")
+        self.longitude_name = str(longitude.name)
+        self.latitude_name = str(latitude.name)
+        self.longitudes = longitudes
+        self.latitudes = latitudes
+        self.method = method
+        self.dim = dim
+        self.indexes = indexes
+        self.weights = weights
+
+    @classmethod
+    def from_dataset(
+        cls,
+        data: Data,
+        longitudes: np.ndarray,
+        latitudes: np.ndarray,
+        longitude: str = "longitude",
+        latitude: str = "latitude",
+        **kwargs,
+    ) -> "PointInterpolator":
+        """Create the interpolator for the grid of a dataset."""
+        return cls(
+            data.coords[longitude],
+            data.coords[latitude],
+            longitudes=longitudes,
+            latitudes=latitudes,
+            **kwargs,
+        )
+
+    def __call__(self, data: Data) -> Data:
+        """Interpolate the data to the sites.
+
+        The grid dimensions of the data are replaced by the dimension `dim`
+        with the coordinates of the sites.
+
+        """
+        neighbour = f"{self.dim}_neighbour"
+        dims = (self.dim, neighbour)
+        gathered = data.isel(
+            {
+                name: xr.DataArray(indexes, dims=dims)
+                for name, indexes in self.indexes.items()
+            }
+        )
+        gathered = gathered.drop_vars(
+            [
+                name
+                for name in (self.longitude_name, self.latitude_name)
+                if name in gathered.coords
+            ]
+        )
+        weights = xr.DataArray(self.weights, dims=dims)
+        interpolated = (gathered * weights).sum(neighbour, skipna=False)
+        return interpolated.assign_coords(
+            {
+                self.longitude_name: (self.dim, self.longitudes),
+                self.latitude_name: (self.dim, self.latitudes),
+            }
+        )
+
+
+def interpolate_to_sites(
+    data: Data,
+    longitudes: np.ndarray,
+    latitudes: np.ndarray,
+    method: str = "bilinear",
+    dim: str = "site",
+) -> Data:
+    """Interpolate gridded data to the given sites.
+
+    The interpolation weights are cached per grid and set of sites,
+    hence repeated calls, e.g. for different variables or time ranges,
+    only compute them once.
+
+    See `PointInterpolator` for the parameters.
+
+    """
+    interpolator = _get_cached_interpolator(
+        _to_key(data.coords["longitude"]),
+        _to_key(data.coords["latitude"]),
+        longitudes=tuple(np.ravel(longitudes).astype(float)),
+        latitudes=tuple(np.ravel(latitudes).astype(float)),
+        method=method,
+        dim=dim,
+    )
+    return interpolator(data)
+
+
+@functools.lru_cache(maxsize=32)
+def _get_cached_interpolator(
+    longitude: tuple,
+    latitude: tuple,
+    longitudes: tuple,
+    latitudes: tuple,
+    method: str,
+    dim: str,
+) -> PointInterpolator:
+    return PointInterpolator(
+        _from_key(longitude),
+        _from_key(latitude),
+        longitudes=np.array(longitudes),
+        latitudes=np.array(latitudes),
+        method=method,
+        dim=dim,
+    )
+
+
+def _to_key(coordinate: xr.DataArray) -> tuple:
+    return (
+        coordinate.name,
+        coordinate.dims,
+        coordinate.shape,
+        tuple(coordinate.values.astype(float).ravel()),
+    )
+
+
+def _from_key(key: tuple) -> xr.DataArray:
+    name, dims, shape, values = key
+    return xr.DataArray(np.reshape(values, shape), dims=dims, name=name)
+
+
+def _get_bilinear_weights(
+    longitude: xr.DataArray,
+    latitude: xr.DataArray,
+    longitudes: np.ndarray,
+    latitudes: np.ndarray,
+) -> tuple[dict[str, np.ndarray], np.ndarray]:
+    if longitude.ndim != 1 or latitude.ndim != 1:
+        raise ValueError("Bilinear interpolation requires a regular grid")
+    x0, x1, fx = grid._SortedAxis(longitude.values).bracket(longitudes)
+    y0, y1, fy = grid._SortedAxis(latitude.values).bracket(latitudes)
+    indexes = {
+        longitude.dims[0]: np.stack([x0, x1, x0, x1], axis=-1),
+        latitude.dims[0]: np.stack([y0, y0, y1, y1], axis=-1),
+    }
+    weights = np.stack(
+        [(1 - fx) * (1 - fy), fx * (1 - fy), (1 - fx) * fy, fx * fy], axis=-1
+    )
+    return indexes, weights
+
+
+def _get_idw_weights(
+    longitude: xr.DataArray,
+    latitude: xr.DataArray,
+    longitudes: np.ndarray,
+    latitudes: np.ndarray,
+    neighbours: int,
+    power: float,
+) -> tuple[dict[str, np.ndarray], np.ndarray]:
+    from scipy.spatial import cKDTree
+
+    if longitude.ndim == 1 and latitude.ndim == 1:
+        longitude, latitude = xr.broadcast(latitude, longitude)[::-1]
+    elif longitude.dims != latitude.dims:
+        raise ValueError(
+            "Longitude and latitude of a curvilinear grid must have the same "
+            f"dimensions, got {longitude.dims} and {latitude.dims}"
+        )
+    neighbours = min(neighbours, longitude.size)
+    tree = cKDTree(
+        grid._to_unit_sphere(longitude.values.ravel(), latitude.values.ravel())
+    )
+    distances, flat_indexes = tree.query(
+        grid._to_unit_sphere(longitudes, latitudes), k=neighbours
+    )
+    distances = np.reshape(distances, (longitudes.size, neighbours))
+    flat_indexes = np.reshape(flat_indexes, (longitudes.size, neighbours))
+
+    exact = distances == 0.0
+    with np.errstate(divide="ignore"):
+        weights = np.where(exact, 0.0, 1.0 / distances**power)
+    # Sites on a grid point get its value.
+    weights[exact.any(axis=-1)] = exact[exact.any(axis=-1)]
+    weights /= weights.sum(axis=-1, keepdims=True)
+
+    indexes = np.unravel_index(flat_indexes, longitude.shape)
+    return dict(zip(map(str, longitude.dims), indexes)), weights
@@ -1,7 +1,9 @@
-import functools
 import numbers
+from collections.abc import Mapping, Sequence
+from typing import Optional
 
 import numpy as np
+import pandas as pd
 import sklearn.metrics
 
 
@@ -112,5 +114,312 @@ def _restrict_datapoints(y_true, y_pred, assym):
         mask = y_pred < y_true  # Values will be masked where mask is true
     else:
         mask = y_pred > y_true  # So we have to take the logical opposite.
-    mask = functools.partial(np.ma.masked_array, mask=mask)
-    return map(np.ma.compressed, map(mask, [y_true, y_pred]))
+    keep = ~np.ravel(mask)
+    return np.ravel(y_true)[keep], np.ravel(y_pred)[keep]
+
+
+class ErrorAccumulator:
+    """Mergeable accumulator of error statistics.
+
+    The accumulator is updated chunk by chunk, hence the predictions do not
+    need to fit into memory at once. Accumulators of different chunks or
+    processes can be combined with `merge` (or `+`).
+
+    Parameters
+    ----------
+    assym : int, default 0
+        If positive, only take those datapoints into account where y_pred >= y_true.
+        If negative, only take those datapoints into account where y_pred <= y_true.
+        If zero, take all datapoints into account.
+        assym does NOT influence the normalization statistics.
+
+    """
+
+    def __init__(self, assym: int = 0):
+        self.assym = assym
+        self._statistics = _Statistics()
+
+    def update(
+        self,
+        y_true: np.ndarray,
+        y_pred: np.ndarray,
+        sample_weight: Optional[np.ndarray] = None,
+    ) -> "ErrorAccumulator":
+        """Add a chunk of true and predicted values."""
+        y_true = np.ravel(y_true)
+        self._statistics.update(
+            y_true,
+            np.ravel(y_pred),
+            codes=np.zeros(y_true.size, dtype=np.int64),
+            keys=np.zeros(1, dtype=np.int64),
+            sample_weight=sample_weight,
+            assym=self.assym,
+        )
+        return self
+
+    def merge(self, other: "ErrorAccumulator") -> "ErrorAccumulator":
+        """Combine with another accumulator into a new one."""
+        _check_assym(self.assym, other.assym)
+        merged = ErrorAccumulator(assym=self.assym)
+        merged._statistics = self._statistics.merge(other._statistics)
+        return merged
+
+    __add__ = merge
+
+    @property
+    def count(self) -> float:
+        """(Weighted) number of datapoints taken into account for the errors."""
+        return self._get("count")
+
+    @property
+    def mae(self) -> float:
+        """Mean absolute error."""
+        return self._get("mae")
+
+    @property
+    def rmse(self) -> float:
+        """Root mean squared error."""
+        return self._get("rmse")
+
+    @property
+    def bias(self) -> float:
+        """Mean error (y_pred - y_true)."""
+        return self._get("bias")
+
+    def normalized_mae(self, normalization=1.0) -> float:
+        """Normalized mean absolute error.
+
+        See `normalized_mean_absolute_error` for the normalization.
+
+        """
+        return self.mae / self._get_normalization(normalization)
+
+    def normalized_rmse(self, normalization=1.0) -> float:
+        """Normalized root mean squared error.
+
+        See `normalized_root_mean_squared_error` for the normalization.
+
+        """
+        return self.rmse / self._get_normalization(normalization)
+
+    def _get(self, name: str) -> float:
+        values = self._statistics.to_dict()[name]
+        return float(values[0]) if values.size else np.nan
+
+    def _get_normalization(self, normalization) -> float:
+        if isinstance(normalization, numbers.Number):
+            return float(normalization)
+        return self._get(_get_normalization_name(normalization))
+
+
+class GroupedErrorAccumulator:
+    """Mergeable accumulator of error statistics per group.
+
+    The statistics are accumulated for multiple groupings at once, e.g. per
+    turbine, hour of day and lead time, in a single pass over each chunk.
+
+    Parameters
+    ----------
+    by : list[str]
+        Names of the groupings.
+    assym : int, default 0
+        See `ErrorAccumulator`.
+
+    """
+
+    def __init__(self, by: Sequence[str], assym: int = 0):
+        self.by = tuple(by)
+        self.assym = assym
+        self._statistics = {name: _Statistics() for name in self.by}
+
+    def update(
+        self,
+        y_true: np.ndarray,
+        y_pred: np.ndarray,
+        groups: Mapping[str, np.ndarray],
+        sample_weight: Optional[np.ndarray] = None,
+    ) -> "GroupedErrorAccumulator":
+        """Add a chunk of true and predicted values.
+
+        Parameters
+        ----------
+        groups : dict[str, np.ndarray]
+            Group of each datapoint for each grouping in `by`.
+
+        """
+        y_true = np.ravel(y_true)
+        y_pred = np.ravel(y_pred)
+        for name in self.by:
+            keys, codes = np.unique(np.ravel(groups[name]), return_inverse=True)
+            self._statistics[name].update(
+                y_true,
+                y_pred,
+                codes=codes.reshape(-1),
+                keys=keys,
+                sample_weight=sample_weight,
+                assym=self.assym,
+            )
+        return self
+
+    def merge(self, other: "GroupedErrorAccumulator") -> "GroupedErrorAccumulator":
+        """Combine with another accumulator into a new one."""
+        _check_assym(self.assym, other.assym)
+        if self.by != other.by:
+            raise ValueError(f"Cannot merge groupings {self.by} and {other.by}")
+        merged = GroupedErrorAccumulator(by=self.by, assym=self.assym)
+        merged._statistics = {
+            name: statistics.merge(other._statistics[name])
+            for name, statistics in self._statistics.items()
+        }
+        return merged
+
+    __add__ = merge
+
+    def to_dataframe(self, by: str) -> pd.DataFrame:
+        """Get the statistics of each group of a grouping."""
+        statistics = self._statistics[by]
+        return pd.DataFrame(
+            statistics.to_dict(), index=pd.Index(statistics.keys, name=by)
+        )
+
+
+# Weighted sums accumulated per group.
+_SUMS = (
+    "weight",
+    "error_weight",
+    "error",
+    "absolute_error",
+    "squared_error",
+    "true",
+    "squared_true",
+)
+
+
+class _Statistics:
+    """Sums and extrema of errors and true values per group key."""
+
+    def __init__(self):
+        self.keys = np.empty(0)
+        self.sums = np.zeros((len(_SUMS), 0))
+        self.minimum = np.empty(0)
+        self.maximum = np.empty(0)
+
+    def update(
+        self,
+        y_true: np.ndarray,
+        y_pred: np.ndarray,
+        codes: np.ndarray,
+        keys: np.ndarray,
+        sample_weight: Optional[np.ndarray],
+        assym: int,
+    ) -> None:
+        size = keys.size
+        weight = (
+            np.ones(y_true.size)
+            if sample_weight is None
+            else np.ravel(sample_weight).astype(float)
+        )
+        error = y_pred - y_true
+        error_weight = weight
+        if assym > 0:
+            error_weight = weight * (error >= 0)
+        elif assym < 0:
+            error_weight = weight * (error <= 0)
+        sums = np.stack(
+            [
+                np.bincount(codes, weights=values, minlength=size)
+                for values in (
+                    weight,
+                    error_weight,
+                    error_weight * error,
+                    error_weight * np.abs(error),
+                    error_weight * error**2,
+                    weight * y_true,
+                    weight * y_true**2,
+                )
+            ]
+        )
+        minimum = np.full(size, np.inf)
+        maximum = np.full(size, -np.inf)
+        np.minimum.at(minimum, codes, y_true)
+        np.maximum.at(maximum, codes, y_true)
+        chunk = _Statistics()
+        chunk.keys, chunk.sums, chunk.minimum, chunk.maximum = (
+            keys,
+            sums,
+            minimum,
+            maximum,
+        )
+        merged = self.merge(chunk)
+        self.keys, self.sums, self.minimum, self.maximum = (
+            merged.keys,
+            merged.sums,
+            merged.minimum,
+            merged.maximum,
+        )
+
+    def merge(self, other: "_Statistics") -> "_Statistics":
+        # Keep the data type of the keys, e.g. for lead times. The result is
+        # always a new object, since updating it must not change the operands.
+        if self.keys.size == 0:
+            return other.copy()
+        if other.keys.size == 0:
+            return self.copy()
+        merged = _Statistics()
+        merged.keys = np.union1d(self.keys, other.keys)
+        merged.sums = np.zeros((len(_SUMS), merged.keys.size))
+        merged.minimum = np.full(merged.keys.size, np.inf)
+        merged.maximum = np.full(merged.keys.size, -np.inf)
+        for statistics in (self, other):
+            positions = np.searchsorted(merged.keys, statistics.keys)
+            merged.sums[:, positions] += statistics.sums
+            merged.minimum[positions] = np.minimum(
+                merged.minimum[positions], statistics.minimum
+            )
+            merged.maximum[positions] = np.maximum(
+                merged.maximum[positions], statistics.maximum
+            )
+        return merged
+
+    def copy(self) -> "_Statistics":
+        copied = _Statistics()
+        copied.keys = self.keys.copy()
+        copied.sums = self.sums.copy()
+        copied.minimum = self.minimum.copy()
+        copied.maximum = self.maximum.copy()
+        return copied
+
+    def to_dict(self) -> dict[str, np.ndarray]:
+        sums = dict(zip(_SUMS, self.sums))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = sums["true"] / sums["weight"]
+            var = np.maximum(sums["squared_true"] / sums["weight"] - mean**2, 0.0)
+            return {
+                "count": sums["error_weight"],
+                "mae": sums["absolute_error"] / sums["error_weight"],
+                "rmse": np.sqrt(sums["squared_error"] / sums["error_weight"]),
+                "bias": sums["error"] / sums["error_weight"],
+                "mean": mean,
+                "std": np.sqrt(var),
+                "var": var,
+                "spread": self.maximum - self.minimum,
+            }
+
+
+def _get_normalization_name(normalization: str) -> str:
+    if isinstance(normalization, str) and normalization.lower() in (
+        "spread",
+        "mean",
+        "std",
+        "var",
+    ):
+        return normalization.lower()
+    raise ValueError(
+        "Normalization must either be a number or one of 'spread', 'mean', 'std', 'var'. "
+        f"Found {normalization} which is neither."
+    )
+
+
+def _check_assym(left: int, right: int) -> None:
+    if left != right:
+        raise ValueError(f"Cannot merge accumulators with assym {left} and {right}")
@@ -1,10 +1,102 @@
-import datetime
-from collections.abc import Iterator
-from typing import List
+import hashlib
+import os
+import tempfile
+from collections.abc import Callable
+from typing import Any, List, Optional
 
+import joblib
 import numpy as np
+import sklearn
 import xarray as xr
-from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.base import BaseEstimator, RegressorMixin
+from sklearn.ensemble import GradientBoostingRegressor, HistGradientBoostingRegressor
+from sklearn.linear_model import LinearRegression
+
+from . import features
+
+Estimator = Any
+
+# Column of the absolute wind speed in the feature matrix of `train_model`.
+WIND_SPEED_COLUMN = 1
+
+BACKENDS: dict[str, Callable[..., Estimator]] = {}
+
+
+def register_backend(name: str) -> Callable:
+    """Register a function creating an estimator under a name.
+
+    The function is called with the hyperparameters given to `train_model`
+    and must return an unfitted estimator with the scikit-learn interface.
+
+    """
+
+    def register(create: Callable[..., Estimator]) -> Callable[..., Estimator]:
+        BACKENDS[name] = create
+        return create
+
+    return register
+
+
+class PowerCurveRegressor(RegressorMixin, BaseEstimator):
+    """Empirical power curve as a baseline model.
+
+    The production is predicted from the wind speed only, by interpolating
+    the mean production of the training data in bins of the wind speed.
+
+    Parameters
+    ----------
+    wind_speed_column : int, default 1
+        Column of the wind speed in the feature matrix.
+    bin_width : float, default 0.5
+        Width of the wind speed bins (m/s).
+
+    """
+
+    def __init__(
+        self, wind_speed_column: int = WIND_SPEED_COLUMN, bin_width: float = 0.5
+    ):
+        self.wind_speed_column = wind_speed_column
+        self.bin_width = bin_width
+
+    def fit(self, x: np.ndarray, y: np.ndarray) -> "PowerCurveRegressor":
+        """Fit the power curve."""
+        wind_speed = np.asarray(x)[:, self.wind_speed_column]
+        bins = np.floor(wind_speed / self.bin_width).astype(np.int64)
+        bins -= bins.min()
+        counts = np.bincount(bins)
+        sums = np.bincount(bins, weights=np.asarray(y, dtype=float))
+        populated = counts > 0
+        self.wind_speeds_ = (
+            np.bincount(bins, weights=wind_speed)[populated] / counts[populated]
+        )
+        self.production_ = sums[populated] / counts[populated]
+        return self
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        """Predict the production from the wind speed."""
+        wind_speed = np.asarray(x)[:, self.wind_speed_column]
+        return np.interp(wind_speed, self.wind_speeds_, self.production_)
+
+
+@register_backend("gradient_boosting")
+def _create_gradient_boosting(**hyperparameters) -> GradientBoostingRegressor:
+    return GradientBoostingRegressor(**hyperparameters)
+
+
+@register_backend("hist_gradient_boosting")
+def _create_hist_gradient_boosting(**hyperparameters) -> HistGradientBoostingRegressor:
+    # Uses all cores via OpenMP.
+    return HistGradientBoostingRegressor(**hyperparameters)
+
+
+@register_backend("linear")
+def _create_linear(**hyperparameters) -> LinearRegression:
+    return LinearRegression(**hyperparameters)
+
+
+@register_backend("power_curve")
+def _create_power_curve(**hyperparameters) -> PowerCurveRegressor:
+    return PowerCurveRegressor(**hyperparameters)
 
 
 def train_model(
@@ -15,26 +107,89 @@ def train_model(
     time_of_year: xr.DataArray,
     production: xr.DataArray,
     time_coordinate_name: str = "time",
-) -> GradientBoostingRegressor:
+    backend: str = "gradient_boosting",
+    cache_directory: Optional[str] = None,
+    **hyperparameters,
+) -> Estimator:
     """Train the model with the given features and production data.
 
     All given data must be of the same shape.
 
+    Parameters
+    ----------
+    backend : str, default "gradient_boosting"
+        Name of the estimator (see `BACKENDS`): `gradient_boosting`,
+        `hist_gradient_boosting`, `linear` or `power_curve`.
+    cache_directory : str, optional
+        If given, the trained model is stored in this directory and reused
+        when training with the same features, target, backend and
+        hyperparameters again.
+    **hyperparameters
+        Passed to the estimator.
+
     """
-    x = _prepare_x(
-        time_coordinate_name,
-        air_density,
-        absolute_wind_speed,
-        wind_direction,
-        time_of_day,
-        time_of_year,
+    matrix = features.build_feature_matrix(
+        [
+            air_density,
+            absolute_wind_speed,
+            wind_direction,
+            time_of_day,
+            time_of_year,
+        ],
+        target=production,
+        time_coordinate_name=time_coordinate_name,
+    )
+    return fit_model(
+        matrix.x,
+        matrix.y,
+        backend=backend,
+        cache_directory=cache_directory,
+        **hyperparameters,
     )
-    y = production
-    return GradientBoostingRegressor().fit(x, y)
+
+
+def fit_model(
+    x: np.ndarray,
+    y: np.ndarray,
+    backend: str = "gradient_boosting",
+    cache_directory: Optional[str] = None,
+    **hyperparameters,
+) -> Estimator:
+    """Fit an estimator of a backend to a feature matrix and target.
+
+    See `train_model` for the parameters.
+
+    """
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown backend {backend!r}, must be one of {sorted(BACKENDS)}"
+        )
+    if cache_directory is None:
+        return BACKENDS[backend](**hyperparameters).fit(x, y)
+
+    path = os.path.join(
+        cache_directory,
+        f"{backend}-{_get_cache_key(x, y, backend, hyperparameters)}.joblib",
+    )
+    if os.path.exists(path):
+        return joblib.load(path)
+    model = BACKENDS[backend](**hyperparameters).fit(x, y)
+    os.makedirs(cache_directory, exist_ok=True)
+    # Write to a temporary file first, so that concurrent runs never read
+    # a partially written model.
+    file, temporary = tempfile.mkstemp(dir=cache_directory, suffix=".part")
+    os.close(file)
+    try:
+        joblib.dump(model, temporary)
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+    return model
 
 
 def predict_power_production(
-    model: GradientBoostingRegressor,
+    model: Estimator,
     air_density: xr.DataArray,
     absolute_wind_speed: xr.DataArray,
     wind_direction: xr.DataArray,
@@ -59,26 +214,21 @@ def predict_power_production(
     return np.array(production)
 
 
-def _prepare_x(time_coordinate_name: str, *args: xr.DataArray) -> list:
-    intersecting_dates = _get_intersecting_dates(time_coordinate_name, *args)
-    intersecting_data = _select_subset(intersecting_dates, time_coordinate_name, *args)
-    return list(zip(*intersecting_data))
+def _prepare_x(time_coordinate_name: str, *args: xr.DataArray) -> np.ndarray:
+    return features.build_feature_matrix(
+        args, time_coordinate_name=time_coordinate_name
+    ).x
 
 
-def _get_intersecting_dates(
-    time_coordinate_name: str, *args: xr.DataArray
-) -> xr.DataArray:
-    if len(args) == 0:
-        return args[time_coordinate_name]
-    first, rest = args[0], args[1:]
-    intersection = set(first[time_coordinate_name].values)
-    for arg in rest:
-        intersection = intersection & set(arg[time_coordinate_name].values)
-    return sorted(intersection)
-
-
-def _select_subset(
-    dates: list[datetime.datetime], time_coordinate_name: str, *args
-) -> Iterator[np.ndarray]:
-    for arg in args:
-        yield arg.sel({time_coordinate_name: dates}).values
+def _get_cache_key(
+    x: np.ndarray, y: np.ndarray, backend: str, hyperparameters: dict
+) -> str:
+    key = hashlib.sha256()
+    for array in (x, y):
+        array = np.ascontiguousarray(array)
+        key.update(f"{array.dtype}{array.shape}".encode())
+        key.update(array.data)
+    key.update(backend.encode())
+    key.update(repr(sorted(hyperparameters.items())).encode())
+    key.update(sklearn.__version__.encode())
+    return key.hexdigest()
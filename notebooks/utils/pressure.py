@@ -1,9 +1,17 @@
+import weakref
+from typing import Optional, Sequence
+
+import numpy as np
 import xarray as xr
 
+# Pressure coefficients A and B of the model levels per constants dataset.
+# The key `None` refers to the constants bundled with the plugin.
+_COEFFICIENTS: dict[Optional[int], tuple[xr.DataArray, xr.DataArray]] = {}
+
 
 def calculate_pressure(
     p_s: xr.DataArray,
-    constants: xr.Dataset,
+    constants: Optional[xr.Dataset],
     model_level: int,
 ) -> xr.DataArray:
     """Calculate the pressure at a certain model level.
@@ -12,8 +20,9 @@ def calculate_pressure(
     ----------
     p_s : xarray.DataArray
         Pressure at surface level.
-    constants : xarray.Dataset
+    constants : xarray.Dataset, optional
         Constants hayi, hybi, hyam, hybm as from the `maelstrom-constants-a-b` dataset.
+        If `None`, the constants bundled with the plugin are used.
     model_level : int
         Model level.
 
@@ -23,16 +32,94 @@ def calculate_pressure(
         Pressure for a given model level.
 
     """
-    upper_level_constants = constants.loc[{"dim0": 0, "dim0_0": model_level - 1}]
-    model_level_constants = constants.loc[{"dim0": 0, "dim0_0": model_level}]
-    A_1 = upper_level_constants["hyam"]
-    A_2 = model_level_constants["hyam"]
-    B_1 = upper_level_constants["hybm"]
-    B_2 = model_level_constants["hybm"]
-    p_1 = _calculate_pressure_levels(p_s, A_k=A_1, B_k=B_1)
-    p_2 = _calculate_pressure_levels(p_s, A_k=A_2, B_k=B_2)
-    p = 0.5 * (p_1 + p_2)
-    return p
+    pressure = calculate_pressure_on_levels(
+        p_s, constants=constants, levels=[model_level]
+    )
+    return pressure.sel(level=model_level, drop=True)
+
+
+def calculate_pressure_on_levels(
+    p_s: xr.DataArray,
+    constants: Optional[xr.Dataset] = None,
+    levels: Optional[Sequence[int]] = None,
+) -> xr.DataArray:
+    """Calculate the pressure on many model levels at once.
+
+    The pressure is computed by broadcasting the surface pressure against
+    the coefficients of all requested levels with a single multiply-add.
+    The coefficients are derived once per constants dataset and cached.
+
+    Parameters
+    ----------
+    p_s : xarray.DataArray
+        Pressure at surface level.
+    constants : xarray.Dataset, optional
+        Constants hayi, hybi, hyam, hybm as from the `maelstrom-constants-a-b` dataset.
+        If `None`, the constants bundled with the plugin are used.
+    levels : list[int], optional
+        Model levels. Defaults to all levels.
+
+    Returns
+    -------
+    xarray.DataArray
+        Pressure with the additional dimension `level`.
+
+    """
+    A, B = get_level_coefficients(constants)
+    if levels is not None:
+        A = A.sel(level=list(levels))
+        B = B.sel(level=list(levels))
+    return _calculate_pressure_levels(p_s, A_k=A, B_k=B)
+
+
+def get_level_coefficients(
+    constants: Optional[xr.Dataset] = None,
+) -> tuple[xr.DataArray, xr.DataArray]:
+    """Get the pressure coefficients A and B of all model levels.
+
+    The coefficients of a model level are the mean of those of the
+    level and the level above, as used by `calculate_pressure`.
+
+    Parameters
+    ----------
+    constants : xarray.Dataset, optional
+        Constants hayi, hybi, hyam, hybm as from the `maelstrom-constants-a-b` dataset.
+        If `None`, the constants bundled with the plugin are used.
+
+    Returns
+    -------
+    tuple[xarray.DataArray, xarray.DataArray]
+        Coefficients A and B along the dimension `level`.
+
+    """
+    if constants is None:
+        if None not in _COEFFICIENTS:
+            from climetlab_maelstrom_power_production.constants import a_b
+
+            _COEFFICIENTS[None] = _create_level_coefficients(a_b.to_xarray())
+        return _COEFFICIENTS[None]
+    key = id(constants)
+    if key not in _COEFFICIENTS:
+        _COEFFICIENTS[key] = _create_level_coefficients(constants)
+        weakref.finalize(constants, _COEFFICIENTS.pop, key, None)
+    return _COEFFICIENTS[key]
+
+
+def _create_level_coefficients(
+    constants: xr.Dataset,
+) -> tuple[xr.DataArray, xr.DataArray]:
+    half_levels = constants.loc[{"dim0": 0}]
+    levels = half_levels["dim0_0"].values[1:]
+    coefficients = []
+    for name in ("hyam", "hybm"):
+        values = np.asarray(half_levels[name].values, dtype=float)
+        mean = 0.5 * (values[:-1] + values[1:])
+        mean.flags.writeable = False
+        coefficients.append(
+            xr.DataArray(mean, coords={"level": levels}, dims="level", name=name)
+        )
+    A, B = coefficients
+    return A, B
 
 
 def _calculate_pressure_levels(
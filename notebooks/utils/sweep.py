@@ -0,0 +1,221 @@
+"""Train many models in parallel, e.g. per turbine, model level and feature set."""
+import concurrent.futures
+import dataclasses
+import itertools
+import os
+import tempfile
+import time
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any, Optional, Union
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from . import features, metrics, model
+
+Label = Union[int, str]
+
+
+@dataclasses.dataclass(frozen=True)
+class Job:
+    """A model to train and evaluate.
+
+    Attributes
+    ----------
+    features : tuple[str, ...]
+        Names of the features in the data passed to `run_sweep`.
+    backend : str, default "gradient_boosting"
+        Estimator backend (see `model.BACKENDS`).
+    turbine : int or str, optional
+        Turbine to select from data with a turbine dimension.
+    level : int, optional
+        Model level to select from data with a level dimension.
+    hyperparameters : tuple[tuple[str, Any], ...]
+        Hyperparameters of the estimator as pairs of name and value.
+
+    """
+
+    features: tuple[str, ...]
+    backend: str = "gradient_boosting"
+    turbine: Optional[Label] = None
+    level: Optional[int] = None
+    hyperparameters: tuple[tuple[str, Any], ...] = ()
+
+
+def create_jobs(
+    feature_sets: Iterable[Sequence[str]],
+    turbines: Iterable[Optional[Label]] = (None,),
+    levels: Iterable[Optional[int]] = (None,),
+    backends: Iterable[str] = ("gradient_boosting",),
+    hyperparameters: Iterable[Mapping[str, Any]] = ({},),
+) -> list[Job]:
+    """Create a job for each combination of the given options."""
+    return [
+        Job(
+            features=tuple(feature_set),
+            backend=backend,
+            turbine=turbine,
+            level=level,
+            hyperparameters=tuple(sorted(parameters.items())),
+        )
+        for feature_set, turbine, level, backend, parameters in itertools.product(
+            feature_sets, turbines, levels, backends, hyperparameters
+        )
+    ]
+
+
+def run_sweep(
+    jobs: Sequence[Job],
+    data: Mapping[str, xr.DataArray],
+    target: xr.DataArray,
+    workers: Optional[int] = None,
+    test_size: float = 0.25,
+    cache_directory: Optional[str] = None,
+    time_coordinate_name: str = "time",
+    turbine_dim: str = "turbine",
+    level_dim: str = "level",
+) -> pd.DataFrame:
+    """Train and evaluate the models of the jobs in a process pool.
+
+    The data are written once to memory-mapped files that the workers
+    open read-only, hence they are neither pickled nor copied per job.
+
+    Parameters
+    ----------
+    jobs : list[Job]
+        Models to train (see `create_jobs`).
+    data : dict[str, xarray.DataArray]
+        Features by name along the time coordinate and optionally the
+        dimensions `turbine_dim` and `level_dim`.
+    target : xarray.DataArray
+        Target values, e.g. the production, along the time coordinate and
+        optionally `turbine_dim`.
+    workers : int, optional
+        Number of worker processes. Defaults to the number of CPUs.
+        If 1, the jobs run in the current process.
+    test_size : float, default 0.25
+        Fraction of the latest time stamps used for evaluation.
+    cache_directory : str, optional
+        Directory to cache the trained models (see `model.train_model`).
+    time_coordinate_name : str, default "time"
+        Name of the time coordinate.
+    turbine_dim : str, default "turbine"
+        Dimension selected by `Job.turbine`.
+    level_dim : str, default "level"
+        Dimension selected by `Job.level`.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per job with its options, the number of training and test
+        samples, the training time and the metrics `mae`, `rmse` and `bias`.
+
+    """
+    if not 0.0 < test_size < 1.0:
+        raise ValueError(f"Test size must be between 0 and 1, got {test_size}")
+    options = {
+        "test_size": test_size,
+        "cache_directory": cache_directory,
+        "time_coordinate_name": time_coordinate_name,
+        "turbine_dim": turbine_dim,
+        "level_dim": level_dim,
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        arrays = {
+            name: _SharedArray.create(array, directory=directory)
+            for name, array in [*data.items(), (_TARGET, target)]
+        }
+        if workers == 1:
+            try:
+                rows = [_run_job(job, arrays=arrays, **options) for job in jobs]
+            finally:
+                for array in arrays.values():
+                    _OPENED.pop(array.path, None)
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(_run_job, job, arrays=arrays, **options) for job in jobs
+                ]
+                rows = [future.result() for future in futures]
+    return pd.DataFrame(rows)
+
+
+_TARGET = "__target__"
+
+# Arrays opened by a worker process, by path.
+_OPENED: dict[str, np.ndarray] = {}
+
+
+@dataclasses.dataclass(frozen=True)
+class _SharedArray:
+    """A data array stored in a memory-mapped file."""
+
+    path: str
+    dims: tuple[str, ...]
+    coords: dict[str, np.ndarray]
+
+    @classmethod
+    def create(cls, array: xr.DataArray, directory: str) -> "_SharedArray":
+        path = os.path.join(directory, f"{len(os.listdir(directory))}.npy")
+        np.save(path, np.ascontiguousarray(array.values))
+        return cls(
+            path=path,
+            dims=tuple(map(str, array.dims)),
+            coords={str(dim): array[dim].values for dim in array.dims},
+        )
+
+    def open(self) -> xr.DataArray:
+        if self.path not in _OPENED:
+            _OPENED[self.path] = np.load(self.path, mmap_mode="r")
+        return xr.DataArray(_OPENED[self.path], dims=self.dims, coords=self.coords)
+
+
+def _run_job(
+    job: Job,
+    arrays: Mapping[str, _SharedArray],
+    test_size: float,
+    cache_directory: Optional[str],
+    time_coordinate_name: str,
+    turbine_dim: str,
+    level_dim: str,
+) -> dict[str, Any]:
+    selection = {turbine_dim: job.turbine, level_dim: job.level}
+
+    def select(name: str) -> xr.DataArray:
+        array = arrays[name].open()
+        return array.sel(
+            {
+                dim: value
+                for dim, value in selection.items()
+                if value is not None and dim in array.dims
+            }
+        )
+
+    matrix = features.build_feature_matrix(
+        [select(name) for name in job.features],
+        target=select(_TARGET),
+        time_coordinate_name=time_coordinate_name,
+    )
+    assert matrix.y is not None
+    train = int(round(matrix.x.shape[0] * (1 - test_size)))
+    start = time.perf_counter()
+    trained = model.fit_model(
+        matrix.x[:train],
+        matrix.y[:train],
+        backend=job.backend,
+        cache_directory=cache_directory,
+        **dict(job.hyperparameters),
+    )
+    training_seconds = time.perf_counter() - start
+    y_true = matrix.y[train:]
+    y_pred = trained.predict(matrix.x[train:])
+    return {
+        **dataclasses.asdict(job),
+        "train_samples": train,
+        "test_samples": y_true.size,
+        "training_seconds": training_seconds,
+        "mae": metrics.normalized_mean_absolute_error(y_true, y_pred),
+        "rmse": metrics.root_mean_squared_error(y_true, y_pred),
+        "bias": float(np.mean(y_pred - y_true)),
+    }
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from . import cleaning, data
+
+
+@pytest.fixture()
+def production_data() -> xr.Dataset:
+    dates = pd.date_range("2020-01-01", periods=6, freq="10min")
+    return xr.Dataset(
+        data_vars={
+            "production": (
+                ["time", "turbine"],
+                np.arange(12, dtype=float).reshape(6, 2),
+            ),
+            "regulation": (
+                ["time", "turbine"],
+                [[0, 0], [50, 0], [50, 0], [0, 0], [0, 0], [0, 100]],
+            ),
+            "status": (
+                ["time", "turbine"],
+                [[0, 0], [0, 0], [1, 0], [np.nan, 1], [0, 0], [0, 1]],
+            ),
+        },
+        coords={"time": dates, "turbine": [1, 2]},
+    )
+
+
+def test_filter_production_data_mask(production_data):
+    result, report = cleaning.filter_production_data(production_data)
+
+    expected = np.arange(12, dtype=float).reshape(6, 2)
+    expected[[1, 2, 3, 5], [0, 0, 1, 1]] = np.nan
+    np.testing.assert_equal(result["production"].values, expected)
+    # The variables checked by the rules are not masked.
+    xr.testing.assert_equal(result["status"], production_data["status"])
+    assert report.loc[("curtailed", 1), "flagged"] == 2
+    assert report.loc[("curtailed", 2), "flagged"] == 1
+    assert report.loc[("not operating", 1), "flagged"] == 1
+    assert report.loc[("not operating", 1), "flagged_exclusively"] == 0
+    assert report.loc[("not operating", 2), "flagged"] == 2
+    assert report.loc[("not operating", 2), "fraction"] == pytest.approx(2 / 6)
+
+
+def test_filter_production_data_drop(production_data):
+    single = production_data.sel(turbine=1)
+
+    result, report = cleaning.filter_production_data(single, action="drop")
+
+    np.testing.assert_equal(result["production"].values, [0.0, 6.0, 8.0, 10.0])
+    assert list(report.index) == ["curtailed", "not operating"]
+
+
+def test_filter_production_data_flag(production_data):
+    result, _ = cleaning.filter_production_data(production_data, action="flag")
+
+    assert result["flagged"].sum() == 4
+    xr.testing.assert_equal(result["production"], production_data["production"])
+
+
+def test_filter_production_data_with_bounds(production_data):
+    rules = [cleaning.Rule(name="too high", variable="production", maximum=9.0)]
+
+    _, report = cleaning.filter_production_data(
+        production_data, rules=rules, action="flag"
+    )
+
+    np.testing.assert_equal(report["flagged"].values, [1, 1])
+
+
+def test_filter_production_data_without_rule_variables(production_data):
+    with pytest.raises(ValueError):
+        cleaning.filter_production_data(production_data[["production"]])
+
+
+def test_resample_and_clear_with_rules(production_data):
+    single = production_data.sel(turbine=1, drop=True)
+    dates = pd.date_range("2020-01-01", periods=1, freq="1h")
+
+    result = data.resample_and_clear_production_data_to_hourly_timeseries(
+        single, dates=dates, rules=cleaning.DEFAULT_RULES
+    )
+
+    np.testing.assert_allclose(result.values, [np.mean([0.0, 8.0, 10.0])])
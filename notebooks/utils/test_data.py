@@ -178,3 +178,34 @@ def test_resample_production_data_to_hourly_timeseries():
     result = data._resample_production_data_to_hourly_timeseries(production)
 
     pd.testing.assert_series_equal(result, expected)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_resample_to_hourly(chunk_size):
+    dates = pd.date_range("2020-01-01", "2020-01-01 03:50", freq="10min")
+    # No data in the third hour.
+    dates = dates[(dates.hour != 2)]
+    production = np.arange(2 * dates.size, dtype=float).reshape(dates.size, 2)
+    production[0, 0] = np.nan
+    ds = xr.Dataset(
+        data_vars={
+            "production": (["time", "turbine"], production),
+            "wind_speed": (["time", "turbine"], production / 10),
+        },
+        coords={"time": dates, "turbine": [1, 2]},
+    )
+    expected = (
+        ds.to_dataframe()
+        .reset_index("turbine")
+        .groupby("turbine")
+        .resample("1h")[["production", "wind_speed"]]
+        .mean()
+        .to_xarray()
+        .transpose("time", "turbine")
+    )
+
+    result = data.resample_to_hourly(ds, chunk_size=chunk_size)
+
+    assert result["time"].size == 4
+    xr.testing.assert_allclose(result, expected)
+    assert np.isnan(result["production"].sel(time="2020-01-01T02")).all()
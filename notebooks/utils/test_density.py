@@ -51,3 +51,58 @@ def test_rh():
     # This could not be reproduced and hence is checked here.
     assert result.dtype is not np.dtype("O")
     assert result.dtype == np.float64 or result.dtype == np.float32
+
+
+def test_p_d_selects_coefficients_by_sign():
+    theta = xr.DataArray([-10.0, 0.0, 10.0])
+    expected = [
+        density._magnus(-10.0, *density.magnus_const2),
+        density._magnus(0.0, *density.magnus_const1),
+        density._magnus(10.0, *density.magnus_const1),
+    ]
+
+    result = density._p_d(theta)
+
+    np.testing.assert_allclose(result.values, expected)
+
+
+def test_p_d_computes_in_data_type_of_temperature(monkeypatch):
+    theta = xr.DataArray(np.array([-10.0, 10.0], dtype=np.float32))
+    magnus = density._magnus
+    dtypes = []
+
+    def _magnus(*args):
+        dtypes.extend(arg.dtype for arg in args)
+        return magnus(*args)
+
+    monkeypatch.setattr(density, "_magnus", _magnus)
+
+    result = density._p_d(theta)
+
+    assert dtypes == [np.float32] * 4
+    assert result.dtype == np.float32
+
+
+def test_calculate_density_full_field():
+    shape = (2, 3, 4, 5)
+    dims = ["time", "level", "latitude", "longitude"]
+    rng = np.random.default_rng(42)
+    temperature = xr.DataArray(rng.uniform(-20.0, 30.0, size=shape), dims=dims)
+    pressure = xr.DataArray(rng.uniform(900.0, 1050.0, size=shape), dims=dims)
+    specific_humidity = xr.DataArray(rng.uniform(0.0, 0.01, size=shape), dims=dims)
+    expected = density._calculate_density(
+        temperature=temperature,
+        pressure=pressure,
+        specific_humidity=specific_humidity,
+    )
+
+    result = density.calculate_density(
+        temperature=temperature.chunk({"time": 1}),
+        pressure=pressure.chunk({"time": 1}),
+        specific_humidity=specific_humidity.chunk({"time": 1}),
+        dtype=np.float32,
+    )
+
+    assert result.chunks is not None
+    assert result.dtype == np.float32
+    np.testing.assert_allclose(result.values, expected.values, rtol=1e-5)
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from . import features
+
+
+@pytest.fixture()
+def times() -> pd.DatetimeIndex:
+    return pd.date_range("2020-01-01", periods=4, freq="1h")
+
+
+def test_build_feature_matrix(times):
+    first = xr.DataArray([1.0, 2.0, 3.0, 4.0], coords={"time": times})
+    # Unsorted and shifted time stamps.
+    second = xr.DataArray(
+        [30.0, 20.0, 40.0],
+        coords={"time": [times[2], times[1], times[3]]},
+    )
+    target = xr.DataArray([100.0, 200.0, 300.0], coords={"time": times[1:]})
+
+    result = features.build_feature_matrix([first, second], target=target)
+
+    assert result.x.dtype == np.float32
+    assert result.x.flags.c_contiguous
+    np.testing.assert_equal(result.x, [[2.0, 20.0], [3.0, 30.0], [4.0, 40.0]])
+    np.testing.assert_equal(result.y, [100.0, 200.0, 300.0])
+    np.testing.assert_equal(result.times, times[1:].values)
+    assert result.sites is None
+
+
+def test_build_feature_matrix_with_repeated_times(times):
+    first = xr.DataArray([1.0, 2.0, 3.0], coords={"time": times[:3]})
+    # The second time stamp is repeated, its first value is used.
+    second = xr.DataArray(
+        [10.0, 20.0, 21.0, 30.0],
+        coords={"time": [times[0], times[1], times[1], times[2]]},
+    )
+
+    result = features.build_feature_matrix([first, second])
+
+    np.testing.assert_equal(result.times, times[:3].values)
+    np.testing.assert_equal(result.x, [[1.0, 10.0], [2.0, 20.0], [3.0, 30.0]])
+
+
+def test_build_feature_matrix_with_sites(times):
+    wind_speed = xr.DataArray(
+        [[1.0, 2.0, 3.0, 4.0], [5.0, 6.0, 7.0, 8.0]],
+        coords={"turbine": [1, 2], "time": times},
+        dims=["turbine", "time"],
+    )
+    time_of_day = xr.DataArray([0.0, 0.1, 0.2], coords={"time": times[:3]})
+    production = wind_speed.T * 10
+
+    result = features.build_feature_matrix(
+        [wind_speed, time_of_day], target=production, site_dim="turbine"
+    )
+
+    np.testing.assert_equal(
+        result.x,
+        np.array(
+            [
+                [1.0, 0.0],
+                [2.0, 0.1],
+                [3.0, 0.2],
+                [5.0, 0.0],
+                [6.0, 0.1],
+                [7.0, 0.2],
+            ],
+            dtype=np.float32,
+        ),
+    )
+    np.testing.assert_equal(result.y, [10.0, 20.0, 30.0, 50.0, 60.0, 70.0])
+    np.testing.assert_equal(result.sites, [1, 1, 1, 2, 2, 2])
+
+
+def test_build_feature_matrix_with_unexpected_dims(times):
+    feature = xr.DataArray(
+        np.zeros((2, 4)),
+        coords={"level": [1, 2], "time": times},
+        dims=["level", "time"],
+    )
+
+    with pytest.raises(ValueError):
+        features.build_feature_matrix([feature])
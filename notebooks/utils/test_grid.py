@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+import xarray as xr
+
+from . import data, grid
+
+
+@pytest.fixture()
+def regular_grid() -> xr.Dataset:
+    return xr.Dataset(
+        data_vars={
+            "t": (
+                ["latitude", "longitude"],
+                np.arange(12, dtype=float).reshape(3, 4),
+            ),
+        },
+        coords={
+            "latitude": ("latitude", [52.0, 51.9, 51.8]),
+            "longitude": ("longitude", [10.0, 10.1, 10.2, 10.3]),
+        },
+    )
+
+
+@pytest.mark.parametrize(
+    ("longitudes", "latitudes", "expected"),
+    [
+        ([10.0], [52.0], {"longitude": [0], "latitude": [0]}),
+        ([10.14, 10.16], [51.86, 51.84], {"longitude": [1, 2], "latitude": [1, 2]}),
+        # Sites outside of the grid get the closest grid point on the edge.
+        ([9.0, 11.0], [53.0, 50.0], {"longitude": [0, 3], "latitude": [0, 2]}),
+    ],
+)
+def test_grid_index_regular(regular_grid, longitudes, latitudes, expected):
+    index = grid.GridIndex.from_dataset(regular_grid)
+
+    result = index.query(np.array(longitudes), np.array(latitudes))
+
+    assert index.regular
+    assert result.keys() == expected.keys()
+    for name, indexes in expected.items():
+        np.testing.assert_equal(result[name], indexes)
+
+
+def test_grid_index_regular_agrees_with_brute_force(regular_grid):
+    rng = np.random.default_rng(42)
+    longitudes = rng.uniform(9.9, 10.4, size=1000)
+    latitudes = rng.uniform(51.7, 52.1, size=1000)
+    index = grid.GridIndex.from_dataset(regular_grid)
+
+    result = index.query(longitudes, latitudes)
+
+    for name, values in [("longitude", longitudes), ("latitude", latitudes)]:
+        axis = regular_grid[name].values
+        expected = np.argmin(np.abs(axis[np.newaxis] - values[:, np.newaxis]), axis=1)
+        np.testing.assert_equal(result[name], expected)
+
+
+def test_grid_index_curvilinear():
+    longitude, latitude = np.meshgrid([10.0, 10.1, 10.2], [52.0, 51.9])
+    index = grid.GridIndex(
+        xr.DataArray(longitude, dims=["y", "x"]),
+        xr.DataArray(latitude, dims=["y", "x"]),
+    )
+
+    result = index.query(np.array([10.19, 10.04]), np.array([51.91, 51.99]))
+
+    assert not index.regular
+    np.testing.assert_equal(result["y"], [1, 0])
+    np.testing.assert_equal(result["x"], [2, 0])
+
+
+def test_grid_index_curvilinear_with_different_dims():
+    with pytest.raises(ValueError):
+        grid.GridIndex(
+            xr.DataArray(np.zeros((2, 3)), dims=["y", "x"]),
+            xr.DataArray(np.zeros((3, 2)), dims=["x", "y"]),
+        )
+
+
+def test_get_closest_grid_point_indexes_to_wind_turbines(regular_grid):
+    production_data = xr.Dataset(
+        coords={
+            "longitude": ("turbine", [10.04, 10.29]),
+            "latitude": ("turbine", [51.81, 51.95]),
+        }
+    )
+
+    indexers = data.get_closest_grid_point_indexes_to_wind_turbines(
+        production_data, regular_grid
+    )
+    result = regular_grid.isel(indexers)
+
+    assert result["t"].dims == ("turbine",)
+    np.testing.assert_equal(result["t"].values, [8.0, 3.0])
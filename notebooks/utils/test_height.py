@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+import xarray as xr
+
+from . import height
+
+LEVELS = np.arange(120, 138)
+
+
+@pytest.fixture()
+def temperature() -> xr.DataArray:
+    return xr.DataArray(
+        np.full((2, LEVELS.size, 3), 288.0),
+        dims=["time", "level", "longitude"],
+        coords={"level": LEVELS},
+    )
+
+
+@pytest.fixture()
+def surface_pressure() -> xr.DataArray:
+    return xr.DataArray(np.full((2, 3), 101325.0), dims=["time", "longitude"])
+
+
+def test_calculate_level_heights_isothermal(temperature, surface_pressure):
+    from climetlab_maelstrom_power_production.constants import l137
+
+    A, B = l137.get_table()
+    pressure = 0.5 * (
+        A[LEVELS - 1] + A[LEVELS] + (B[LEVELS - 1] + B[LEVELS]) * 101325.0
+    )
+    # In an isothermal atmosphere, the height follows the barometric formula.
+    expected = height.r_d * 288.0 / height.g * np.log(101325.0 / pressure)
+
+    result = height.calculate_level_heights(
+        temperature,
+        specific_humidity=temperature * 0.0,
+        surface_pressure=surface_pressure,
+    )
+
+    assert result.dims == temperature.dims
+    np.testing.assert_allclose(result.isel(time=0, longitude=0), expected)
+    # Heights decrease towards the surface.
+    assert np.all(np.diff(result.isel(time=0, longitude=0).values) < 0)
+
+
+def test_calculate_level_heights_with_all_levels(surface_pressure):
+    from climetlab_maelstrom_power_production.constants import l137
+
+    levels = np.arange(1, l137.NUMBER_OF_LEVELS + 1)
+    temperature = xr.DataArray(
+        np.full((2, levels.size, 3), 288.0),
+        dims=["time", "level", "longitude"],
+        coords={"level": levels},
+    )
+    A, B = l137.get_table()
+    pressure = 0.5 * (A[:-1] + A[1:] + (B[:-1] + B[1:]) * 101325.0)
+    expected = height.r_d * 288.0 / height.g * np.log(101325.0 / pressure)
+
+    result = height.calculate_level_heights(
+        temperature,
+        specific_humidity=temperature * 0.0,
+        surface_pressure=surface_pressure,
+    )
+
+    assert not result.isnull().any()
+    np.testing.assert_allclose(result.isel(time=0, longitude=0), expected)
+
+
+def test_calculate_level_heights_requires_levels_down_to_surface(
+    temperature, surface_pressure
+):
+    with pytest.raises(ValueError):
+        height.calculate_level_heights(
+            temperature.isel(level=slice(0, -1)),
+            specific_humidity=temperature * 0.0,
+            surface_pressure=surface_pressure,
+        )
+
+
+@pytest.mark.parametrize(
+    ("heights", "expected"),
+    [
+        ([15.0, 25.0], [1.5, 2.5]),
+        # Outside of the levels, the closest level's value is used.
+        ([5.0, 100.0], [1.0, 3.0]),
+    ],
+)
+def test_interpolate_to_heights(heights, expected):
+    level_heights = xr.DataArray(
+        [[30.0, 20.0, 10.0]], dims=["time", "level"], coords={"level": [1, 2, 3]}
+    )
+    data = xr.Dataset(
+        {
+            "u": (["time", "level"], [[3.0, 2.0, 1.0]]),
+            "v": (["time", "level"], [[-3.0, -2.0, -1.0]]),
+        },
+        coords={"level": [1, 2, 3]},
+    )
+
+    result = height.interpolate_to_heights(
+        data.chunk({"time": 1}), level_heights=level_heights, heights=heights
+    )
+
+    assert result["u"].dims == ("time", "height")
+    np.testing.assert_allclose(result["u"].values[0], expected)
+    np.testing.assert_allclose(result["v"].values[0], -np.array(expected))
+
+
+def test_interpolate_gathers_all_variables_from_one_search():
+    rng = np.random.default_rng(0)
+    # The level heights lack the variable axis, as passed by `xr.apply_ufunc`.
+    level_heights = rng.uniform(0.0, 300.0, size=(1, 4, 6))
+    values = rng.normal(size=(3, 4, 6))
+    heights = np.array([50.0, 100.0, 150.0])
+
+    result = height._interpolate(level_heights, values, heights)
+
+    assert result.shape == (3, 4, 3)
+    for variable, point in np.ndindex(3, 4):
+        order = np.argsort(level_heights[0, point])
+        expected = np.interp(
+            heights, level_heights[0, point, order], values[variable, point, order]
+        )
+        np.testing.assert_allclose(result[variable, point], expected)
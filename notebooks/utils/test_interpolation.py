@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+import xarray as xr
+
+from . import interpolation
+
+
+@pytest.fixture()
+def data() -> xr.Dataset:
+    # A linear field is reproduced exactly by bilinear interpolation.
+    longitude = np.array([10.0, 10.1, 10.2, 10.3])
+    latitude = np.array([52.0, 51.9, 51.8])
+    time = np.arange(3)
+    values = (
+        time[:, np.newaxis, np.newaxis]
+        + 10 * latitude[np.newaxis, :, np.newaxis]
+        + 100 * longitude[np.newaxis, np.newaxis, :]
+    )
+    return xr.Dataset(
+        data_vars={"t": (["time", "latitude", "longitude"], values)},
+        coords={"time": time, "latitude": latitude, "longitude": longitude},
+    )
+
+
+def _linear(time, longitude, latitude):
+    return time + 10 * latitude + 100 * longitude
+
+
+def test_bilinear(data):
+    longitudes = np.array([10.05, 10.0, 10.27])
+    latitudes = np.array([51.93, 52.0, 51.81])
+    interpolator = interpolation.PointInterpolator.from_dataset(
+        data, longitudes=longitudes, latitudes=latitudes
+    )
+
+    result = interpolator(data)
+
+    assert result["t"].dims == ("time", "site")
+    np.testing.assert_allclose(result["longitude"].values, longitudes)
+    np.testing.assert_allclose(
+        result["t"].values,
+        _linear(
+            np.arange(3)[:, np.newaxis],
+            longitudes[np.newaxis],
+            latitudes[np.newaxis],
+        ),
+    )
+    np.testing.assert_allclose(interpolator.weights.sum(axis=-1), 1.0)
+
+
+def test_bilinear_outside_of_grid_uses_edge(data):
+    result = interpolation.PointInterpolator.from_dataset(
+        data, longitudes=np.array([9.0]), latitudes=np.array([53.0])
+    )(data)
+
+    np.testing.assert_allclose(
+        result["t"].values[:, 0], data["t"].isel(longitude=0, latitude=0).values
+    )
+
+
+def test_bilinear_is_lazy(data):
+    dask_data = data.chunk({"time": 1})
+
+    result = interpolation.interpolate_to_sites(
+        dask_data, longitudes=np.array([10.05]), latitudes=np.array([51.95])
+    )
+
+    assert result["t"].chunks is not None
+    np.testing.assert_allclose(
+        result["t"].values[:, 0], _linear(np.arange(3), 10.05, 51.95)
+    )
+
+
+@pytest.mark.parametrize(
+    ("longitudes", "latitudes", "expected"),
+    [
+        # On a grid point, IDW returns the value of that point.
+        ([10.1], [51.9], [_linear(0, 10.1, 51.9)]),
+        # Equidistant from the neighbours, IDW averages them.
+        ([10.15], [51.85], [_linear(0, 10.15, 51.85)]),
+    ],
+)
+def test_idw(data, longitudes, latitudes, expected):
+    result = interpolation.interpolate_to_sites(
+        data.isel(time=[0]),
+        longitudes=np.array(longitudes),
+        latitudes=np.array(latitudes),
+        method="idw",
+    )
+
+    np.testing.assert_allclose(result["t"].values[0], expected, rtol=1e-6)
+
+
+def test_interpolate_to_sites_caches_weights(data):
+    interpolation._get_cached_interpolator.cache_clear()
+    sites = {"longitudes": np.array([10.05]), "latitudes": np.array([51.95])}
+
+    interpolation.interpolate_to_sites(data, **sites)
+    interpolation.interpolate_to_sites(data["t"], **sites)
+
+    assert interpolation._get_cached_interpolator.cache_info().hits == 1
+
+
+def test_unknown_method(data):
+    with pytest.raises(ValueError):
+        interpolation.interpolate_to_sites(
+            data, longitudes=[10.0], latitudes=[52.0], method="cubic"
+        )
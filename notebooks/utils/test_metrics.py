@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from . import metrics
+
+
+@pytest.fixture()
+def values() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(42)
+    y_true = rng.uniform(0.0, 100.0, size=1000)
+    y_pred = y_true + rng.normal(0.0, 5.0, size=1000)
+    return y_true, y_pred
+
+
+@pytest.mark.parametrize("assym", [-1, 0, 1])
+@pytest.mark.parametrize("normalization", [1.0, "spread", "mean", "std", "var"])
+def test_error_accumulator_in_chunks(values, assym, normalization):
+    y_true, y_pred = values
+    accumulator = metrics.ErrorAccumulator(assym=assym)
+
+    for start in range(0, y_true.size, 300):
+        chunk = slice(start, start + 300)
+        accumulator.update(y_true[chunk], y_pred[chunk])
+
+    assert accumulator.normalized_mae(normalization) == pytest.approx(
+        metrics.normalized_mean_absolute_error(
+            y_true, y_pred, normalization=normalization, assym=assym
+        )
+    )
+    assert accumulator.normalized_rmse(normalization) == pytest.approx(
+        metrics.normalized_root_mean_squared_error(
+            y_true, y_pred, normalization=normalization, assym=assym
+        )
+    )
+
+
+def test_error_accumulator_merge(values):
+    y_true, y_pred = values
+    first = metrics.ErrorAccumulator().update(y_true[:400], y_pred[:400])
+    second = metrics.ErrorAccumulator().update(y_true[400:], y_pred[400:])
+
+    result = first + second
+
+    assert result.count == 1000
+    assert result.bias == pytest.approx(np.mean(y_pred - y_true))
+    assert result.rmse == pytest.approx(metrics.root_mean_squared_error(y_true, y_pred))
+
+
+def test_error_accumulator_merge_keeps_operands_unchanged():
+    first = metrics.ErrorAccumulator()
+    second = metrics.ErrorAccumulator().update(np.zeros(2), np.ones(2))
+
+    for result in (first + second, second + first):
+        result.update(np.zeros(2), np.full(2, 5.0))
+
+    assert np.isnan(first.count)
+    assert second.count == 2
+    assert second.mae == pytest.approx(1.0)
+
+
+def test_grouped_error_accumulator_merge_keeps_operands_unchanged():
+    first = metrics.GroupedErrorAccumulator(by=["turbine"])
+    second = metrics.GroupedErrorAccumulator(by=["turbine"]).update(
+        np.zeros(2), np.ones(2), groups={"turbine": np.array([1, 2])}
+    )
+
+    for result in (first + second, second + first):
+        result.update(np.zeros(2), np.ones(2), groups={"turbine": np.array([1, 3])})
+
+    assert first.to_dataframe("turbine").empty
+    result = second.to_dataframe("turbine")
+    assert list(result.index) == [1, 2]
+    np.testing.assert_equal(result["count"].values, [1.0, 1.0])
+
+
+def test_error_accumulator_with_sample_weight():
+    accumulator = metrics.ErrorAccumulator().update(
+        np.array([0.0, 0.0]), np.array([1.0, 3.0]), sample_weight=np.array([3.0, 1.0])
+    )
+
+    assert accumulator.mae == pytest.approx(1.5)
+
+
+def test_grouped_error_accumulator(values):
+    y_true, y_pred = values
+    turbine = np.arange(y_true.size) % 4 + 1
+    hour = np.arange(y_true.size) % 24
+    lead_time = (np.arange(y_true.size) % 48).astype("timedelta64[h]")
+    by = ["turbine", "hour", "lead_time"]
+    accumulator = metrics.GroupedErrorAccumulator(by=by)
+
+    for start in range(0, y_true.size, 250):
+        chunk = slice(start, start + 250)
+        # Merging accumulators of chunks gives the same result as updating one.
+        accumulator = accumulator + metrics.GroupedErrorAccumulator(by=by).update(
+            y_true[chunk],
+            y_pred[chunk],
+            groups={
+                "turbine": turbine[chunk],
+                "hour": hour[chunk],
+                "lead_time": lead_time[chunk],
+            },
+        )
+    result = accumulator.to_dataframe("turbine")
+
+    assert list(result.index) == [1, 2, 3, 4]
+    for key, row in result.iterrows():
+        mask = turbine == key
+        assert row["count"] == mask.sum()
+        assert row["mae"] == pytest.approx(np.mean(np.abs(y_pred[mask] - y_true[mask])))
+        assert row["spread"] == pytest.approx(np.ptp(y_true[mask]))
+    assert len(accumulator.to_dataframe("hour")) == 24
+    assert accumulator.to_dataframe("lead_time").index.dtype.kind == "m"
+
+
+def test_error_accumulator_merge_with_different_assym():
+    with pytest.raises(ValueError):
+        metrics.ErrorAccumulator(assym=1) + metrics.ErrorAccumulator(assym=0)
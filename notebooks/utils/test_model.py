@@ -1,6 +1,8 @@
 import datetime
 
 import numpy as np
+import pandas as pd
+import pytest
 import xarray as xr
 
 from . import model
@@ -29,3 +31,68 @@ def test_prepare_x():
     )
 
     np.testing.assert_equal(result, expected)
+
+
+@pytest.fixture()
+def training_data() -> dict[str, xr.DataArray]:
+    times = pd.date_range("2020-01-01", periods=200, freq="1h")
+    rng = np.random.default_rng(42)
+    wind_speed = rng.uniform(0.0, 20.0, size=times.size)
+
+    def feature(values: np.ndarray) -> xr.DataArray:
+        return xr.DataArray(values, coords={"time": times})
+
+    return {
+        "air_density": feature(rng.uniform(1.1, 1.3, size=times.size)),
+        "absolute_wind_speed": feature(wind_speed),
+        "wind_direction": feature(rng.uniform(0.0, 360.0, size=times.size)),
+        "time_of_day": feature(rng.uniform(0.0, 1.0, size=times.size)),
+        "time_of_year": feature(rng.uniform(0.0, 1.0, size=times.size)),
+        "production": feature(np.clip(wind_speed**3, 0.0, 1000.0)),
+    }
+
+
+@pytest.mark.parametrize("backend", sorted(model.BACKENDS))
+def test_train_model_with_backend(training_data, backend):
+    trained = model.train_model(**training_data, backend=backend)
+    features = {
+        name: data for name, data in training_data.items() if name != "production"
+    }
+
+    result = model.predict_power_production(trained, **features)
+
+    assert result.shape == (200,)
+    assert np.all(np.isfinite(result))
+
+
+def test_train_model_with_unknown_backend(training_data):
+    with pytest.raises(ValueError):
+        model.train_model(**training_data, backend="unknown")
+
+
+def test_power_curve_regressor():
+    x = np.array([[0.0, 1.0], [0.0, 1.1], [0.0, 3.0]])
+    y = np.array([10.0, 20.0, 50.0])
+
+    regressor = model.PowerCurveRegressor(bin_width=1.0).fit(x, y)
+
+    np.testing.assert_allclose(
+        regressor.predict(np.array([[0.0, 1.05], [0.0, 3.0]])), [15.0, 50.0]
+    )
+
+
+def test_train_model_uses_cache(training_data, tmp_path, monkeypatch):
+    first = model.train_model(
+        **training_data, backend="linear", cache_directory=str(tmp_path)
+    )
+
+    def fail(**hyperparameters):
+        raise AssertionError("Model was trained again")
+
+    monkeypatch.setitem(model.BACKENDS, "linear", fail)
+    second = model.train_model(
+        **training_data, backend="linear", cache_directory=str(tmp_path)
+    )
+
+    assert len(list(tmp_path.iterdir())) == 1
+    np.testing.assert_equal(second.coef_, first.coef_)
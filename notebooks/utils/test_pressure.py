@@ -79,3 +79,62 @@ def test_calculate_pressure_levels(p_s, A_k, B_k, expected):
     )
 
     xr.testing.assert_equal(result, expected)
+
+
+@pytest.fixture()
+def constants() -> xr.Dataset:
+    hyam = [[1.0, 2.0, 4.0, 8.0]] * 2
+    hybm = [[0.0, 0.2, 0.4, 0.6]] * 2
+    return xr.Dataset(
+        data_vars={
+            "hyam": (["dim0", "dim0_0"], hyam),
+            "hybm": (["dim0", "dim0_0"], hybm),
+        },
+        coords={
+            "dim0": ("dim0", [0, 1]),
+            "dim0_0": ("dim0_0", [0, 1, 2, 3]),
+        },
+    )
+
+
+def test_calculate_pressure_on_levels(constants):
+    p_s = xr.DataArray([[100.0, 200.0]], dims=["time", "longitude"])
+
+    result = pressure.calculate_pressure_on_levels(p_s, constants=constants)
+
+    assert result.sizes == {"level": 3, "time": 1, "longitude": 2}
+    np.testing.assert_equal(result["level"].values, [1, 2, 3])
+    for level in (1, 2, 3):
+        expected = pressure.calculate_pressure(
+            p_s, constants=constants, model_level=level
+        )
+        xr.testing.assert_allclose(result.sel(level=level, drop=True), expected)
+
+
+def test_calculate_pressure_on_levels_subset(constants):
+    p_s = xr.DataArray([100.0], dims=["time"])
+
+    result = pressure.calculate_pressure_on_levels(
+        p_s, constants=constants, levels=[3, 1]
+    )
+
+    np.testing.assert_equal(result["level"].values, [3, 1])
+    np.testing.assert_allclose(result.values[:, 0], [6.0 + 50.0, 1.5 + 10.0])
+
+
+def test_get_level_coefficients_is_cached(constants):
+    first = pressure.get_level_coefficients(constants)
+    second = pressure.get_level_coefficients(constants)
+
+    assert first is second
+    assert not first[0].values.flags.writeable
+
+
+def test_calculate_pressure_on_levels_with_bundled_constants():
+    p_s = xr.DataArray([101325.0], dims=["time"])
+
+    result = pressure.calculate_pressure_on_levels(p_s, levels=[1, 137])
+
+    # Pressure increases from the top of the atmosphere to the surface.
+    assert 0.0 < result.sel(level=1).item() < 10.0
+    assert 100000.0 < result.sel(level=137).item() < 101325.0
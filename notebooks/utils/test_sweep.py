@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from . import sweep
+
+
+@pytest.fixture()
+def data() -> tuple[dict[str, xr.DataArray], xr.DataArray]:
+    times = pd.date_range("2020-01-01", periods=100, freq="1h")
+    turbines = [1, 2]
+    levels = [136, 137]
+    rng = np.random.default_rng(42)
+    wind_speed = xr.DataArray(
+        rng.uniform(0.0, 20.0, size=(len(turbines), len(levels), times.size)),
+        coords={"turbine": turbines, "level": levels, "time": times},
+        dims=["turbine", "level", "time"],
+    )
+    time_of_day = xr.DataArray(
+        (times.hour / 24).to_numpy(), coords={"time": times}, dims=["time"]
+    )
+    production = wind_speed.sel(level=137) ** 2
+    return {"wind_speed": wind_speed, "time_of_day": time_of_day}, production
+
+
+def test_create_jobs():
+    result = sweep.create_jobs(
+        feature_sets=[["wind_speed"], ["wind_speed", "time_of_day"]],
+        turbines=[1, 2],
+        levels=[136, 137],
+        hyperparameters=[{"fit_intercept": False}],
+    )
+
+    assert len(result) == 8
+    assert result[0] == sweep.Job(
+        features=("wind_speed",),
+        turbine=1,
+        level=136,
+        hyperparameters=(("fit_intercept", False),),
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_sweep(data, workers):
+    features, production = data
+    jobs = sweep.create_jobs(
+        # The power curve uses the wind speed in the second column.
+        feature_sets=[["time_of_day", "wind_speed"]],
+        turbines=[1, 2],
+        levels=[136, 137],
+        backends=["linear", "power_curve"],
+    )
+
+    result = sweep.run_sweep(jobs, data=features, target=production, workers=workers)
+
+    assert len(result) == len(jobs)
+    assert list(result["turbine"]) == [job.turbine for job in jobs]
+    assert (result["train_samples"] == 75).all()
+    assert (result["test_samples"] == 25).all()
+    assert {"mae", "rmse", "bias", "training_seconds"} <= set(result.columns)
+    # The production is derived from the wind speed on level 137, hence the
+    # power curve fits it best on that level.
+    power_curve = result[result["backend"] == "power_curve"]
+    by_level = power_curve.groupby("level")["mae"].mean()
+    assert by_level[137] < by_level[136]
@@ -1,5 +1,7 @@
 import datetime
 
+import numpy as np
+import pandas as pd
 import pytest
 import xarray as xr
 
@@ -53,3 +55,54 @@ def test_time_of_year(dt, expected):
     result_rounded = round(result, 2)
 
     assert result_rounded == expected
+
+
+@pytest.mark.parametrize(
+    ("dt", "expected"),
+    [
+        # 2020 is a leap year, 2021 is not.
+        (datetime.datetime(2020, 12, 31), 365 / 366),
+        (datetime.datetime(2021, 12, 31), 364 / 365),
+        (datetime.datetime(2021, 1, 1, 23), 0.0),
+    ],
+)
+def test_time_of_year_with_leap_years(dt, expected):
+    result = time._time_of_year(dt)
+
+    assert result == pytest.approx(expected)
+
+
+def test_get_time_features():
+    dates = pd.date_range("2020-01-01", "2020-01-02", freq="6h")
+    coordinate = xr.DataArray(dates, coords={"time": dates}, dims="time")
+
+    result = time.get_time_features(coordinate, cyclic=True)
+
+    np.testing.assert_allclose(
+        result["time_of_day"].values, [0.0, 0.25, 0.5, 0.75, 0.0]
+    )
+    np.testing.assert_allclose(
+        result["time_of_year"].values, [0.0, 0.0, 0.0, 0.0, 1 / 366]
+    )
+    np.testing.assert_allclose(
+        result["time_of_day_sin"].values, [0, 1, 0, -1, 0], atol=1e-12
+    )
+    np.testing.assert_allclose(
+        result["time_of_day_cos"].values, [1, 0, -1, 0, 1], atol=1e-12
+    )
+    assert set(result.data_vars) == {
+        "time_of_day",
+        "time_of_year",
+        "time_of_day_sin",
+        "time_of_day_cos",
+        "time_of_year_sin",
+        "time_of_year_cos",
+    }
+
+
+def test_get_time_of_day_from_datetime64():
+    dates = np.array(["2020-01-01T00", "2020-01-01T18"], dtype="datetime64[ns]")
+
+    result = time.get_time_of_day(dates)
+
+    np.testing.assert_allclose(result.values, [0.0, 0.75])
@@ -1,3 +1,4 @@
+import numpy as np
 import xarray as xr
 
 from . import wind
@@ -27,3 +28,31 @@ def test_calculate_wind_direction_angle():
     )
 
     xr.testing.assert_equal(result, expected)
+
+
+def test_calculate_wind_at_heights():
+    levels = np.arange(130, 138)
+    dims = ["time", "level", "latitude", "longitude"]
+    shape = (2, levels.size, 2, 2)
+    model_level_data = xr.Dataset(
+        {
+            "t": (dims, np.full(shape, 288.0)),
+            "q": (dims, np.zeros(shape)),
+            "u": (dims, np.full(shape, 3.0)),
+            "v": (dims, np.full(shape, 4.0)),
+        },
+        coords={"level": levels},
+    )
+    surface_data = xr.Dataset(
+        {"sp": (["time", "latitude", "longitude"], np.full((2, 2, 2), 101325.0))}
+    )
+
+    speed, direction = wind.calculate_wind_at_heights(
+        [80.0, 100.0, 120.0],
+        model_level_data=model_level_data,
+        surface_data=surface_data,
+    )
+
+    assert speed.sizes == {"time": 2, "latitude": 2, "longitude": 2, "height": 3}
+    np.testing.assert_allclose(speed.values, 5.0)
+    assert direction.dims == speed.dims
@@ -1,9 +1,11 @@
 import datetime
-from typing import Callable, List, Tuple
+from typing import List, Tuple, Union
 
 import numpy as np
 import xarray as xr
 
+Dates = Union[list[datetime.datetime], np.ndarray, xr.DataArray]
+
 
 def get_dates_from_time_coordinate(data: xr.Dataset) -> list[datetime.datetime]:
     """Get the time index/coordinate as a list of datetimes."""
@@ -11,7 +13,7 @@ def get_dates_from_time_coordinate(data: xr.Dataset) -> list[datetime.datetime]:
 
 
 def get_time_of_day_and_year(
-    dates: list[datetime.datetime], time_coord_name: str = "time"
+    dates: Dates, time_coord_name: str = "time"
 ) -> tuple[xr.DataArray, xr.DataArray]:
     """Calculate the time of day and year for given datetimes."""
     time_of_day = get_time_of_day(dates, time_coord_name=time_coord_name)
@@ -19,30 +21,76 @@ def get_time_of_day_and_year(
     return time_of_day, time_of_year
 
 
-def get_time_of_day(
-    dates: list[datetime.datetime], time_coord_name: str = "time"
-) -> xr.DataArray:
+def get_time_of_day(dates: Dates, time_coord_name: str = "time") -> xr.DataArray:
     """Calculate relative time of day for datetimes."""
-    converted = _apply_to_dates(_time_of_day, dates=dates)
     return xr.DataArray(
-        data=converted,
+        data=_time_of_day_phase(_to_datetime64(dates)),
         coords={time_coord_name: dates},
     )
 
 
-def get_time_of_year(
-    dates: list[datetime.datetime], time_coord_name: str = "time"
-) -> xr.DataArray:
+def get_time_of_year(dates: Dates, time_coord_name: str = "time") -> xr.DataArray:
     """Calculate relative time of year for datetimes."""
-    converted = _apply_to_dates(_time_of_year, dates=dates)
     return xr.DataArray(
-        data=converted,
+        data=_time_of_year_phase(_to_datetime64(dates)),
         coords={time_coord_name: dates},
     )
 
 
-def _apply_to_dates(func: Callable, dates: list[datetime.datetime]) -> np.ndarray:
-    return np.array(list(map(func, dates)))
+def get_time_features(time: xr.DataArray, cyclic: bool = False) -> xr.Dataset:
+    """Calculate the time of day and year features for a time coordinate.
+
+    The features are computed directly on the `datetime64` values of the
+    coordinate without converting them to Python datetimes.
+
+    Parameters
+    ----------
+    time : xarray.DataArray
+        Time coordinate, e.g. `data["time"]`.
+    cyclic : bool, default False
+        Whether to add the sine and cosine encodings of each feature,
+        which map the end of a day or year next to its start.
+
+    Returns
+    -------
+    xr.Dataset
+        The phases `time_of_day` and `time_of_year` (between 0 and 1) and,
+        if `cyclic`, their encodings `time_of_day_sin`, `time_of_day_cos`,
+        `time_of_year_sin` and `time_of_year_cos`.
+
+    """
+    values = _to_datetime64(time.values)
+    phases = {
+        "time_of_day": _time_of_day_phase(values),
+        "time_of_year": _time_of_year_phase(values),
+    }
+    features = {}
+    for name, phase in phases.items():
+        features[name] = phase
+        if cyclic:
+            angle = 2 * np.pi * phase
+            features[f"{name}_sin"] = np.sin(angle)
+            features[f"{name}_cos"] = np.cos(angle)
+    return xr.Dataset(
+        {name: (time.dims, values) for name, values in features.items()},
+        coords=time.coords,
+    )
+
+
+def _to_datetime64(dates: Dates) -> np.ndarray:
+    return np.asarray(dates, dtype="datetime64[ns]")
+
+
+def _time_of_day_phase(dates: np.ndarray) -> np.ndarray:
+    midnight = dates.astype("datetime64[D]")
+    return (dates - midnight) / np.timedelta64(1, "D")
+
+
+def _time_of_year_phase(dates: np.ndarray) -> np.ndarray:
+    start_of_year = dates.astype("datetime64[Y]")
+    days_since_start_of_year = dates.astype("datetime64[D]") - start_of_year
+    days_of_year = (start_of_year + 1) - start_of_year.astype("datetime64[D]")
+    return days_since_start_of_year / days_of_year
 
 
 def _time_of_day(dt: datetime.datetime) -> float:
@@ -51,9 +99,7 @@ def _time_of_day(dt: datetime.datetime) -> float:
     :param datetime.datetime dt: input datetime UTC
     :returns: `float` between 0 and 1 corresponding to the phase
     """
-    midnight = dt.replace(hour=0, minute=0, second=0, microsecond=0)
-    seconds_since_midnight = (dt - midnight).total_seconds()
-    return seconds_since_midnight / 86400
+    return float(_time_of_day_phase(_to_datetime64([dt]))[0])
 
 
 def _time_of_year(dt: datetime.datetime) -> float:
@@ -62,7 +108,7 @@ def _time_of_year(dt: datetime.datetime) -> float:
     :param datetime.datetime dt: input datetime (preferably UTC)
     :returns: `float` between 0 and 1 corresponding to the phase
 
-    This function makes a small mistake in leap years as it considers the length of the year to be 365d always.
+    The length of the year is 366 days in leap years and 365 days otherwise.
     """
     # Convert to UTC before
-    return (dt.timetuple().tm_yday - 1) / 365
+    return float(_time_of_year_phase(_to_datetime64([dt]))[0])
@@ -1,8 +1,11 @@
-from typing import Dict, Tuple
+from collections.abc import Sequence
+from typing import Dict, Optional, Tuple
 
 import numpy as np
 import xarray as xr
 
+from . import height
+
 
 def calculate_absolute_wind_speed_and_wind_direction(
     grid_point: dict[str, float],
@@ -41,6 +44,59 @@ def calculate_absolute_wind_speed_and_wind_direction(
     return absolute_wind_speed, wind_direction
 
 
+def calculate_wind_at_heights(
+    heights: Sequence[float],
+    model_level_data: xr.Dataset,
+    surface_data: xr.Dataset,
+    constants: Optional[xr.Dataset] = None,
+) -> tuple[xr.DataArray, xr.DataArray]:
+    """Calculate the absolute wind speed and wind direction at fixed heights.
+
+    The wind is interpolated from the model levels to the heights, e.g.
+    hub heights of wind turbines, for all grid points and time steps at
+    once (see `height.interpolate_to_heights`).
+
+    Parameters
+    ----------
+    heights : list[float]
+        Heights (m) above the surface, e.g. `[80, 100, 120]`.
+    model_level_data : xarray.Dataset
+        Model level data from the `maelstrom-weather-model-level` dataset.
+        Must contain the variables `t`, `q`, `u` and `v` on all levels from
+        the lowest level up to the highest level of interest.
+    surface_data : xarray.Dataset
+        Surface from the `maelstrom-weather-surface-level` dataset.
+    constants : xarray.Dataset, optional
+        Constants data from the `maelstrom-constants-a-b` dataset.
+        If `None`, the constants bundled with the plugin are used.
+
+    Returns
+    -------
+    Tuple[xr.DataArray, xr.DataArray]
+        Absolute wind speed and wind direction (angle relative to longitude)
+        with the dimension `height`.
+
+    """
+    level_heights = height.calculate_level_heights(
+        temperature=model_level_data["t"],
+        specific_humidity=model_level_data["q"],
+        surface_pressure=surface_data["sp"],
+        constants=constants,
+    )
+    wind = height.interpolate_to_heights(
+        model_level_data,
+        level_heights=level_heights,
+        heights=heights,
+        variables=["u", "v"],
+    )
+    absolute_wind_speed = calculate_absolute_wind_speed(wind["u"], wind["v"])
+    wind_direction = calculate_wind_direction_angle(
+        wind_speed_east=wind["u"],
+        wind_speed_north=wind["v"],
+    )
+    return absolute_wind_speed, wind_direction
+
+
 def calculate_absolute_wind_speed(
     wind_speed_east: xr.DataArray, wind_speed_north: xr.DataArray
 ) -> xr.DataArray:
@@ -0,0 +1,4 @@
+from climetlab_maelstrom_power_production.testing.fixtures import (  # noqa: F401
+    object_store,
+    object_store_directory,
+)
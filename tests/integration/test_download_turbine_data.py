@@ -1,9 +1,26 @@
 import climetlab as cml
 import pytest
 
+from climetlab_maelstrom_power_production import config
 
+
+@pytest.mark.parametrize("wind_turbine_id", [1, 2, 3, 4])
+def test_download_turbine_data(wind_turbine_id, object_store):
+    response = cml.load_dataset(
+        "maelstrom-power-production", wind_turbine_id=wind_turbine_id
+    )
+    result = response.to_dataframe()
+
+    assert "production" in result.columns
+    assert "wind_speed" in result.columns
+    assert object_store.requests >= 1
+
+
+@pytest.mark.remote
 @pytest.mark.parametrize("wind_turbine_id", [1, 2, 3, 4])
-def test_download_turbine_data(wind_turbine_id):
+def test_download_turbine_data_from_remote_store(wind_turbine_id, monkeypatch):
+    monkeypatch.delenv(config.URL_ENVIRONMENT_VARIABLE, raising=False)
+
     response = cml.load_dataset(
         "maelstrom-power-production", wind_turbine_id=wind_turbine_id
     )
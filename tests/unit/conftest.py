@@ -0,0 +1,20 @@
+import pytest
+
+from climetlab_maelstrom_power_production.testing import server
+from climetlab_maelstrom_power_production.testing.fixtures import (  # noqa: F401
+    object_store,
+    object_store_directory,
+)
+
+
+@pytest.fixture()
+def http_server(tmp_path):
+    """Serve the files in a temporary directory via HTTP.
+
+    Yields the served directory and the URL of the server.
+
+    """
+    directory = tmp_path / "server"
+    directory.mkdir()
+    with server.ObjectStore(str(directory)) as store:
+        yield directory, store.url
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+import xarray as xr
+
+from climetlab_maelstrom_power_production.constants import a_b, l137
+
+
+class FakeSource:
+    def __init__(self, data: xr.Dataset):
+        self.data = data
+
+    def to_xarray(self) -> xr.Dataset:
+        return self.data
+
+
+def test_get_table():
+    table = l137.get_table()
+
+    assert table.shape == (2, l137.NUMBER_OF_LEVELS + 1)
+    assert not table.flags.writeable
+    assert l137.get_table() is table
+    # A vanishes at the surface, B at the top of the atmosphere.
+    assert table[0, -1] == 0.0
+    assert table[1, 0] == 0.0
+    assert table[1, -1] == 1.0
+    assert np.all(np.diff(table[1]) >= 0)
+
+
+def test_ab_constants_to_xarray():
+    result = a_b.ABConstants().to_xarray()
+
+    assert result.sizes == {"dim0": 1, "dim0_0": 138}
+    np.testing.assert_equal(result["hyam"].values[0], l137.A)
+    np.testing.assert_equal(result["hybm"].values[0], l137.B)
+
+
+def test_ab_constants_without_download():
+    dataset = a_b.ABConstants()
+
+    result = dataset.to_pandas()
+
+    assert len(dataset) == l137.NUMBER_OF_LEVELS + 1
+    assert len(result) == l137.NUMBER_OF_LEVELS + 1
+    np.testing.assert_equal(result["hybm"].values, l137.B)
+
+
+def test_ab_constants_verify(monkeypatch):
+    remote = a_b.to_xarray()
+    monkeypatch.setattr(a_b.ABConstants, "_get_data", lambda self: FakeSource(remote))
+
+    a_b.ABConstants(verify=True)
+
+
+def test_ab_constants_verify_fails_for_different_values(monkeypatch):
+    remote = a_b.to_xarray()
+    remote["hybm"] = remote["hybm"] * 2
+    monkeypatch.setattr(a_b.ABConstants, "_get_data", lambda self: FakeSource(remote))
+
+    with pytest.raises(ValueError):
+        a_b.ABConstants(verify=True)
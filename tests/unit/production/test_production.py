@@ -0,0 +1,96 @@
+from contextlib import nullcontext as doesnotraise
+
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from climetlab_maelstrom_power_production import config
+from climetlab_maelstrom_power_production.production import merger, production
+
+
+def create_production_file(path, wind_turbine_id: int, start: str) -> None:
+    time = pd.date_range(start, periods=6, freq="10min")
+    dataset = xr.Dataset(
+        data_vars={
+            "production": (
+                ["time", "latitude", "longitude"],
+                np.full((time.size, 1, 1), float(wind_turbine_id)),
+            ),
+        },
+        coords={
+            "time": time,
+            "latitude": [50.0 + wind_turbine_id],
+            "longitude": [10.0 + wind_turbine_id],
+        },
+        attrs={"power rating [kW]": 1000 * wind_turbine_id},
+    )
+    dataset.to_netcdf(path)
+
+
+@pytest.mark.parametrize(
+    ("wind_turbine_id", "expected"),
+    [
+        (1, 1),
+        ("2", 2),
+        ([1, 3], [1, 3]),
+        ([4], [4]),
+        ((2,), [2]),
+        ("all", [1, 2, 3, 4]),
+        (0, ValueError()),
+        ([1, 5], ValueError()),
+        ([], ValueError()),
+    ],
+)
+def test_convert_wind_turbine_ids(wind_turbine_id, expected):
+    with pytest.raises(type(expected)) if isinstance(
+        expected, Exception
+    ) else doesnotraise():
+        result = production._convert_wind_turbine_ids(wind_turbine_id)
+
+        assert result == expected
+
+
+def test_production_merger(tmp_path):
+    paths = [tmp_path / "wind_turbine_1.nc", tmp_path / "wind_turbine_3.nc"]
+    create_production_file(paths[0], 1, start="2020-01-01T00:00")
+    create_production_file(paths[1], 3, start="2020-01-01T00:30")
+    production_merger = merger.ProductionMerger(wind_turbine_ids=[1, 3])
+
+    result = production_merger.to_xarray(paths)
+
+    assert dict(result["production"].sizes) == {"turbine": 2, "time": 9}
+    np.testing.assert_equal(result["turbine"].values, [1, 3])
+    np.testing.assert_equal(result["longitude"].values, [11.0, 13.0])
+    np.testing.assert_equal(result["latitude"].values, [51.0, 53.0])
+    np.testing.assert_equal(result["power rating [kW]"].values, [1000.0, 3000.0])
+    np.testing.assert_equal(
+        result["production"].sel(turbine=3).values[:3], [np.nan] * 3
+    )
+
+
+@pytest.mark.parametrize(
+    ("wind_turbine_id", "expected"), [("all", [1, 2, 3, 4]), ([2], [2])]
+)
+def test_production_with_multiple_wind_turbines(
+    tmp_path, http_server, monkeypatch, wind_turbine_id, expected
+):
+    directory, url = http_server
+    (directory / "maelstrom-ap6" / "production_data").mkdir(parents=True)
+    for i in range(1, 5):
+        create_production_file(
+            directory / "maelstrom-ap6" / "production_data" / f"wind_turbine_{i}.nc",
+            i,
+            start="2020-01-01",
+        )
+    monkeypatch.setattr(config, "ECMWF_CLOUD_URL", url)
+    monkeypatch.setattr(
+        production.Production, "download_directory", str(tmp_path / "downloads")
+    )
+
+    dataset = production.Production(wind_turbine_id=wind_turbine_id)
+    result = dataset.to_xarray()
+
+    assert dataset.download_workers == len(expected)
+    np.testing.assert_equal(result["turbine"].values, expected)
+    np.testing.assert_equal(result["production"].isel(time=0).values, expected)
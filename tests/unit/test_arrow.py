@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+import xarray as xr
+
+from climetlab_maelstrom_power_production import arrow
+
+
+@pytest.fixture()
+def dataset():
+    time = pd.date_range("2020-01-31T12", periods=24, freq="1h")
+    level = [136, 137]
+    shape = (time.size, len(level))
+    return xr.Dataset(
+        data_vars={
+            "t": (["time", "level"], np.arange(48, dtype=np.float64).reshape(shape)),
+            "sp": (["time"], np.ones(time.size)),
+        },
+        coords={
+            "time": time,
+            "level": level,
+            "step": ("time", pd.to_timedelta(np.arange(24), unit="h")),
+        },
+    )
+
+
+def test_to_table(dataset):
+    result = arrow.to_table(
+        dataset, constant_columns={"turbine": 1}, time_columns=["month"]
+    )
+    expected = dataset.to_dataframe().reset_index()
+
+    assert result.num_rows == 48
+    assert pa.types.is_dictionary(result.schema.field("time").type)
+    assert pa.types.is_dictionary(result.schema.field("level").type)
+    assert pa.types.is_dictionary(result.schema.field("turbine").type)
+    assert result.schema.field("t").type == pa.float32()
+    assert result.column("month").to_pylist() == [1] * 24 + [2] * 24
+    assert set(result.column("turbine").to_pylist()) == {1}
+    actual = result.to_pandas()
+    for name in ["time", "level", "step", "t", "sp"]:
+        np.testing.assert_equal(np.asarray(actual[name]), expected[name].to_numpy())
+
+
+@pytest.mark.parametrize(
+    ("partition_by", "expected_directories"),
+    [
+        (["year", "month"], {"year=2020"}),
+        (["level"], {"level=136", "level=137"}),
+        (None, set()),
+    ],
+)
+def test_write_parquet(tmp_path, dataset, partition_by, expected_directories):
+    path = tmp_path / "parquet"
+
+    arrow.write_parquet(dataset, path=str(path), partition_by=partition_by)
+    result = pq.read_table(path)
+
+    assert {p.name for p in path.iterdir() if p.is_dir()} == expected_directories
+    assert result.num_rows == 48
+    assert sorted(result.column("t").to_pylist()) == list(range(48))
+
+
+def test_write_parquet_with_predicate_pushdown(tmp_path, dataset):
+    path = tmp_path / "parquet"
+
+    arrow.write_parquet(dataset, path=str(path), partition_by=["month"])
+    result = pq.read_table(path, filters=[("month", "=", 2)])
+
+    assert result.num_rows == 24
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from climetlab_maelstrom_power_production import batches
+
+
+@pytest.fixture()
+def dataset():
+    return xr.Dataset(
+        data_vars={
+            "t": (["level", "time"], np.arange(20, dtype=np.float64).reshape(2, 10)),
+            "sp": (["time"], np.arange(10, dtype=np.int64)),
+            "constant": (["level"], [1.0, 2.0]),
+        },
+    ).chunk({"time": 3})
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_iterate_batches(dataset, prefetch):
+    result = list(
+        batches.iterate_batches(dataset, dim="time", batch_size=4, prefetch=prefetch)
+    )
+
+    assert [batch["t"].shape for batch in result] == [(4, 2), (4, 2), (2, 2)]
+    assert all(set(batch) == {"t", "sp"} for batch in result)
+    for batch in result:
+        for values in batch.values():
+            assert values.dtype == np.float32
+            assert values.flags["C_CONTIGUOUS"]
+    np.testing.assert_equal(result[0]["t"], [[0, 10], [1, 11], [2, 12], [3, 13]])
+    np.testing.assert_equal(np.concatenate([b["sp"] for b in result]), np.arange(10))
+
+
+def test_iterate_batches_with_drop_remainder_and_variables(dataset):
+    result = list(
+        batches.iterate_batches(
+            dataset,
+            dim="time",
+            batch_size=4,
+            variables=["sp"],
+            drop_remainder=True,
+        )
+    )
+
+    assert [set(batch) for batch in result] == [{"sp"}, {"sp"}]
+    assert [batch["sp"].shape for batch in result] == [(4,), (4,)]
+
+
+def test_iterate_batches_stops_early(dataset):
+    iterator = batches.iterate_batches(dataset, dim="time", batch_size=1, prefetch=1)
+
+    first = next(iterator)
+    iterator.close()
+
+    np.testing.assert_equal(first["sp"], [0])
+
+
+def test_iterate_batches_raises_errors_of_background_thread(dataset):
+    dataset = dataset.assign(broken=dataset["sp"].astype(object))
+    dataset["broken"][3] = "invalid"
+
+    with pytest.raises(ValueError):
+        list(batches.iterate_batches(dataset, dim="time", batch_size=2))
+
+
+def test_iterate_batches_with_invalid_batch_size(dataset):
+    with pytest.raises(ValueError):
+        batches.iterate_batches(dataset, dim="time", batch_size=0)
+
+
+def test_get_batch_shapes(dataset):
+    result = batches.get_batch_shapes(dataset, dim="time")
+
+    assert result == {"t": (2,), "sp": ()}
+
+
+@pytest.fixture()
+def hourly_dataset():
+    time = pd.date_range("2020-01-01T12", periods=36, freq="1h")
+    # Two model runs: 12:00 for 12 hours, 00:00 for 24 hours
+    step = pd.to_timedelta(np.concatenate([np.arange(12), np.arange(24)]), unit="h")
+    return xr.Dataset(
+        data_vars={"sp": (["time", "latitude"], np.ones((36, 2)))},
+        coords={"time": time, "step": ("time", step), "latitude": [1.0, 2.0]},
+    )
+
+
+@pytest.mark.parametrize(
+    ("by", "expected"),
+    [
+        ("day", [12, 24]),
+        ("file", [12, 24]),
+        (10, [10, 10, 10, 6]),
+    ],
+)
+def test_iterate_dataframes(hourly_dataset, by, expected):
+    result = list(batches.iterate_dataframes(hourly_dataset, dim="time", by=by))
+
+    assert [len(dataframe) // 2 for dataframe in result] == expected
+    pd.testing.assert_frame_equal(
+        pd.concat(result), hourly_dataset.to_dataframe(), check_freq=False
+    )
+
+
+def test_iterate_dataframes_per_file_without_lead_time(hourly_dataset):
+    result = list(
+        batches.iterate_dataframes(
+            hourly_dataset.drop_vars("step"), dim="time", by="file"
+        )
+    )
+
+    assert len(result) == 1
+
+
+@pytest.mark.parametrize("by", ["week", 0])
+def test_iterate_dataframes_with_invalid_parts(hourly_dataset, by):
+    with pytest.raises(ValueError):
+        list(batches.iterate_dataframes(hourly_dataset, dim="time", by=by))
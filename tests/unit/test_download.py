@@ -0,0 +1,123 @@
+import os
+
+import pytest
+import xarray as xr
+
+from climetlab_maelstrom_power_production import config, download
+from climetlab_maelstrom_power_production.production import production
+
+
+@pytest.fixture()
+def served_files(http_server):
+    directory, url = http_server
+    (directory / "maelstrom-ap6").mkdir()
+    files = {
+        f"maelstrom-ap6/file_{i}.nc": bytes([i]) * 1000 * (i + 1) for i in range(5)
+    }
+    for name, content in files.items():
+        (directory / name).write_bytes(content)
+    return url, files
+
+
+def test_downloader(tmp_path, served_files):
+    url, files = served_files
+    progresses = []
+    downloader = download.Downloader(
+        directory=str(tmp_path / "downloads"),
+        workers=3,
+        progress=progresses.append,
+        chunk_size=512,
+    )
+
+    urls = [f"{url}/{name}" for name in files]
+
+    result = downloader.download(urls)
+
+    host = url.split("://")[1].replace(":", "_")
+    assert result == [str(tmp_path / "downloads" / host / name) for name in files]
+    for path, content in zip(result, files.values()):
+        with open(path, "rb") as file:
+            assert file.read() == content
+    assert downloader.statistics.files == 5
+    assert downloader.statistics.bytes == sum(map(len, files.values()))
+    assert downloader.statistics.throughput > 0
+    assert {progress.url for progress in progresses if progress.done} == set(urls)
+    assert all(progress.fraction == 1.0 for progress in progresses)
+
+
+def test_downloader_skips_existing_files(tmp_path, served_files):
+    url, files = served_files
+    urls = [f"{url}/{name}" for name in files]
+    downloader = download.Downloader(directory=str(tmp_path / "downloads"))
+    downloader.download(urls)
+
+    downloader = download.Downloader(directory=str(tmp_path / "downloads"))
+    downloader.download(urls)
+
+    assert downloader.statistics.cached_files == 5
+    assert downloader.statistics.bytes == 0
+
+
+def test_downloader_with_missing_file(tmp_path, served_files):
+    url, _ = served_files
+    downloader = download.Downloader(directory=str(tmp_path / "downloads"))
+
+    missing = f"{url}/maelstrom-ap6/missing.nc"
+
+    with pytest.raises(download.DownloadFailedException):
+        downloader.download([missing])
+
+    assert not os.path.exists(downloader.get_path(missing))
+
+
+def test_downloader_ignores_missing_file(tmp_path, served_files):
+    url, files = served_files
+    urls = [f"{url}/{name}" for name in files]
+    missing = f"{url}/maelstrom-ap6/missing.nc"
+    downloader = download.Downloader(
+        directory=str(tmp_path / "downloads"), ignore_missing=True
+    )
+
+    result = downloader.download([missing, *urls])
+
+    assert result == [downloader.get_path(url) for url in urls]
+    assert downloader.missing == [missing]
+
+
+def test_get_path_includes_host(tmp_path):
+    downloader = download.Downloader(directory=str(tmp_path))
+    name = "maelstrom-ap6/ml_20200101_00.nc"
+
+    remote = downloader.get_path(f"https://example.com/{name}")
+    local = downloader.get_path(f"http://127.0.0.1:8000/{name}")
+
+    assert remote == str(
+        tmp_path / "example.com" / "maelstrom-ap6" / "ml_20200101_00.nc"
+    )
+    assert local == str(
+        tmp_path / "127.0.0.1_8000" / "maelstrom-ap6" / "ml_20200101_00.nc"
+    )
+
+
+def test_downloader_with_invalid_number_of_workers(tmp_path):
+    with pytest.raises(ValueError):
+        download.Downloader(directory=str(tmp_path), workers=0)
+
+
+def test_dataset_with_download_workers(tmp_path, http_server, monkeypatch):
+    directory, url = http_server
+    (directory / "maelstrom-ap6" / "production_data").mkdir(parents=True)
+    expected = xr.Dataset({"production": ("time", [1.0, 2.0])})
+    expected.to_netcdf(
+        directory / "maelstrom-ap6" / "production_data" / "wind_turbine_1.nc"
+    )
+    monkeypatch.setattr(config, "ECMWF_CLOUD_URL", url)
+    monkeypatch.setattr(
+        production.Production, "download_directory", str(tmp_path / "downloads")
+    )
+
+    dataset = production.Production(wind_turbine_id=1, download_workers=2)
+    result = dataset.to_xarray()
+
+    xr.testing.assert_equal(result, expected)
+    assert dataset.download_statistics.files == 1
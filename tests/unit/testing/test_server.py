@@ -0,0 +1,136 @@
+import os
+import time
+import urllib.request
+
+import numpy as np
+import pytest
+
+from climetlab_maelstrom_power_production import config, download
+from climetlab_maelstrom_power_production.production import production
+from climetlab_maelstrom_power_production.testing import server
+from climetlab_maelstrom_power_production.weather import model_level
+
+SIZE = 100_000
+
+
+@pytest.fixture()
+def served_file(tmp_path):
+    directory = tmp_path / "server"
+    (directory / "maelstrom-ap6").mkdir(parents=True)
+    (directory / "maelstrom-ap6" / "file.nc").write_bytes(b"x" * SIZE)
+    return str(directory), "maelstrom-ap6/file.nc"
+
+
+def test_object_store_serves_files(tmp_path, served_file):
+    directory, name = served_file
+
+    with server.ObjectStore(directory) as store:
+        [path] = download.Downloader(str(tmp_path / "downloads")).download(
+            [f"{store.url}/{name}"]
+        )
+
+    assert os.path.getsize(path) == SIZE
+    assert store.requests == 1
+    assert store.bytes_sent == SIZE
+    assert store.failures == 0
+
+
+def test_object_store_with_latency_and_bandwidth(served_file):
+    directory, name = served_file
+
+    with server.ObjectStore(directory, latency=0.1, bandwidth=SIZE / 0.2) as store:
+        start = time.monotonic()
+        with urllib.request.urlopen(f"{store.url}/{name}") as response:
+            content = response.read()
+        elapsed = time.monotonic() - start
+
+    assert len(content) == SIZE
+    assert elapsed >= 0.25
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"failure_rate": 1.0},
+        {"failure_rate": 1.0, "failure_status": 404},
+        {"truncation_rate": 1.0},
+    ],
+)
+def test_object_store_with_failures(tmp_path, served_file, options):
+    directory, name = served_file
+
+    with server.ObjectStore(directory, **options) as store:
+        downloader = download.Downloader(str(tmp_path / "downloads"))
+        with pytest.raises(download.DownloadFailedException):
+            downloader.download([f"{store.url}/{name}"])
+
+    assert store.failures == 1
+    assert not any(files for _, _, files in os.walk(tmp_path / "downloads"))
+
+
+def test_object_store_with_random_failures_is_reproducible(served_file):
+    directory, name = served_file
+
+    def get_failures() -> list[bool]:
+        failed = []
+        with server.ObjectStore(directory, failure_rate=0.5, seed=1) as store:
+            for _ in range(20):
+                try:
+                    urllib.request.urlopen(f"{store.url}/{name}").close()
+                    failed.append(False)
+                except urllib.error.HTTPError as e:
+                    assert e.code == 503
+                    failed.append(True)
+        return failed
+
+    first = get_failures()
+
+    assert first == get_failures()
+    assert 0 < sum(first) < 20
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{"bandwidth": 0}, {"failure_rate": 1.5}, {"truncation_rate": -0.1}],
+)
+def test_object_store_with_invalid_options(tmp_path, options):
+    with pytest.raises(ValueError):
+        server.ObjectStore(str(tmp_path), **options)
+
+
+def test_get_base_url(monkeypatch):
+    monkeypatch.delenv(config.URL_ENVIRONMENT_VARIABLE, raising=False)
+    assert config.get_base_url() == config.ECMWF_CLOUD_URL
+
+    monkeypatch.setenv(config.URL_ENVIRONMENT_VARIABLE, "http://localhost:8000/")
+    assert config.get_base_url() == "http://localhost:8000"
+
+
+@pytest.mark.parametrize("object_store", [{"latency": 0.01}], indirect=True)
+def test_production_from_object_store(tmp_path, object_store, monkeypatch):
+    monkeypatch.setattr(
+        production.Production, "download_directory", str(tmp_path / "downloads")
+    )
+
+    dataset = production.Production(wind_turbine_id="all")
+    result = dataset.to_xarray()
+
+    np.testing.assert_equal(result["turbine"].values, [1, 2, 3, 4])
+    assert {"production", "wind_speed"} <= set(result.data_vars)
+    assert object_store.requests == 4
+    assert dataset.download_statistics.bytes == object_store.bytes_sent
+
+
+def test_weather_from_object_store(tmp_path, object_store, monkeypatch):
+    monkeypatch.setattr(
+        model_level.ModelLevelWeather,
+        "download_directory",
+        str(tmp_path / "downloads"),
+    )
+
+    result = model_level.ModelLevelWeather(
+        date=["2020-01-01", "2020-01-02"], download_workers=2
+    ).to_xarray()
+
+    assert result.sizes["time"] == 4 * 12
+    assert object_store.requests == 4
@@ -0,0 +1,98 @@
+import os
+
+import numpy as np
+import pytest
+import xarray as xr
+
+from climetlab_maelstrom_power_production.constants import a_b
+from climetlab_maelstrom_power_production.production import merger as production_merger
+from climetlab_maelstrom_power_production.testing import synthetic
+from climetlab_maelstrom_power_production.weather import merger as weather_merger
+
+
+@pytest.fixture(scope="module")
+def paths(tmp_path_factory):
+    return synthetic.create_dataset(
+        str(tmp_path_factory.mktemp("store")),
+        days=2,
+        longitudes=4,
+        latitudes=3,
+        wind_turbines=2,
+    )
+
+
+def test_create_dataset_layout(paths):
+    names = {
+        type: [os.path.basename(path) for path in type_paths]
+        for type, type_paths in paths.items()
+    }
+
+    assert names["ml"] == [
+        "ml_20200101_00.nc",
+        "ml_20200101_12.nc",
+        "ml_20200102_00.nc",
+        "ml_20200102_12.nc",
+    ]
+    assert names["sfc"][0] == "sfc_20200101_00.nc"
+    assert names["production"] == ["wind_turbine_1.nc", "wind_turbine_2.nc"]
+    assert names["constants"] == ["ECMWF_AB137.nc"]
+    assert all(
+        os.path.basename(os.path.dirname(path)) == "maelstrom-ap6"
+        for path in paths["ml"] + paths["constants"]
+    )
+    assert os.path.basename(os.path.dirname(paths["production"][0])) == (
+        "production_data"
+    )
+
+
+@pytest.mark.parametrize(
+    ("type", "dims", "variables"),
+    [
+        ("ml", ("time", "level", "latitude", "longitude"), {"t", "q", "u", "v"}),
+        ("pl", ("time", "level", "latitude", "longitude"), {"t", "q", "u", "v", "z"}),
+        ("sfc", ("time", "latitude", "longitude"), {"sp", "t2m", "u10", "v10"}),
+    ],
+)
+def test_create_weather_file(paths, type, dims, variables):
+    with xr.open_dataset(paths[type][0]) as result:
+        assert set(result.data_vars) == variables
+        assert result["t" if type != "sfc" else "sp"].dims == dims
+        assert result.sizes["time"] == synthetic.FORECAST_HOURS
+        assert result.sizes["longitude"] == 4
+        assert result.sizes["latitude"] == 3
+        assert np.all(np.diff(result["latitude"].values) < 0)
+
+
+def test_create_weather_file_with_unknown_type(tmp_path):
+    with pytest.raises(ValueError):
+        synthetic.create_weather_file(
+            str(tmp_path / "x.nc"),
+            type="x",
+            init_time="2020-01-01",
+            longitudes=np.array([10.0]),
+            latitudes=np.array([50.0]),
+        )
+
+
+def test_weather_files_are_merged(paths):
+    result = weather_merger.WeatherMerger().to_xarray(paths["ml"])
+
+    # Four model runs, each used for the 12 hours until the next run.
+    assert result.sizes["time"] == 4 * 12
+    np.testing.assert_equal(np.diff(result["time"].values), np.timedelta64(1, "h"))
+    assert result.sizes["level"] == len(synthetic.DEFAULT_MODEL_LEVELS)
+
+
+def test_production_files_are_merged(paths):
+    result = production_merger.ProductionMerger(wind_turbine_ids=[1, 2]).to_xarray(
+        paths["production"]
+    )
+
+    assert dict(result["production"].sizes) == {"turbine": 2, "time": 2 * 24 * 6}
+    np.testing.assert_equal(result[production_merger.POWER_RATING].values, 2000.0)
+    assert set(result.data_vars) == {"production", "wind_speed", "regulation", "status"}
+
+
+def test_constants_file(paths):
+    with xr.open_dataset(paths["constants"][0]) as result:
+        a_b.ABConstants._verify(result)
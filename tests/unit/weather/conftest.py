@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+FORECAST_HOURS = 48
+
+
+def _create_weather_file(path, init_time: str, value: float = 0.0) -> str:
+    """Create a file with the layout of the model level data.
+
+    Each file holds a 48-hour forecast starting at `init_time` where all
+    values equal `value`.
+
+    """
+    time = pd.date_range(init_time, periods=FORECAST_HOURS, freq="1h")
+    level = np.arange(1, 4)
+    latitude = np.array([52.0, 51.9, 51.8])
+    longitude = np.array([10.0, 10.1, 10.2, 10.3])
+    shape = (time.size, level.size, latitude.size, longitude.size)
+    dims = ["time", "level", "latitude", "longitude"]
+    dataset = xr.Dataset(
+        data_vars={
+            name: (dims, np.full(shape, value, dtype=np.float32))
+            for name in ["t", "q", "u", "v"]
+        },
+        coords={
+            "time": time,
+            "level": level,
+            "latitude": latitude,
+            "longitude": longitude,
+        },
+    )
+    dataset.to_netcdf(path)
+    return str(path)
+
+
+@pytest.fixture()
+def create_weather_file():
+    return _create_weather_file
+
+
+@pytest.fixture()
+def weather_files(tmp_path):
+    return [
+        _create_weather_file(tmp_path / "ml_20200101_00.nc", "2020-01-01T00", 0.0),
+        _create_weather_file(tmp_path / "ml_20200101_12.nc", "2020-01-01T12", 1.0),
+        _create_weather_file(tmp_path / "ml_20200102_00.nc", "2020-01-02T00", 2.0),
+        _create_weather_file(tmp_path / "ml_20200102_12.nc", "2020-01-02T12", 3.0),
+    ]
@@ -3,7 +3,8 @@ from datetime import datetime
 
 import pytest
 
-from climetlab_maelstrom_power_production.weather import abc
+from climetlab_maelstrom_power_production import config
+from climetlab_maelstrom_power_production.weather import abc, model_level
 
 
 @pytest.mark.parametrize(
@@ -66,3 +67,77 @@ def test_date_is_available(date, expected):
     result = abc._date_is_available(date)
 
     assert result == expected
+
+
+@pytest.mark.parametrize(
+    ("selections", "expected"),
+    [
+        ({"area": None, "grid_points": None}, None),
+        ({"area": (52.0, 10.0, 51.0, 11.0), "grid_points": None}, None),
+        ({"area": (51.0, 10.0, 52.0, 11.0), "grid_points": None}, ValueError()),
+        (
+            {"area": (52.0, 10.0, 51.0, 11.0), "grid_points": [(10.0, 51.0)]},
+            ValueError(),
+        ),
+    ],
+)
+def test_check_spatial_selection(selections, expected):
+    with pytest.raises(type(expected)) if isinstance(
+        expected, Exception
+    ) else doesnotraise():
+        result = abc._check_spatial_selection(**selections)
+
+        assert result == expected
+
+
+def test_weather_with_download_workers(
+    tmp_path, http_server, create_weather_file, monkeypatch
+):
+    directory, url = http_server
+    (directory / "maelstrom-ap6").mkdir()
+    for value, init_time in enumerate(["20200101_00", "20200101_12"]):
+        create_weather_file(
+            directory / "maelstrom-ap6" / f"ml_{init_time}.nc",
+            init_time=f"{init_time[:8]}T{init_time[-2:]}",
+            value=value,
+        )
+    monkeypatch.setattr(config, "ECMWF_CLOUD_URL", url)
+    monkeypatch.setattr(
+        model_level.ModelLevelWeather, "download_directory", str(tmp_path / "cache")
+    )
+
+    dataset = model_level.ModelLevelWeather(
+        date="2020-01-01", variables=["t"], download_workers=2
+    )
+    result = dataset.to_xarray()
+
+    assert dataset.download_statistics.files == 2
+    assert result.sizes["time"] == 24
+    assert set(result.data_vars) == {"t"}
+
+
+def test_weather_with_missing_run(
+    tmp_path, http_server, create_weather_file, monkeypatch
+):
+    directory, url = http_server
+    (directory / "maelstrom-ap6").mkdir()
+    # Only the first of the two runs is available, the other returns 404.
+    create_weather_file(
+        directory / "maelstrom-ap6" / "ml_20200101_00.nc", init_time="20200101T00"
+    )
+    monkeypatch.setattr(config, "ECMWF_CLOUD_URL", url)
+    monkeypatch.setattr(
+        model_level.ModelLevelWeather, "download_directory", str(tmp_path / "cache")
+    )
+
+    dataset = model_level.ModelLevelWeather(
+        date="2020-01-01", variables=["t"], download_workers=2
+    )
+    result = dataset.to_xarray()
+
+    assert dataset.download_statistics.files == 1
+    # The single file is still merged: variables are selected, the lead time
+    # is assigned and only the 12 hours until the next run are kept.
+    assert set(result.data_vars) == {"t"}
+    assert "step" in result.coords
+    assert result.sizes["time"] == 12
@@ -0,0 +1,218 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+from xarray.backends import netCDF4_
+
+from climetlab_maelstrom_power_production.weather import merger
+
+
+def test_to_xarray(weather_files):
+    weather_merger = merger.WeatherMerger()
+
+    result = weather_merger.to_xarray(weather_files)
+    values = result["t"].isel(level=0, latitude=0, longitude=0).values
+
+    # Each of the 4 model runs is the most recent one for 12 hours.
+    expected_values = np.repeat([0.0, 1.0, 2.0, 3.0], 12)
+    expected_steps = np.tile(np.arange(12), 4).astype("timedelta64[h]")
+    assert result.sizes["time"] == 48
+    np.testing.assert_equal(values, expected_values)
+    np.testing.assert_equal(result["step"].values, expected_steps)
+    np.testing.assert_equal(
+        result["time"].values, pd.date_range("2020-01-01", periods=48, freq="1h")
+    )
+
+
+def test_to_xarray_with_missing_model_run(weather_files):
+    weather_merger = merger.WeatherMerger()
+
+    result = weather_merger.to_xarray(weather_files[:1] + weather_files[2:])
+    values = result["t"].isel(level=0, latitude=0, longitude=0).values
+
+    # The missing run is replaced by the older run at longer lead times.
+    expected_values = np.repeat([0.0, 0.0, 2.0, 3.0], 12)
+    expected_steps = np.concatenate([np.arange(24), np.arange(12), np.arange(12)])
+    assert result.sizes["time"] == 48
+    np.testing.assert_equal(values, expected_values)
+    np.testing.assert_equal(result["step"].values, expected_steps.astype("m8[h]"))
+
+
+@pytest.mark.parametrize(
+    ("runs", "expected"),
+    [
+        # Each run is read for the 12 hours it is the most recent one.
+        ([0, 1, 2, 3], [12, 12, 12, 12]),
+        # The run before a missing run is read for 24 hours.
+        ([0, 2, 3], [24, 12, 12]),
+    ],
+)
+def test_to_xarray_reads_only_stitched_time_steps(
+    weather_files, monkeypatch, runs, expected
+):
+    read = {}
+    getitem = netCDF4_.NetCDF4ArrayWrapper._getitem
+
+    def count_time_steps(wrapper, key):
+        values = getitem(wrapper, key)
+        if wrapper.variable_name == "t":
+            path = wrapper.datastore._filename
+            read[path] = read.get(path, 0) + values.shape[0]
+        return values
+
+    monkeypatch.setattr(netCDF4_.NetCDF4ArrayWrapper, "_getitem", count_time_steps)
+    paths = [weather_files[run] for run in runs]
+
+    merger.WeatherMerger().to_xarray(paths)["t"].load()
+
+    assert [read.get(path, 0) for path in paths] == expected
+
+
+def test_to_xarray_warns_about_gaps(tmp_path, weather_files, create_weather_file):
+    path = create_weather_file(tmp_path / "ml_20200105_00.nc", "2020-01-05T00")
+    weather_merger = merger.WeatherMerger()
+
+    with pytest.warns(UserWarning, match="gaps"):
+        result = weather_merger.to_xarray(weather_files[:1] + [path])
+
+    assert result.sizes["time"] == 60
+
+
+def test_to_xarray_with_zarr_store(tmp_path, weather_files, monkeypatch):
+    zarr_store_directory = tmp_path / "zarr"
+    weather_merger = merger.WeatherMerger(
+        zarr_store_directory=str(zarr_store_directory)
+    )
+
+    expected = weather_merger.to_xarray(weather_files)
+    [store] = os.listdir(zarr_store_directory)
+
+    # Subsequent loads must not scan the source files again.
+    def open_mfdataset(*args, **kwargs):
+        raise AssertionError("Source files were opened although a store exists")
+
+    monkeypatch.setattr(xr, "open_mfdataset", open_mfdataset)
+    result = weather_merger.to_xarray(weather_files)
+
+    assert store.endswith(".zarr")
+    assert result.chunks["time"][0] == merger.WeatherMerger.zarr_chunks["time"]
+    xr.testing.assert_identical(result.load(), expected.load())
+
+
+def test_to_xarray_with_zarr_store_for_different_files(tmp_path, weather_files):
+    zarr_store_directory = tmp_path / "zarr"
+    weather_merger = merger.WeatherMerger(
+        zarr_store_directory=str(zarr_store_directory)
+    )
+
+    weather_merger.to_xarray(weather_files)
+    weather_merger.to_xarray(weather_files[:2])
+
+    assert len(os.listdir(zarr_store_directory)) == 2
+
+
+def test_to_xarray_with_area(weather_files):
+    weather_merger = merger.WeatherMerger(area=(51.95, 10.05, 51.85, 10.25))
+
+    result = weather_merger.to_xarray(weather_files)
+
+    np.testing.assert_allclose(result["latitude"], [51.9])
+    np.testing.assert_allclose(result["longitude"], [10.1, 10.2])
+
+
+def test_to_xarray_with_area_without_grid_points(weather_files):
+    weather_merger = merger.WeatherMerger(area=(0.0, 0.0, -1.0, 1.0))
+
+    with pytest.raises(ValueError):
+        weather_merger.to_xarray(weather_files)
+
+
+def test_to_xarray_with_grid_points(weather_files):
+    weather_merger = merger.WeatherMerger(grid_points=[(10.12, 51.79), (10.29, 51.81)])
+
+    result = weather_merger.to_xarray(weather_files)
+
+    np.testing.assert_allclose(result["latitude"], [51.8])
+    np.testing.assert_allclose(result["longitude"], [10.1, 10.3])
+
+
+@pytest.mark.parametrize(
+    ("axis", "values", "expected"),
+    [
+        (np.array([1.0, 2.0, 3.0]), np.array([1.4]), [0]),
+        (np.array([3.0, 2.0, 1.0]), np.array([1.4, 2.6, 2.9]), [0, 2]),
+    ],
+)
+def test_get_closest_indexes(axis, values, expected):
+    result = merger._get_closest_indexes(axis, values=values)
+
+    np.testing.assert_equal(result, expected)
+
+
+def test_to_xarray_with_variables_and_levels(weather_files):
+    weather_merger = merger.WeatherMerger(variables=["u", "v"], levels=[2])
+
+    result = weather_merger.to_xarray(weather_files)
+
+    assert set(result.data_vars) == {"u", "v"}
+    np.testing.assert_equal(result["level"], [2])
+
+
+@pytest.mark.parametrize(
+    "selection",
+    [
+        {"variables": ["sp"]},
+        {"levels": [137]},
+    ],
+)
+def test_to_xarray_with_unavailable_variables_or_levels(weather_files, selection):
+    weather_merger = merger.WeatherMerger(**selection)
+
+    with pytest.raises(ValueError):
+        weather_merger.to_xarray(weather_files)
+
+
+def test_to_xarray_as_lead_time_cube(weather_files):
+    weather_merger = merger.WeatherMerger(lead_time_cube=True)
+
+    result = weather_merger.to_xarray(weather_files)
+
+    assert dict(result["t"].sizes) == {
+        "init_time": 4,
+        "step": 48,
+        "level": 3,
+        "latitude": 3,
+        "longitude": 4,
+    }
+    np.testing.assert_equal(
+        result["init_time"].values,
+        pd.date_range("2020-01-01", periods=4, freq="12h").values,
+    )
+    np.testing.assert_equal(
+        result["valid_time"].isel(init_time=1, step=47).values,
+        np.datetime64("2020-01-03T11:00"),
+    )
+    np.testing.assert_equal(
+        result["t"].isel(level=0, latitude=0, longitude=0).values,
+        np.repeat([[0.0], [1.0], [2.0], [3.0]], 48, axis=1),
+    )
+
+
+@pytest.mark.parametrize(
+    ("lead_time_cube", "expected"),
+    [
+        (False, [(10, 3, 3, 4)] * 4 + [(8, 3, 3, 4)]),
+        (True, [(3, 48, 3, 3, 4), (1, 48, 3, 3, 4)]),
+    ],
+)
+def test_to_batches(weather_files, lead_time_cube, expected):
+    weather_merger = merger.WeatherMerger(
+        variables=["u"], lead_time_cube=lead_time_cube
+    )
+    batch_size = expected[0][0]
+
+    result = list(weather_merger.to_batches(weather_files, batch_size=batch_size))
+
+    assert [batch["u"].shape for batch in result] == expected